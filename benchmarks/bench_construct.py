@@ -0,0 +1,69 @@
+"""Benchmark instantiating objects.
+
+Compares instantiating objects with ``pydantic.BaseModel.__init__``, which
+objects used before validating with a validation plan per class, and
+instantiating them normally, with and without a profiler active.
+
+Usage:
+    $ python -m benchmarks.bench_construct
+
+"""
+from __future__ import annotations
+
+import timeit
+from typing import Any, Callable, Dict, Type
+
+from pydantic import BaseModel
+
+from troposphere import BaseAWSObject, GetAtt, Join, Output, Ref, Sub
+from troposphere.cloudformation import WaitCondition, WaitConditionHandle
+from troposphere.profiling import profile
+
+OBJECTS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "WaitConditionHandle": lambda: {"title": "Handle"},
+    "WaitCondition": lambda: {
+        "title": "WaitCondition",
+        "Handle": Ref("Handle"),
+        "Timeout": 300,
+    },
+    "Output": lambda: {
+        "title": "Output",
+        "Value": Join("", [Sub("${AWS::Region}"), GetAtt("Handle", "Data")]),
+    },
+}
+"""Data used to instantiate each object."""
+
+CLASSES: Dict[str, Type[BaseAWSObject]] = {
+    "WaitConditionHandle": WaitConditionHandle,
+    "WaitCondition": WaitCondition,
+    "Output": Output,
+}
+
+
+def _time(func: Callable[[], Any], number: int) -> float:
+    """Return the best time of a function in microseconds."""
+    return min(timeit.repeat(func, number=number)) / number * 1e6
+
+
+def main(number: int = 20000) -> None:
+    """Run the benchmark."""
+    for name, get_data in OBJECTS.items():
+        cls = CLASSES[name]
+        data = get_data()
+
+        def _pydantic(cls: Type[BaseAWSObject] = cls) -> None:
+            BaseModel.__init__(cls.__new__(cls), **data)
+
+        legacy = _time(_pydantic, number)
+        current = _time(lambda cls=cls: cls(**data), number)
+        with profile(record_events=False):
+            profiled = _time(lambda cls=cls: cls(**data), number)
+        print(  # noqa
+            f"{name:<20} pydantic {legacy:5.2f} us, "
+            f"current {current:5.2f} us ({legacy / current:.2f}x), "
+            f"profiled {profiled:5.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
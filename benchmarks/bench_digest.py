@@ -0,0 +1,48 @@
+"""Benchmark Template equality.
+
+Compares equality using the structural digest of each Template with the
+comparison of JSON output it replaced, for an unchanged Template and after a
+single resource was modified.
+
+Usage:
+    $ python -m benchmarks.bench_digest
+
+"""
+from __future__ import annotations
+
+import timeit
+
+from troposphere import Template
+
+from .templates import build_template
+
+
+def legacy_eq(template: Template, other: Template) -> bool:
+    """Compare templates using their JSON output."""
+    return template.to_json() == other.to_json()
+
+
+def main(number: int = 20) -> None:
+    """Run the benchmark."""
+    for size in (10, 100, 500):
+        template, other = build_template(size), build_template(size)
+        assert template == other and legacy_eq(template, other), "not equal"
+        resource = next(iter(template.resources.values()))
+        legacy = min(timeit.repeat(lambda: legacy_eq(template, other), number=number))
+        cached = min(timeit.repeat(lambda: template == other, number=number))
+
+        def _changed() -> bool:
+            resource.invalidate()
+            return template == other
+
+        changed = min(timeit.repeat(_changed, number=number))
+        print(  # noqa
+            f"{size:>4} resources: legacy {legacy / number * 1000:8.3f} ms, "
+            f"digest {cached / number * 1000:8.4f} ms, "
+            f"1 change {changed / number * 1000:8.3f} ms "
+            f"({legacy / changed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
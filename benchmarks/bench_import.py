@@ -0,0 +1,80 @@
+"""Benchmark the time needed to import troposphere.
+
+Each measurement imports troposphere in a new interpreter using
+``python -X importtime`` and reports the cumulative import time of
+troposphere and the modules that were the slowest to import.
+
+Usage:
+    $ python -m benchmarks.bench_import
+
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+LAZY_MODULES = (
+    "cfn_flip",
+    "hashlib",
+    "importlib.metadata",
+    "troposphere.spec",
+    "yaml",
+)
+"""Modules that should not be imported by ``import troposphere``."""
+
+
+def import_times(module: str = "troposphere") -> Dict[str, int]:
+    """Import a module in a new interpreter.
+
+    Modules imported when the interpreter starts are excluded.
+
+    Args:
+        module: Name of the module to import. When empty, nothing is imported
+            and only the modules imported when the interpreter starts are
+            returned.
+
+    Returns:
+        Cumulative import time of each module that was imported, in
+        microseconds.
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+        if module
+        else [sys.executable, "-X", "importtime", "-c", "pass"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    if module:
+        for name in import_times(""):
+            times.pop(name, None)
+    return times
+
+
+def main(number: int = 5, top: int = 10) -> None:
+    """Run the benchmark."""
+    runs = [import_times() for _ in range(number)]
+    best = min(runs, key=lambda times: times["troposphere"])
+    print(f"import troposphere: {best['troposphere'] / 1000:.1f} ms")  # noqa
+    loaded = [name for name in LAZY_MODULES if name in best]
+    if loaded:
+        print(f"unexpectedly imported: {', '.join(loaded)}")  # noqa
+    slowest: List[Tuple[str, int]] = sorted(
+        ((name, time) for name, time in best.items() if "." not in name),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    for name, time in slowest[1 : top + 1]:
+        print(f"  {name:<30} {time / 1000:8.1f} ms")  # noqa
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark interning of identical values.
+
+Builds a template where every resource repeats the same helper functions
+and metadata, as generated templates often do, with and without
+:meth:`troposphere.Template.interning`. Reports the build time, the memory
+retained by the template and the time to serialize it without cached
+output of the resources.
+
+Usage:
+    $ python -m benchmarks.bench_interning
+
+"""
+from __future__ import annotations
+
+import time
+import timeit
+import tracemalloc
+from contextlib import nullcontext
+from typing import Tuple
+
+from troposphere import GetAtt, Join, Ref, Sub, Template
+from troposphere.cloudformation import WaitConditionHandle
+
+from .templates import invalidate_all
+
+
+def build_repetitive_template(resources: int, intern: bool) -> Template:
+    """Build a template where each resource has the same metadata."""
+    template = Template()
+    with template.interning() if intern else nullcontext():
+        for i in range(resources):
+            WaitConditionHandle(
+                title=f"Handle{i}",
+                template=template,
+                Metadata={
+                    "Role": GetAtt("Role", "Arn"),
+                    "Bucket": Sub("arn:${AWS::Partition}:s3:::${Bucket}/*"),
+                    "Key": Join(":", ["alias", Ref("AWS::Region"), "key"]),
+                    "Tags": [
+                        {"Key": "Team", "Value": "Platform"},
+                        {"Key": "Environment", "Value": Ref("Environment")},
+                    ],
+                },
+            )
+    return template
+
+
+def measure(resources: int, intern: bool) -> Tuple[float, float, float]:
+    """Return the build time (s), retained memory (B) and render time (s)."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        template = build_repetitive_template(resources, intern)
+        build = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    def _render() -> None:
+        invalidate_all(template)
+        template.to_dict()
+
+    render = min(timeit.repeat(_render, number=5)) / 5
+    return build, memory, render
+
+
+def main(resources: int = 500) -> None:
+    """Run the benchmark."""
+    assert (
+        build_repetitive_template(10, False).to_dict()
+        == build_repetitive_template(10, True).to_dict()
+    ), "output mismatch"
+    for intern in (False, True):
+        build, memory, render = measure(resources, intern)
+        print(  # noqa
+            f"{'interned' if intern else 'default':>8}: "
+            f"build {build * 1000:8.1f} ms, "
+            f"memory {memory / 1024:8.1f} KiB, "
+            f"render {render * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
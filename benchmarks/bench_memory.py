@@ -0,0 +1,73 @@
+"""Benchmark memory used by helper functions.
+
+Compares the slot-backed :class:`troposphere.AWSHelperFn` implementations
+with the ``__dict__`` and ``data`` dict based implementation they replaced.
+
+Usage:
+    $ python -m benchmarks.bench_memory
+
+"""
+from __future__ import annotations
+
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from troposphere import GetAtt, Join, Ref, Sub
+
+
+class LegacyHelperFn:
+    """Helper function storing its output in a ``data`` dict."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        """Instantiate class."""
+        self.data = data
+
+
+def measure(factory: Callable[[int], Any], number: int) -> float:
+    """Return the average number of bytes allocated per object."""
+    tracemalloc.start()
+    try:
+        objects: List[Any] = [None] * number
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i in range(number):
+            objects[i] = factory(i)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - baseline) / number
+
+
+def main(number: int = 100000) -> None:
+    """Run the benchmark."""
+    # names are created up front so they are not included in the measurements
+    names = [f"Resource{i % 1000}" for i in range(number)]
+    cases: Dict[str, Any] = {
+        "Ref": (
+            lambda i: LegacyHelperFn({"Ref": names[i]}),
+            lambda i: Ref(names[i]),
+        ),
+        "GetAtt": (
+            lambda i: LegacyHelperFn({"Fn::GetAtt": [names[i], "Arn"]}),
+            lambda i: GetAtt(names[i], "Arn"),
+        ),
+        "Join": (
+            lambda i: LegacyHelperFn({"Fn::Join": ["", ["arn:", names[i]]]}),
+            lambda i: Join("", ["arn:", names[i]]),
+        ),
+        "Sub": (
+            lambda i: LegacyHelperFn({"Fn::Sub": names[i]}),
+            lambda i: Sub(names[i]),
+        ),
+    }
+    for name, (legacy_factory, factory) in cases.items():
+        legacy = measure(legacy_factory, number)
+        current = measure(factory, number)
+        print(  # noqa
+            f"{name:>6}: legacy {legacy:7.1f} B/object, "
+            f"slots {current:7.1f} B/object "
+            f"({legacy / max(current, 1):.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
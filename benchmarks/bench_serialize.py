@@ -0,0 +1,60 @@
+"""Benchmark single-pass serialization of a Template.
+
+Compares :meth:`troposphere.Template.to_dict` with the pydantic ``.dict()``
+based serialization it replaced, both without cached output ("cold") and
+after a single resource was modified ("1 change").
+
+Usage:
+    $ python -m benchmarks.bench_serialize
+
+"""
+from __future__ import annotations
+
+import timeit
+from typing import Any, Dict
+
+from troposphere import Template
+
+from .templates import build_template, invalidate_all
+
+
+def legacy_to_dict(template: Template) -> Dict[str, Any]:
+    """Serialize the template with ``pydantic.BaseModel.dict``."""
+    return template.dict(
+        by_alias=True,
+        exclude={i for i in Template.SECTIONS if not getattr(template, i, None)},
+        exclude_none=True,
+    )
+
+
+def render_cold(template: Template) -> Dict[str, Any]:
+    """Serialize the template without using cached output."""
+    invalidate_all(template)
+    return template.to_dict()
+
+
+def render_one_change(template: Template) -> Dict[str, Any]:
+    """Serialize the template after modifying one resource."""
+    resource = next(iter(template.resources.values()))
+    resource.invalidate()
+    return template.to_dict()
+
+
+def main(number: int = 20) -> None:
+    """Run the benchmark."""
+    for size in (10, 100, 500):
+        template = build_template(size)
+        assert legacy_to_dict(template) == template.to_dict(), "output mismatch"
+        legacy = min(timeit.repeat(lambda: legacy_to_dict(template), number=number))
+        cold = min(timeit.repeat(lambda: render_cold(template), number=number))
+        changed = min(timeit.repeat(lambda: render_one_change(template), number=number))
+        print(  # noqa
+            f"{size:>4} resources: legacy {legacy / number * 1000:8.3f} ms, "
+            f"cold {cold / number * 1000:8.3f} ms ({legacy / cold:.1f}x), "
+            f"1 change {changed / number * 1000:8.3f} ms "
+            f"({legacy / changed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
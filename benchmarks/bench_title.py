@@ -0,0 +1,62 @@
+"""Benchmark title validation.
+
+Compares the shared title validator with the ``Field(regex=...)``
+constraint it replaced.
+
+Usage:
+    $ python -m benchmarks.bench_title
+
+"""
+from __future__ import annotations
+
+import itertools
+import timeit
+from typing import Any, Callable, cast
+
+from pydantic import BaseModel, Field, validator
+
+from troposphere.constants import TITLE_REGEX
+from troposphere.validators import validate_title
+
+
+class RegexTitle(BaseModel):
+    """Model using the previous title constraint."""
+
+    title: str = Field(..., regex=TITLE_REGEX)
+
+
+class ValidatorTitle(BaseModel):
+    """Model using the shared title validator."""
+
+    title: str
+
+    _validate_title = cast(
+        "classmethod[Callable[..., Any]]",
+        validator("title", allow_reuse=True)(validate_title),
+    )
+
+
+def _time(func: Callable[[], Any], number: int) -> float:
+    """Return the best time of a function in microseconds."""
+    return min(timeit.repeat(func, number=number)) / number * 1e6
+
+
+def main(number: int = 50000) -> None:
+    """Run the benchmark."""
+    counter = itertools.count()
+    legacy = _time(lambda: RegexTitle(title=f"Resource{next(counter)}"), number)
+    current = _time(lambda: ValidatorTitle(title=f"Resource{next(counter)}"), number)
+    print(  # noqa
+        f"unique titles:   regex {legacy:5.2f} us, "
+        f"validator {current:5.2f} us ({legacy / current:.2f}x)"
+    )
+    legacy = _time(lambda: RegexTitle(title="Resource"), number)
+    current = _time(lambda: ValidatorTitle(title="Resource"), number)
+    print(  # noqa
+        f"repeated title:  regex {legacy:5.2f} us, "
+        f"validator {current:5.2f} us ({legacy / current:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Benchmark suite.
+
+Measures construction, validation, serialization and loading of synthetic
+templates with 10, 100 and 500 resources and of a template containing deeply
+nested intrinsic functions. Each benchmark reports operations per second and
+the peak memory allocated by a single operation.
+
+Results can be saved as a baseline and later runs compared against it,
+failing when a metric regresses by more than a threshold. Timings depend on
+the machine so baselines should be created on the machine used to compare.
+
+Usage:
+    $ python -m benchmarks.suite
+    $ python -m benchmarks.suite --save benchmarks/baseline.json
+    $ python -m benchmarks.suite --compare benchmarks/baseline.json
+
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from troposphere import Template
+
+from .templates import build_nested_template, build_template, invalidate_all
+
+SIZES = (10, 100, 500)
+"""Number of resources in each synthetic template."""
+
+NESTED_DEPTH = 50
+"""Number of nested ``Fn::Join`` levels in each output of the nested template."""
+
+THRESHOLD = 0.2
+"""Default fraction a metric can regress before a comparison fails."""
+
+Metrics = Dict[str, float]
+
+
+def _validate(size: int) -> Callable[[], Template]:
+    """Build a template with validation deferred, then validate it."""
+
+    def _build() -> Template:
+        template = build_template(size, bulk=True)
+        template.validate_deferred()
+        return template
+
+    return _build
+
+
+def _cold(template: Template, method: Callable[[], Any]) -> Callable[[], Any]:
+    """Call a method of a template without using cached output."""
+
+    def _call() -> Any:
+        invalidate_all(template)
+        return method()
+
+    return _call
+
+
+def benchmarks() -> Iterator[Tuple[str, Callable[[], Any]]]:
+    """Get the name and function of each benchmark."""
+    for size in SIZES:
+        template = build_template(size)
+        source = template.to_json()
+        yield f"construct[{size}]", lambda size=size: build_template(size)
+        yield f"construct_bulk[{size}]", _validate(size)
+        yield f"to_dict[{size}]", _cold(template, template.to_dict)
+        yield f"to_json[{size}]", _cold(template, template.to_json)
+        yield f"to_yaml[{size}]", _cold(template, template.to_yaml)
+        yield f"from_json[{size}]", lambda source=source: Template.from_json(source)
+    nested = build_nested_template(NESTED_DEPTH)
+    yield "construct[nested]", lambda: build_nested_template(NESTED_DEPTH)
+    yield "to_json[nested]", _cold(nested, nested.to_json)
+    yield "to_yaml[nested]", _cold(nested, nested.to_yaml)
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> Metrics:
+    """Measure the speed and peak memory of a function.
+
+    Args:
+        func: Function to measure.
+        repeat: Number of times to repeat the timing. The best is used.
+
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"ops_per_sec": 1 / best, "peak_memory_kib": peak / 1024}
+
+
+def compare(
+    results: Dict[str, Metrics], baseline: Dict[str, Metrics], threshold: float
+) -> List[str]:
+    """Compare results with a baseline.
+
+    Returns:
+        Description of each metric that regressed by more than ``threshold``.
+
+    """
+    regressions: List[str] = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if metrics["ops_per_sec"] < expected["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {metrics['ops_per_sec']:.1f} ops/sec "
+                f"(baseline {expected['ops_per_sec']:.1f})"
+            )
+        if metrics["peak_memory_kib"] > expected["peak_memory_kib"] * (1 + threshold):
+            regressions.append(
+                f"{name}: {metrics['peak_memory_kib']:.1f} KiB peak "
+                f"(baseline {expected['peak_memory_kib']:.1f})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite.
+
+    Returns:
+        Exit code. Non-zero if a metric regressed.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--compare", type=Path, help="baseline to compare with")
+    parser.add_argument("--save", type=Path, help="save results as a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help=f"fraction a metric can regress (default: {THRESHOLD})",
+    )
+    parser.add_argument("--filter", default="", help="only run matching benchmarks")
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, Metrics] = (
+        json.loads(args.compare.read_text()) if args.compare else {}
+    )
+    results: Dict[str, Metrics] = {}
+    for name, func in benchmarks():
+        if args.filter not in name:
+            continue
+        results[name] = metrics = measure(func)
+        change = ""
+        if name in baseline:
+            ratio = metrics["ops_per_sec"] / baseline[name]["ops_per_sec"]
+            change = f" ({ratio - 1:+.0%} vs baseline)"
+        print(  # noqa
+            f"{name:<20} {metrics['ops_per_sec']:>10.1f} ops/sec "
+            f"{metrics['peak_memory_kib']:>10.1f} KiB peak{change}"
+        )
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")  # noqa
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
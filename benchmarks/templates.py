@@ -0,0 +1,102 @@
+"""Synthetic templates used by the benchmarks."""
+from __future__ import annotations
+
+from contextlib import nullcontext
+
+from troposphere import (
+    GetAtt,
+    If,
+    Join,
+    NoValue,
+    Output,
+    Parameter,
+    Ref,
+    Region,
+    Sub,
+    Template,
+    cloudformation,
+)
+
+
+def build_template(resources: int = 100, bulk: bool = False) -> Template:
+    """Build a synthetic template.
+
+    Each iteration adds a pair of resources (a ``WaitConditionHandle`` and a
+    ``WaitCondition`` referencing it) and an output containing a handful of
+    intrinsic functions.
+
+    Args:
+        resources: Number of resources to add to the template.
+        bulk: Defer validation until the template is output.
+
+    """
+    template = Template(Description="Synthetic benchmark template.")
+    template.add_parameter(Parameter(title="Environment", Type="String"))
+    template.add_condition(
+        "IsProduction", {"Fn::Equals": [Ref("Environment"), "production"]}
+    )
+    with template.bulk() if bulk else nullcontext():
+        _add_resources(template, resources)
+    return template
+
+
+def _add_resources(template: Template, resources: int) -> None:
+    """Add resources and outputs to a synthetic template."""
+    for i in range(resources // 2):
+        handle = template.add_resource(
+            cloudformation.WaitConditionHandle(title=f"Handle{i}")
+        )
+        template.add_resource(
+            cloudformation.WaitCondition(
+                title=f"WaitCondition{i}", Handle=handle.ref(), Timeout=300
+            )
+        )
+        if len(template.outputs) < 200:
+            template.add_output(
+                Output(
+                    title=f"Output{i}",
+                    Value=Join(
+                        "",
+                        [
+                            Sub("arn:${AWS::Partition}:${AWS::Region}:"),
+                            GetAtt(handle, "Data"),
+                            If("IsProduction", Region, NoValue),
+                        ],
+                    ),
+                )
+            )
+
+
+def build_nested_value(depth: int = 20) -> Join:
+    """Build a deeply nested intrinsic function.
+
+    Args:
+        depth: Number of nested ``Fn::Join`` levels.
+
+    """
+    value = Join("", [Ref("Environment"), "-leaf"])
+    for i in range(depth):
+        value = Join("-", [Sub(f"level{i}-${{AWS::Region}}"), value])
+    return value
+
+
+def build_nested_template(depth: int = 20, outputs: int = 10) -> Template:
+    """Build a template containing deeply nested intrinsic functions.
+
+    Args:
+        depth: Number of nested ``Fn::Join`` levels in each output.
+        outputs: Number of outputs to add to the template.
+
+    """
+    template = Template(Description="Synthetic benchmark template.")
+    template.add_parameter(Parameter(title="Environment", Type="String"))
+    for i in range(outputs):
+        template.add_output(Output(title=f"Output{i}", Value=build_nested_value(depth)))
+    return template
+
+
+def invalidate_all(template: Template) -> None:
+    """Clear the cached output of every object in the template."""
+    for section in ("outputs", "parameters", "resources"):
+        for obj in getattr(template, section).values():
+            obj.invalidate()
@@ -0,0 +1,27 @@
+"""Tests for troposphere.BaseAWSObject."""
+from __future__ import annotations
+
+from troposphere import Template
+from troposphere.cloudformation import WaitCondition
+from troposphere.policies import CreationPolicy, ResourceSignal
+
+
+def test_cached_output_of_validated_copy() -> None:
+    """Output of a model copied when validated follows changes to its fields."""
+    signal = ResourceSignal(title="ResourceSignal", Count=1)
+    policy = CreationPolicy(title="CreationPolicy", ResourceSignal=signal)
+    template = Template()
+    condition = template.add_resource(
+        WaitCondition(title="WaitCondition", CreationPolicy=policy)
+    )
+    assert template.to_dict()["Resources"]["WaitCondition"]["CreationPolicy"] == {
+        "ResourceSignal": {"Count": 1}
+    }
+
+    policy.ResourceSignal = ResourceSignal(title="ResourceSignal", Count=7)
+    output = template.to_dict()["Resources"]["WaitCondition"]["CreationPolicy"]
+    assert output == condition.CreationPolicy.to_dict()
+
+    condition.CreationPolicy.ResourceSignal.Count = 3
+    output = template.to_dict()["Resources"]["WaitCondition"]["CreationPolicy"]
+    assert output == {"ResourceSignal": {"Count": 3}}
@@ -0,0 +1,85 @@
+"""Tests for troposphere.cfn_yaml."""
+from __future__ import annotations
+
+import itertools
+from decimal import Decimal
+
+import cfn_flip
+import pytest
+
+from troposphere import (
+    GetAtt,
+    If,
+    Join,
+    NoValue,
+    Output,
+    Parameter,
+    Ref,
+    Sub,
+    Template,
+)
+from troposphere.cloudformation import WaitCondition, WaitConditionHandle
+from troposphere.loader import get_resource_class
+
+
+def _template() -> Template:
+    """Build a Template using the features that change how YAML is output."""
+    template = Template(Description="Description " * 20)
+    shared = Join("", ["prefix-", Ref("Name")])
+    template.add_parameter(Parameter(title="Name", Type="String"))
+    template.add_resource(
+        WaitConditionHandle(
+            title="Handle",
+            Metadata={
+                "Lines": "a\nb",
+                "Number": Decimal("1.5"),
+                "Shared": shared,
+                "Tuple": ("a", 1),
+            },
+        )
+    )
+    template.add_resource(
+        WaitCondition(title="Wait", Handle=Ref("Handle"), Timeout="300")
+    )
+    state_machine = get_resource_class("AWS::StepFunctions::StateMachine")
+    template.add_resource(
+        state_machine(
+            title="StateMachine",
+            Properties={"DefinitionString": {"StartAt": "A", "States": {}}},
+        )
+    )
+    template.add_mapping("Map", {"Key": {"Value": shared}})
+    template.add_output(
+        Output(
+            title="Output",
+            Description="0123",
+            Value=Join(
+                "-",
+                [
+                    GetAtt("Wait", "Data"),
+                    If("Condition", "a", NoValue),
+                    Sub("${A}", A=Ref("Name")),
+                ],
+            ),
+        )
+    )
+    return template
+
+
+@pytest.mark.parametrize(
+    "clean_up, long_form, sort_keys", list(itertools.product([False, True], repeat=3))
+)
+def test_to_yaml_matches_cfn_flip(
+    clean_up: bool, long_form: bool, sort_keys: bool
+) -> None:
+    """Output is identical to converting the JSON output with cfn_flip."""
+    template = _template()
+    expected = cfn_flip.to_yaml(
+        template.to_json(sort_keys=sort_keys), clean_up=clean_up, long_form=long_form
+    )
+    output = template.to_dict()
+    assert (
+        template.to_yaml(clean_up=clean_up, long_form=long_form, sort_keys=sort_keys)
+        == expected
+    )
+    assert template.to_dict() == output
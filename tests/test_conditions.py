@@ -0,0 +1,177 @@
+"""Tests for troposphere.conditions."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import pytest
+
+from troposphere import (
+    AWS_REGION,
+    And,
+    Equals,
+    FindInMap,
+    If,
+    Join,
+    Not,
+    NoValue,
+    Or,
+    Output,
+    Parameter,
+    Ref,
+    Select,
+    Split,
+    Sub,
+    Template,
+)
+from troposphere.cloudformation import WaitConditionHandle
+from troposphere.conditions import ConditionEvaluator, get_pseudo_parameters
+
+
+def _template() -> Template:
+    """Build a Template with Conditions using every condition function."""
+    template = Template()
+    template.add_parameter(Parameter(title="Env", Type="String", Default="dev"))
+    template.add_parameter(
+        Parameter(title="Subnets", Type="CommaDelimitedList", Default="a,b")
+    )
+    template.add_mapping("Map", {"us-east-1": {"Big": "yes"}})
+    template.add_condition("IsProd", Equals(Ref("Env"), "prod"))
+    template.add_condition(
+        "IsBig", Equals(FindInMap("Map", Ref(AWS_REGION), "Big"), "yes")
+    )
+    template.add_condition(
+        "ProdAndBig", And({"Condition": "IsProd"}, {"Condition": "IsBig"})
+    )
+    template.add_condition("NotProd", Not({"Condition": "IsProd"}))
+    template.add_condition("IsAws", Equals(Sub("${Env}-${AWS::Partition}"), "dev-aws"))
+    template.add_condition("Selected", Equals(Select(1, Ref("Subnets")), "b"))
+    template.add_condition(
+        "Joined",
+        Or(Equals(Join("-", Split(",", "x,y")), "x-z"), {"Condition": "IsProd"}),
+    )
+    template.add_resource(
+        WaitConditionHandle(title="ProdHandle", Condition="ProdAndBig")
+    )
+    template.add_resource(
+        WaitConditionHandle(
+            title="Always",
+            Metadata={
+                "If": If("IsProd", "prod", NoValue),
+                "List": [1, If("NotProd", NoValue, 2)],
+                "Ref": If("ProdAndBig", Ref("ProdHandle"), "none"),
+            },
+        )
+    )
+    template.add_resource(
+        WaitConditionHandle(title="Dependent", DependsOn=["ProdHandle", "Always"])
+    )
+    template.add_resource(WaitConditionHandle(title="Untouched"))
+    template.add_output(
+        Output(title="Handle", Value=Ref("ProdHandle"), Condition="ProdAndBig")
+    )
+    template.add_output(Output(title="Env", Value=If("IsProd", "prod", "dev")))
+    return template
+
+
+@pytest.mark.parametrize(
+    "parameters, expected",
+    [
+        (
+            {},
+            {
+                "IsProd": False,
+                "IsBig": True,
+                "ProdAndBig": False,
+                "NotProd": True,
+                "IsAws": True,
+                "Selected": True,
+                "Joined": False,
+            },
+        ),
+        (
+            {"Env": "prod", "Subnets": ["a", "c"]},
+            {
+                "IsProd": True,
+                "IsBig": True,
+                "ProdAndBig": True,
+                "NotProd": False,
+                "IsAws": False,
+                "Selected": False,
+                "Joined": True,
+            },
+        ),
+    ],
+)
+def test_evaluate_conditions(
+    parameters: Dict[str, Any], expected: Dict[str, bool]
+) -> None:
+    """Conditions are evaluated for the values of parameters."""
+    template = _template()
+    result = template.evaluate_conditions(parameters, {AWS_REGION: "us-east-1"})
+    assert result == expected
+
+
+def test_evaluate_conditions_missing_value() -> None:
+    """Conditions referencing a value that isn't given can't be evaluated."""
+    with pytest.raises(ValueError, match="Condition IsBig: no value for AWS::Region"):
+        _template().evaluate_conditions()
+
+
+def test_evaluate_circular_conditions() -> None:
+    """Conditions depending on themselves can't be evaluated."""
+    template = Template()
+    template.add_condition("First", {"Condition": "Second"})
+    template.add_condition("Second", {"Condition": "First"})
+    with pytest.raises(ValueError) as exc_info:
+        template.evaluate_conditions()
+    assert str(exc_info.value) == (
+        "Condition First: Condition Second: Circular dependency between "
+        "conditions: First -> Second -> First"
+    )
+
+
+def test_evaluate_undefined_condition() -> None:
+    """Conditions that aren't defined can't be evaluated."""
+    with pytest.raises(ValueError, match="Condition Missing is not defined"):
+        ConditionEvaluator(Template()).evaluate("Missing")
+
+
+def test_get_pseudo_parameters() -> None:
+    """The partition and URL suffix are derived from the region."""
+    assert get_pseudo_parameters("cn-north-1") == {
+        "AWS::Partition": "aws-cn",
+        "AWS::Region": "cn-north-1",
+        "AWS::URLSuffix": "amazonaws.com.cn",
+    }
+
+
+@pytest.mark.parametrize("env", ["dev", "prod"])
+def test_resolve_conditions(env: str) -> None:
+    """Conditional entries are removed and Fn::If is replaced by its result."""
+    template = _template()
+    resolved = template.resolve_conditions({"Env": env}, {AWS_REGION: "us-east-1"})
+    output = resolved.to_dict()
+
+    assert "Conditions" not in output
+    assert resolved.resources["Untouched"] is template.resources["Untouched"]
+    resolved.validate_references()
+    resources = output["Resources"]
+    if env == "prod":
+        assert "ProdHandle" in resources
+        assert resources["Always"]["Metadata"] == {
+            "If": "prod",
+            "List": [1, 2],
+            "Ref": {"Ref": "ProdHandle"},
+        }
+        assert resources["Dependent"]["DependsOn"] == ["ProdHandle", "Always"]
+        assert output["Outputs"] == {
+            "Env": {"Value": "prod"},
+            "Handle": {"Value": {"Ref": "ProdHandle"}},
+        }
+    else:
+        assert "ProdHandle" not in resources
+        assert resources["Always"]["Metadata"] == {"List": [1], "Ref": "none"}
+        assert resources["Dependent"]["DependsOn"] == "Always"
+        assert output["Outputs"] == {"Env": {"Value": "dev"}}
+    entries = [*resources.values(), *output["Outputs"].values()]
+    assert not any("Condition" in entry for entry in entries)
@@ -0,0 +1,24 @@
+"""Tests for troposphere.graph."""
+from __future__ import annotations
+
+import pytest
+
+from troposphere import GetAtt, Ref, Template
+from troposphere.cloudformation import WaitConditionHandle
+from troposphere.exceptions import InvalidReferenceError
+
+
+def test_validate_references_get_att_argument_path() -> None:
+    """References in the arguments of Fn::GetAtt are reported at their index."""
+    template = Template()
+    template.add_resource(WaitConditionHandle(title="Handle"))
+    template.add_resource(
+        WaitConditionHandle(
+            title="Other", Metadata={"Value": GetAtt("Handle", Ref("Attribute"))}
+        )
+    )
+    with pytest.raises(InvalidReferenceError) as excinfo:
+        template.validate_references()
+    assert [reference.path for reference in excinfo.value.references] == [
+        '$.Resources.Other.Metadata.Value["Fn::GetAtt"][1]'
+    ]
@@ -0,0 +1,20 @@
+"""Tests for troposphere.AWSHelperFn."""
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from troposphere import Ref
+from troposphere.cloudformation import Stack
+
+
+def test_validate_helper_fn() -> None:
+    """Fields accepting a helper function keep the helper function provided."""
+    stack = Stack(title="Stack", TemplateURL=Ref("Url"))
+    assert stack.to_dict()["Properties"] == {"TemplateURL": {"Ref": "Url"}}
+
+
+def test_validate_rejects_other_values() -> None:
+    """Values that are not helper functions are not replaced by an empty one."""
+    with pytest.raises(ValidationError, match="AWSHelperFn required"):
+        Stack(title="Stack", TemplateURL=["https://example.com/template.json"])
@@ -0,0 +1,57 @@
+"""Tests for troposphere.loader."""
+from __future__ import annotations
+
+import json
+import pickle
+from typing import Any, Dict
+
+from troposphere import Template
+from troposphere.render import render_many
+
+TEMPLATE: Dict[str, Any] = {
+    "AWSTemplateFormatVersion": "2010-09-09",
+    "Conditions": {"IsProd": {"Fn::Equals": [{"Ref": "Environment"}, "prod"]}},
+    "Parameters": {"Environment": {"Type": "String"}},
+    "Resources": {
+        "Group": {
+            "Type": "AWS::AutoScaling::AutoScalingGroup",
+            "Condition": "IsProd",
+            "CreationPolicy": {"ResourceSignal": {"Count": 1}},
+            "DeletionPolicy": "Retain",
+            "DependsOn": ["Handle"],
+            "Metadata": {"Owner": "platform"},
+            "UpdatePolicy": {"AutoScalingRollingUpdate": {"MaxBatchSize": 1}},
+            "UpdateReplacePolicy": "Retain",
+            "Properties": {
+                "MaxSize": "2",
+                "Metadata": {"Property": True},
+                "Tags": [{"Key": "Name", "Value": {"Ref": "AWS::StackName"}}],
+            },
+        },
+        "Handle": {
+            "Type": "AWS::CloudFormation::WaitConditionHandle",
+            "Metadata": {"Owner": "platform"},
+            "Properties": {},
+        },
+        "Custom": {
+            "Type": "Custom::Resource",
+            "Properties": {"ServiceToken": "arn", "Metadata": {"Key": "Value"}},
+        },
+    },
+}
+
+
+def test_round_trip_resource_attributes() -> None:
+    """Resource attributes are output outside of Properties after loading."""
+    template = Template.from_json(json.dumps(TEMPLATE))
+    assert template.to_dict() == TEMPLATE
+    assert Template.from_json(template.to_json()).to_dict() == TEMPLATE
+
+
+def test_pickle_generic_resources() -> None:
+    """Templates with resource types that don't have a class can be pickled."""
+    template = Template.from_json(json.dumps(TEMPLATE))
+    assert pickle.loads(pickle.dumps(template)).to_dict() == TEMPLATE
+    results = render_many([template, template], workers=2, min_parallel_resources=0)
+    assert [result.error for result in results] == [None, None]
+    assert json.loads(results[0].outputs["json"]) == TEMPLATE
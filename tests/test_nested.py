@@ -0,0 +1,69 @@
+"""Tests for troposphere.nested."""
+from __future__ import annotations
+
+import pytest
+
+from troposphere import (
+    Equals,
+    FindInMap,
+    GetAtt,
+    Join,
+    Output,
+    Parameter,
+    Ref,
+    Sub,
+    Template,
+)
+from troposphere.cloudformation import WaitCondition, WaitConditionHandle
+
+
+def _template() -> Template:
+    """Build a Template with references between resources of every kind."""
+    template = Template()
+    env = template.add_parameter(Parameter(title="Env", Type="String", Default="dev"))
+    template.add_parameter(
+        Parameter(title="Subnets", Type="List<AWS::EC2::Subnet::Id>")
+    )
+    template.add_condition("IsProd", Equals(Ref(env), "prod"))
+    template.add_mapping("Map", {"dev": {"Key": "value"}})
+    previous = None
+    for i in range(25):
+        handle = template.add_resource(
+            WaitConditionHandle(
+                title=f"Handle{i}",
+                DependsOn=[previous] if previous else [],
+                Metadata={
+                    "Ref": Ref(previous or env),
+                    "Sub": Sub(f"${{{previous or 'Env'}}}-${{AWS::Region}}"),
+                    "Map": FindInMap("Map", Ref(env), "Key"),
+                    "Subnets": Join(",", Ref("Subnets")),
+                },
+            )
+        )
+        previous = handle.title
+    template.add_resource(
+        WaitCondition(
+            title="Waiter",
+            Condition="IsProd",
+            Handle=Ref("Handle0"),
+            Timeout=10,
+            Metadata={"Data": GetAtt("Handle24", "Data")},
+        )
+    )
+    template.add_output(Output(title="Output", Value=Sub("${Handle0}/${Handle20}")))
+    return template
+
+
+@pytest.mark.parametrize("max_resources", [5, 10, 20])
+def test_split_validate_references(max_resources: int) -> None:
+    """The parent and every child only reference names they define."""
+    template = _template()
+    template.validate_references()
+    nested = template.split(max_resources=max_resources)
+
+    nested.parent.validate_references()
+    for child in nested.children.values():
+        child.validate_references()
+        assert len(child.resources) <= max_resources
+    titles = [title for child in nested.children.values() for title in child.resources]
+    assert sorted(titles) == sorted(template.resources)
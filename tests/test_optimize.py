@@ -0,0 +1,91 @@
+"""Tests for troposphere.optimize."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from troposphere import Sub, Template
+from troposphere.cloudformation import WaitConditionHandle
+from troposphere.optimize import ConstantFolder, fold_constants
+
+UNCHANGED = [
+    {"Fn::Select": [-1, ["a", "b"]]},
+    {"Fn::Select": [2, ["a", "b"]]},
+    {"Fn::Select": [True, ["a", "b"]]},
+    {"Fn::Select": ["-1", ["a", "b"]]},
+    {"Fn::Select": [0, {"Ref": "List"}]},
+    {"Fn::Cidr": ["10.0.0.0/16", -1, 8]},
+    {"Fn::Cidr": ["10.0.0.0/16", 2, -8]},
+    {"Fn::Cidr": ["10.0.0.0/16", 0, 8]},
+    {"Fn::Cidr": ["10.0.0.0/16", 257, 8]},
+    {"Fn::Cidr": ["10.0.0.0/24", 2, 9]},
+    {"Fn::Cidr": ["10.0.0.0/24", 512, 1]},
+    {"Fn::Cidr": ["fd00::/64", 1, 64]},
+    {"Fn::Cidr": ["not an ip", 1, 8]},
+    {"Fn::Join": [",", [{"Ref": "A"}, "b"]]},
+    {"Fn::Join": [",", {"Ref": "List"}]},
+    {"Fn::Split": ["", "abc"]},
+    {"Fn::Sub": "${AWS::Region}"},
+    {"Fn::Transform": {"Name": "Macro", "Parameters": {"Fn::Base64": "a"}}},
+]
+
+
+@pytest.mark.parametrize("value", UNCHANGED)
+def test_fold_unchanged(value: Any) -> None:
+    """Functions that can't be folded safely are kept as is."""
+    folder = ConstantFolder()
+    assert folder.fold(value) is value
+    assert not folder.folded
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ({"Fn::Base64": "abc"}, "YWJj"),
+        ({"Fn::Select": [1, ["a", "b"]]}, "b"),
+        ({"Fn::Select": ["1", ["a", "b"]]}, "b"),
+        (
+            {"Fn::Select": [1, {"Fn::Cidr": ["10.0.0.0/16", 2, 8]}]},
+            "10.0.1.0/24",
+        ),
+        ({"Fn::Join": ["-", []]}, ""),
+        ({"Fn::Join": ["-", ["a", "b"]]}, "a-b"),
+        (
+            {"Fn::Join": ["-", ["a", "b", {"Ref": "C"}, "d"]]},
+            {"Fn::Join": ["-", ["a-b", {"Ref": "C"}, "d"]]},
+        ),
+        ({"Fn::Select": [0, {"Fn::Split": [",", "a,b"]}]}, "a"),
+        ({"Fn::Sub": ["${A}-${!B}", {"A": "a"}]}, "a-${B}"),
+        (
+            {"Fn::Sub": ["${A}-${B}", {"A": "${x}", "B": {"Ref": "B"}}]},
+            {"Fn::Sub": ["${!x}-${B}", {"B": {"Ref": "B"}}]},
+        ),
+    ],
+)
+def test_fold(value: Any, expected: Any) -> None:
+    """Functions with constant arguments are replaced by their value."""
+    assert ConstantFolder().fold(value) == expected
+
+
+def test_fold_keeps_larger_value() -> None:
+    """Functions are only replaced when their value isn't larger."""
+    value = {"Fn::Cidr": ["10.0.0.0/16", 256, 8]}
+    assert ConstantFolder().fold(value) is value
+
+
+def test_fold_constants_paths() -> None:
+    """Folded functions are reported with their JSONPath."""
+    template = Template()
+    template.add_resource(
+        WaitConditionHandle(
+            title="Handle",
+            Metadata={"Name": Sub("${A}", A="a"), "Index": {"Fn::Select": [-1, []]}},
+        )
+    )
+    result = fold_constants(template)
+    assert [folded.path for folded in result.folded] == [
+        "$.Resources.Handle.Metadata.Name"
+    ]
+    metadata = result.template.to_dict()["Resources"]["Handle"]["Metadata"]
+    assert metadata == {"Name": "a", "Index": {"Fn::Select": [-1, []]}}
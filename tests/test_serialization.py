@@ -0,0 +1,145 @@
+"""Tests for troposphere.serialization."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from troposphere import (
+    Base64,
+    Cidr,
+    Equals,
+    Export,
+    FindInMap,
+    GetAtt,
+    GetAZs,
+    If,
+    Join,
+    NoValue,
+    Output,
+    Parameter,
+    Ref,
+    Region,
+    Select,
+    Split,
+    Sub,
+    Template,
+)
+from troposphere.cloudformation import WaitCondition, WaitConditionHandle
+from troposphere.policies import CreationPolicy, ResourceSignal
+from troposphere.serialization import encode_to_dict
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _template() -> Template:
+    """Build a Template using every section and the common helper functions."""
+    template = Template(Description="Golden output")
+    env = template.add_parameter(
+        Parameter(title="Env", Type="String", Description="env")
+    )
+    template.add_parameter(Parameter(title="Count", Type="Number", MinValue=1))
+    template.add_condition("IsProd", Equals(Ref(env), "prod"))
+    template.add_mapping("RegionMap", {"us-east-1": {"AMI": "ami-1"}})
+    template.set_metadata({"Foo": {"Bar": [1, 2.5, None, ("a", "b")]}})
+    template.add_rule("Rule", {"Assertions": [{"Assert": Equals(Ref(env), "x")}]})
+    for i in range(2):
+        handle = template.add_resource(WaitConditionHandle(title=f"Handle{i}"))
+        template.add_resource(
+            WaitCondition(title=f"Wait{i}", Handle=handle.ref(), Timeout=30 + i)
+        )
+        template.add_resource(
+            WaitCondition(
+                title=f"Signal{i}",
+                Count=i,
+                CreationPolicy=CreationPolicy(
+                    title="Policy",
+                    ResourceSignal=ResourceSignal(
+                        title="Signal", Count=1, Timeout="PT5M"
+                    ),
+                ),
+            )
+        )
+        template.add_output(
+            Output(
+                title=f"Out{i}",
+                Value=Join(
+                    "",
+                    [
+                        Sub("arn:${AWS::Partition}:${AWS::Region}", Foo="bar"),
+                        GetAtt(handle, "Data"),
+                        If("IsProd", Ref(env), NoValue),
+                        Select(0, GetAZs("")),
+                        Base64(Split(",", "a,b")),
+                        FindInMap("RegionMap", Region, "AMI"),
+                        Cidr("10.0.0.0/16", 4, 8),
+                    ],
+                ),
+                Export=Export(Sub(f"${{AWS::StackName}}-Out{i}")),
+                Description="désc 0123\nline",
+            )
+        )
+    return template
+
+
+def _legacy_to_dict(template: Template) -> Dict[str, Any]:
+    """Serialize a Template with ``pydantic.BaseModel.dict``."""
+    return encode_to_dict(
+        template.dict(
+            by_alias=True,
+            exclude={i for i in Template.SECTIONS if not getattr(template, i, None)},
+            exclude_none=True,
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "fixture, kwargs",
+    [
+        ("template.json-result", {}),
+        ("template_unsorted.json-result", {"indent": None, "sort_keys": False}),
+    ],
+)
+def test_to_json_golden(fixture: str, kwargs: Dict[str, Any]) -> None:
+    """Output is identical to the output before serialization was optimized."""
+    expected = (FIXTURES / fixture).read_text(encoding="utf-8")
+    template = _template()
+    assert template.to_json(**kwargs) == expected
+    assert template.to_json(**kwargs) == expected  # cached output
+
+
+def test_to_dict_golden() -> None:
+    """Output is equal to the output of pydantic ``.dict()``, in the same order."""
+    template = _template()
+    output = template.to_dict()
+    legacy = _legacy_to_dict(template)
+    assert json.dumps(output) == json.dumps(legacy)
+    assert output == json.loads((FIXTURES / "template.json-result").read_text("utf-8"))
+
+
+@pytest.mark.parametrize("cached", [False, True])
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"indent": None},
+        {"indent": 0, "sort_keys": False},
+        {"indent": 1, "separators": (",", ":")},
+        {"indent": "\t", "sort_keys": False},
+        {"indent": None, "sort_keys": False, "separators": (", ", ": ")},
+    ],
+)
+def test_iter_json_chunks(kwargs: Dict[str, Any], cached: bool) -> None:
+    """Concatenated chunks are identical to the output of ``.to_json()``."""
+    template = _template()
+    if cached:
+        template.to_dict()
+    assert "".join(template.iter_json_chunks(**kwargs)) == template.to_json(**kwargs)
+
+
+def test_iter_json_chunks_empty() -> None:
+    """An empty Template is output the same way as by ``.to_json()``."""
+    template = Template()
+    assert "".join(template.iter_json_chunks()) == template.to_json()
@@ -0,0 +1,64 @@
+"""Tests for troposphere.Template."""
+from __future__ import annotations
+
+import pytest
+
+from troposphere import Template
+from troposphere.cloudformation import WaitCondition, WaitConditionHandle
+from troposphere.exceptions import DeferredValidationError
+from troposphere.policies import CreationPolicy, ResourceSignal
+
+
+def test_bulk_errors_name_object() -> None:
+    """Errors of deferred validation name the object that failed."""
+    template = Template()
+    with template.bulk():
+        template.add_resource(WaitConditionHandle(title="Valid"))
+        template.add_resource(WaitConditionHandle(title="Invalid", Metadata=5))
+
+    with pytest.raises(DeferredValidationError) as exc_info:
+        template.to_json()
+    assert [obj.title for obj, _ in exc_info.value.errors] == ["Invalid"]
+    assert "Invalid (WaitConditionHandle)" in str(exc_info.value)
+    assert "Metadata" in str(exc_info.value)
+
+
+def test_bulk_nested_errors() -> None:
+    """Objects contained by another object are validated with it."""
+    template = Template()
+    with template.bulk():
+        signal = ResourceSignal(title="Signal", Count="many")
+        policy = CreationPolicy(title="Policy", ResourceSignal=signal)
+        template.add_resource(WaitCondition(title="Condition", CreationPolicy=policy))
+
+    with pytest.raises(DeferredValidationError) as exc_info:
+        template.validate_deferred()
+    assert "Condition (WaitCondition)" in str(exc_info.value)
+    assert "CreationPolicy -> ResourceSignal -> Count" in str(exc_info.value)
+
+    signal.Count = 1
+    template.validate_deferred()
+    output = template.to_dict()["Resources"]["Condition"]["CreationPolicy"]
+    assert output == {"ResourceSignal": {"Count": 1}}
+
+
+def test_bulk_validated_by_owner() -> None:
+    """Objects are validated by the Template they are added to."""
+    template = Template()
+    other = Template()
+    with template.bulk():
+        other.add_resource(WaitConditionHandle(title="Invalid", Metadata=5))
+        template.add_resource(WaitConditionHandle(title="Valid"))
+
+    template.validate_deferred()
+    with pytest.raises(DeferredValidationError):
+        other.validate_deferred()
+
+
+def test_bulk_without_validation() -> None:
+    """Objects are never validated when validation is disabled."""
+    template = Template()
+    with template.bulk(validate=False):
+        template.add_resource(WaitConditionHandle(title="Handle", Metadata=5))
+
+    assert template.to_dict()["Resources"]["Handle"]["Metadata"] == 5
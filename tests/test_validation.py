@@ -0,0 +1,44 @@
+"""Tests for troposphere.validation."""
+from __future__ import annotations
+
+from typing import Any, Dict, Type
+
+import pytest
+from pydantic import main
+
+from troposphere import BaseAWSObject, Join, Output, Parameter, Ref
+from troposphere.cloudformation import Stack, WaitCondition, WaitConditionHandle
+from troposphere.loader import get_resource_class
+from troposphere.validation import validate_model
+
+
+@pytest.mark.parametrize(
+    "model, data",
+    [
+        (WaitConditionHandle, {"title": "Handle"}),
+        (WaitConditionHandle, {"title": "Handle", "Metadata": {"a": Ref("A")}}),
+        (WaitConditionHandle, {"title": "Handle", "Metadata": 1}),
+        (WaitConditionHandle, {"title": "bad-title", "Unknown": 1}),
+        (WaitConditionHandle, {}),
+        (WaitCondition, {"title": "Wait", "Handle": Ref("Handle"), "Timeout": "300"}),
+        (WaitCondition, {"title": "Wait", "Handle": Ref("Handle")}),
+        (Output, {"title": "Output", "Value": Join("", ["a", Ref("A")])}),
+        (Output, {"title": "Output", "Value": ["a"]}),
+        (Parameter, {"title": "Parameter", "Type": "String", "Default": 1}),
+        (Stack, {"title": "Stack", "TemplateURL": Ref("Url"), "Tags": ["a"]}),
+        (get_resource_class("Custom::Thing"), {"title": "Custom", "Extra": [1]}),
+    ],
+)
+def test_validate_model_matches_pydantic(
+    model: Type[BaseAWSObject], data: Dict[str, Any]
+) -> None:
+    """Data is validated the same way as pydantic."""
+    values, fields_set, error = validate_model(model, data)
+    expected_values, expected_fields_set, expected_error = main.validate_model(
+        model, data
+    )
+    assert str(error) == str(expected_error)
+    if expected_error is None:
+        assert values == expected_values
+        assert list(values) == list(expected_values)
+        assert fields_set == expected_fields_set
@@ -5,8 +5,14 @@
 # pylint: disable=unsubscriptable-object
 from __future__ import annotations
 
+import importlib
+import importlib.util
 import json
 import sys
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     AbstractSet,
@@ -14,6 +20,8 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
+    Iterable,
     Iterator,
     List,
     Mapping,
@@ -28,41 +36,68 @@ from typing import (
     overload,
 )
 
-import cfn_flip
-from pydantic import BaseModel, Extra, Field, validator
+from pydantic import BaseModel, Extra, Field, PrivateAttr, validator
 
-from . import mixins, validators
+from . import cfn_yaml, mixins, validators
 from .constants import (
     MAX_MAPPINGS,
     MAX_OUTPUTS,
     MAX_PARAMETERS,
     MAX_RESOURCES,
+    MAX_TEMPLATE_BODY_SIZE,
     PARAMETER_TITLE_MAX,
     SERVERLESS_TRANSFORM,
 )
+from .exceptions import (
+    DeferredValidationError,
+    InvalidReferenceError,
+    TemplateLimitError,
+)
+from .profiling import get_label, instrumented, is_profiling
+from .utils import (
+    JsonEncoder,
+    get_digest,
+    get_digest_and_size,
+)
 
 if TYPE_CHECKING:
     from pydantic.fields import ModelField
 
-    from .protocols import ToDictProtocol
+    from .diff import TemplateDiff
+    from .graph import DependencyGraph
+    from .nested import NestedStacks
+    from .optimize import CompressResult, FoldResult
+    from .protocols import DependentProtocol as _DependentProtocol
 
-if sys.version_info < (3, 8):
-    # importlib.metadata is standard lib for python>=3.8, use backport
-    from importlib_metadata import PackageNotFoundError
-    from importlib_metadata import (
-        version as get_version,  # type: ignore # pylint: disable=E
-    )
-else:
-    from importlib.metadata import PackageNotFoundError
-    from importlib.metadata import (
-        version as get_version,  # type: ignore # pylint: disable=E
-    )
 
-try:
-    __version__ = get_version(__name__)
-except PackageNotFoundError:
-    # package is not installed
-    __version__ = "0.0.0"
+def __getattr__(name: str) -> Any:
+    """Get module attributes that are loaded on first access.
+
+    ``__version__`` is looked up using package metadata and submodules (e.g.
+    ``troposphere.cloudformation``) are imported when first accessed to keep
+    ``import troposphere`` fast.
+
+    """
+    if name == "__version__":
+        # pylint: disable=import-outside-toplevel
+        if sys.version_info < (3, 8):
+            # importlib.metadata is standard lib for python>=3.8, use backport
+            from importlib_metadata import PackageNotFoundError
+            from importlib_metadata import version as get_version
+        else:
+            from importlib.metadata import PackageNotFoundError
+            from importlib.metadata import version as get_version
+
+        try:
+            version = get_version(__name__)
+        except PackageNotFoundError:
+            # package is not installed
+            version = "0.0.0"
+        globals()["__version__"] = version
+        return version
+    if not name.startswith("_") and importlib.util.find_spec(f"{__name__}.{name}"):
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # constants for DeletionPolicy and UpdateReplacePolicy
@@ -79,6 +114,18 @@ AWS_REGION = "AWS::Region"
 AWS_STACK_ID = "AWS::StackId"
 AWS_STACK_NAME = "AWS::StackName"
 AWS_URL_SUFFIX = "AWS::URLSuffix"
+PSEUDO_PARAMETERS = frozenset(
+    [
+        AWS_ACCOUNT_ID,
+        AWS_NOTIFICATION_ARNS,
+        AWS_NO_VALUE,
+        AWS_PARTITION,
+        AWS_REGION,
+        AWS_STACK_ID,
+        AWS_STACK_NAME,
+        AWS_URL_SUFFIX,
+    ]
+)
 
 _T = TypeVar("_T")
 
@@ -90,30 +137,71 @@ MappingIntStrAny = Mapping[Union[int, str], Any]
 
 BaseAWSObjectType = TypeVar("BaseAWSObjectType", bound="BaseAWSObject")
 
+_DEFER_VALIDATION: ContextVar[Optional[bool]] = ContextVar(
+    "_DEFER_VALIDATION", default=None
+)
+"""Set while validation is deferred. Whether objects are validated later."""
+
+_INTERN: ContextVar[Optional[Callable[[Any], Any]]] = ContextVar(
+    "_INTERN", default=None
+)
+"""Set while values are interned. Called with each field value to get a shared value."""
+
+_CACHE_OUTPUT: ContextVar[bool] = ContextVar("_CACHE_OUTPUT", default=True)
+"""Whether rendered output is cached. Unset while output is streamed."""
+
+
+_REQUIRED = object()
+"""Placeholder for the default value of required fields."""
+
+
+@lru_cache(maxsize=None)
+def _get_field_defaults(
+    model: Type[BaseModel],
+) -> Optional[Tuple[Dict[str, Any], Tuple[str, ...]]]:
+    """Get the default value of each field of a model, in order.
+
+    Required fields use :data:`_REQUIRED` as their default value.
+
+    Returns:
+        The defaults and the names of the required fields. ``None`` if
+        defaults can't be reused between instances (e.g. a default is mutable
+        or a field has an alias).
+
+    """
+    defaults: Dict[str, Any] = {}
+    for name, field in model.__fields__.items():
+        if field.alt_alias or field.default_factory:
+            return None
+        if field.required:
+            defaults[name] = _REQUIRED
+        elif field.default is None or isinstance(field.default, (str, int, float)):
+            defaults[name] = field.default
+        else:
+            return None
+    return defaults, tuple(k for k, v in defaults.items() if v is _REQUIRED)
 
-def encode_to_dict(
-    obj: Union[Dict[str, object], List[object], Tuple[object], object]
-) -> Any:
-    """Encode objects to dict."""
-    if hasattr(obj, "to_dict"):
-        # Calling encode_to_dict to ensure object is
-        # nomalized to a base dictionary all the way down.
-        return encode_to_dict(cast("ToDictProtocol", obj).to_dict())
-    if isinstance(obj, (list, tuple)):
-        new_lst: List[object] = []
-        for i in cast(Union[List[object], Tuple[object, ...]], obj):
-            new_lst.append(encode_to_dict(i))
-        return new_lst
-    if isinstance(obj, dict):
-        props: Dict[str, object] = {}
-        for name, prop in cast(Dict[str, object], obj).items():
-            props[name] = encode_to_dict(prop)
-        return props
-    # This is useful when dealing with external libs using
-    # this format. Specifically awacs.
-    if hasattr(obj, "JSONrepr"):
-        return encode_to_dict(obj.JSONrepr())  # type: ignore
-    return obj
+
+@lru_cache(maxsize=None)
+def _get_private_defaults(
+    model: Type[BaseModel],
+) -> Optional[Tuple[Tuple[str, Any], ...]]:
+    """Get the default value of each private attribute of a model.
+
+    Returns:
+        ``None`` if defaults can't be shared between instances (e.g. a default
+        is mutable or created by a factory).
+
+    """
+    defaults: List[Tuple[str, Any]] = []
+    for name, private_attr in model.__private_attributes__.items():
+        default = private_attr.default
+        if private_attr.default_factory or not (
+            default is None or isinstance(default, (bool, int, str))
+        ):
+            return None
+        defaults.append((name, default))
+    return tuple(defaults)
 
 
 class BaseAWSObject(BaseModel):
@@ -130,9 +218,19 @@ class BaseAWSObject(BaseModel):
     ]
     DICT_NAME: ClassVar[Optional[str]] = None
 
-    title: str = Field(..., regex=r"^[a-zA-Z0-9]+$")
+    __slots__ = ("__weakref__",)
+
+    title: str
     template: Optional[Template] = Field(default=None)
 
+    _dependents: Optional[Dict[int, weakref.ref[_DependentProtocol]]] = PrivateAttr(
+        default=None
+    )
+    _digest_cache: Optional[str] = PrivateAttr(default=None)
+    _pending_validation: bool = PrivateAttr(default=False)
+    _render_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _size_cache: Optional[int] = PrivateAttr(default=None)
+
     class Config:
         """Model configuration."""
 
@@ -140,15 +238,97 @@ class BaseAWSObject(BaseModel):
         extra = Extra.forbid
         fields = {"template": {"exclude": True}, "title": {"exclude": True}}
 
+    _validate_title = cast(
+        "classmethod[Callable[..., Any]]",
+        validator("title", allow_reuse=True)(validators.validate_title),
+    )
+
     def __init__(self, **data: Any) -> None:
         """Instantiate class.
 
         Calls parent ``.__init__()`` method then performes custom steps.
+        Validation is skipped when instantiated inside of
+        :meth:`troposphere.Template.bulk`.
 
         """
-        super().__init__(**data)
+        defer_validation = _DEFER_VALIDATION.get()
+        if defer_validation is not None and "title" in data:
+            self._init_without_validation(data)
+            if defer_validation:
+                object.__setattr__(self, "_pending_validation", True)
+        elif is_profiling():
+            self._init_profiled(data)
+        else:
+            self._init_with_validation(data)
+        intern = _INTERN.get()
+        if intern is not None:
+            values = self.__dict__
+            for name, value in values.items():
+                if value is not None and value.__class__ not in SCALAR_TYPES:
+                    values[name] = intern(value)
         self.add_to_template()
 
+    def _init_with_validation(self, data: Dict[str, Any]) -> None:
+        """Initialize the object, validating data.
+
+        Same as :meth:`pydantic.BaseModel.__init__` but validates with
+        :func:`troposphere.validation.validate_model`.
+
+        """
+        values, fields_set, error = validate_model(self.__class__, data)
+        if error is not None:
+            raise error
+        object.__setattr__(self, "__dict__", values)
+        object.__setattr__(self, "__fields_set__", fields_set)
+        self._init_private_attributes()
+
+    @instrumented("validate")
+    def _init_profiled(self, data: Dict[str, Any]) -> None:
+        """Initialize the object, validating data, while a profiler is active."""
+        self._init_with_validation(data)
+
+    def _init_private_attributes(self) -> None:
+        """Set private attributes to their default value.
+
+        Same as the parent method but defaults are only copied when they
+        can't be shared between instances.
+
+        """
+        defaults = _get_private_defaults(self.__class__)
+        if defaults is None:
+            super()._init_private_attributes()
+            return
+        object_setattr = object.__setattr__
+        for name, default in defaults:
+            object_setattr(self, name, default)
+
+    def _init_without_validation(self, data: Dict[str, Any]) -> None:
+        """Initialize the object without validating data.
+
+        Same as :meth:`pydantic.BaseModel.construct` but for an existing object.
+
+        """
+        field_defaults = _get_field_defaults(self.__class__)
+        if field_defaults is None:
+            values: Dict[str, Any] = {}
+            for name, field in self.__fields__.items():
+                if field.alt_alias and field.alias in data:
+                    values[name] = data[field.alias]
+                elif name in data:
+                    values[name] = data[name]
+                elif not field.required:
+                    values[name] = field.get_default()
+            values.update(data)
+        else:
+            defaults, required = field_defaults
+            values = {**defaults, **data}
+            for name in required:
+                if name not in data:
+                    del values[name]
+        object.__setattr__(self, "__dict__", values)
+        object.__setattr__(self, "__fields_set__", set(data))
+        self._init_private_attributes()
+
     def add_to_template(self):
         """Add object to a Template.
 
@@ -158,6 +338,20 @@ class BaseAWSObject(BaseModel):
         if self.template:
             self.template.add_resource(self)
 
+    @classmethod
+    def validate(cls: Type[BaseAWSObjectType], value: Any) -> BaseAWSObjectType:
+        """Validate value of a field containing a model.
+
+        Objects whose validation was deferred are validated first so their
+        errors are reported by the object containing them.
+
+        """
+        if getattr(value, "_pending_validation", False):
+            error = validate_pending(value)
+            if error is not None:
+                raise error
+        return super().validate(value)
+
     def dict(
         self,
         *,
@@ -192,13 +386,175 @@ class BaseAWSObject(BaseModel):
             return {self.DICT_NAME: data, **attributes}
         return encode_to_dict(data)
 
+    def invalidate(self) -> None:
+        """Clear the cached output of the object and any object containing it.
+
+        Called automatically when a field is assigned a new value. Call it
+        after modifying a field's value in place (e.g. appending to a list).
+
+        """
+        if self._render_cache is None:
+            # objects containing this one were invalidated when it was cleared
+            return
+        object.__setattr__(self, "_digest_cache", None)
+        object.__setattr__(self, "_render_cache", None)
+        object.__setattr__(self, "_size_cache", None)
+        for ref in list((self._dependents or {}).values()):
+            dependent = ref()
+            if dependent is not None:
+                dependent.invalidate()
+
+    def digest(self) -> str:
+        """Get the SHA-256 digest of the object's output.
+
+        Objects with identical output have the same digest. The digest is
+        cached along with the output of the object.
+
+        """
+        return self._digest(None)
+
+    def _digest(self, dependent: Optional[_DependentProtocol]) -> str:
+        """Get the digest of the object's output, using the cached digest.
+
+        Args:
+            dependent: Object whose output will contain the output of this
+                object. It is invalidated when this object is invalidated.
+
+        """
+        data = self._render(dependent)
+        if self._digest_cache is None:
+            self._measure(data)
+        return cast(str, self._digest_cache)
+
+    def _size(self, dependent: Optional[_DependentProtocol]) -> int:
+        """Get the size of the object's output as compact JSON, using the cache.
+
+        Args:
+            dependent: Object whose output will contain the output of this
+                object. It is invalidated when this object is invalidated.
+
+        """
+        data = self._render(dependent)
+        if self._size_cache is None:
+            self._measure(data)
+        return cast(int, self._size_cache)
+
+    def _measure(self, data: Dict[str, Any]) -> None:
+        """Cache the digest and size of the object's output.
+
+        Both are calculated from the same encoding of the output.
+
+        """
+        digest, size = get_digest_and_size(data)
+        object.__setattr__(self, "_digest_cache", digest)
+        object.__setattr__(self, "_size_cache", size)
+
     def to_dict(self) -> Dict[str, Any]:
         """Output object as a dictionary.
 
         High-level alternative to :method:`troposphere.BaseAWSObject.dict`.
+        The output is equivalent to ``.dict(by_alias=True, exclude_none=True)``
+        but is built in a single pass over the fields of the object.
+
+        Output is cached until the object, or an object it contains, is
+        modified. The returned dict is a copy of the cached output.
+
+        """
+        return copy_output(self._render(None))
+
+    def _render(self, dependent: Optional[_DependentProtocol]) -> Dict[str, Any]:
+        """Output object as a dictionary, using cached output if available.
+
+        Args:
+            dependent: Object whose output will contain the output of this
+                object. It is invalidated when this object is invalidated.
+
+        """
+        if dependent is not None:
+            dependents = self._dependents
+            if dependents is None:
+                dependents = {}
+                object.__setattr__(self, "_dependents", dependents)
+            ref = dependents.get(id(dependent))
+            if ref is None or ref() is not dependent:
+                dependents[id(dependent)] = weakref.ref(dependent)
+        data = self._render_cache
+        if data is None:
+            data = self._serialize()
+            if _CACHE_OUTPUT.get():
+                object.__setattr__(self, "_render_cache", data)
+        return data
+
+    def _render_uncached(self) -> Dict[str, Any]:
+        """Output object as a dictionary without caching output that isn't cached.
+
+        Cached output of the object, and of the objects it contains, is reused.
 
         """
-        return self.dict(by_alias=True, exclude_none=True)
+        token = _CACHE_OUTPUT.set(False)
+        try:
+            return self._render(None)
+        finally:
+            _CACHE_OUTPUT.reset(token)
+
+    @instrumented("serialize")
+    def _serialize(self) -> Dict[str, Any]:
+        """Serialize the fields of the object.
+
+        See :func:`troposphere.serialization.serialize_fields`.
+
+        """
+        return serialize_fields(self)
+
+    def _copy_and_set_values(
+        self: BaseAWSObjectType, values: Any, fields_set: Any, *, deep: bool
+    ) -> BaseAWSObjectType:
+        """Copy the object, excluding cached output.
+
+        The copy doesn't share the fields of the object, which pydantic 1.10
+        does for models copied when validated. Assigning a field of one would
+        otherwise change the other without invalidating its cached output.
+
+        """
+        if values is self.__dict__:
+            values = dict(values)
+        if fields_set is self.__fields_set__:
+            fields_set = set(fields_set)
+        copied = super()._copy_and_set_values(values, fields_set, deep=deep)
+        object.__setattr__(copied, "_dependents", None)
+        object.__setattr__(copied, "_digest_cache", None)
+        object.__setattr__(copied, "_render_cache", None)
+        object.__setattr__(copied, "_size_cache", None)
+        return copied
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        """Get state for pickling, excluding cached output.
+
+        The ``template`` back-reference is also excluded. It is restored when
+        the object is unpickled as part of a :class:`troposphere.Template`.
+
+        """
+        cached = ("_dependents", "_digest_cache", "_render_cache", "_size_cache")
+        state = super().__getstate__()
+        if state["__dict__"].get("template") is not None:
+            state["__dict__"] = {**state["__dict__"], "template": None}
+        state["__private_attribute_values__"] = {
+            k: v
+            for k, v in state["__private_attribute_values__"].items()
+            if k not in cached
+        }
+        return state
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute value, invalidating cached output."""
+        super().__setattr__(name, value)
+        if self._render_cache is not None and name not in self.__private_attributes__:
+            self.invalidate()
+
+    def __setstate__(self, state: Dict[Any, Any]) -> None:
+        """Set state when unpickling."""
+        self._init_private_attributes()
+        super().__setstate__(state)
 
     @classmethod
     def from_dict(
@@ -211,15 +567,100 @@ class BaseAWSObject(BaseModel):
 
 AWSHelperFnType = TypeVar("AWSHelperFnType", bound="AWSHelperFn")
 
+_REFS: Dict[str, Ref] = {}
+_REFS_MAX = 65536
+
+_SHARED_HELPERS: weakref.WeakValueDictionary[
+    int, AWSHelperFn
+] = weakref.WeakValueDictionary()
+"""Helper functions shared by :meth:`troposphere.Template.interning`, keyed by id."""
+
 
 class AWSHelperFn(mixins.ToJsonMixin):
-    """Helper function."""
+    """Helper function.
+
+    Helper functions are compared and hashed using the digest of their output
+    so they can be used in sets and as dict keys.
+
+    Subclasses representing an intrinsic function set :attr:`FUNCTION` and
+    only store the function's arguments. ``data`` is produced on demand so
+    modifying it in place has no effect (assign a new value instead).
+
+    """
+
+    __slots__ = ("__weakref__", "_args", "_digest_cache", "_encoded_cache")
+
+    FUNCTION: ClassVar[Optional[str]] = None
+    """Name of the intrinsic function (e.g. ``Fn::Join``)."""
+
+    # caches are only set once used so instantiating stays cheap
+    _digest_cache: Optional[str]
+    _encoded_cache: Any
+
+    @property
+    def data(self) -> Any:
+        """Output of the helper function before it is encoded."""
+        if self.FUNCTION:
+            return {self.FUNCTION: self._args}
+        return self._args
+
+    @data.setter
+    def data(self, value: Any) -> None:
+        """Set the output of the helper function."""
+        if _SHARED_HELPERS.get(id(self)) is self:
+            raise AttributeError(f"{self!r} is shared and can't be modified")
+        if self.FUNCTION:
+            if not isinstance(value, dict) or list(value) != [self.FUNCTION]:
+                raise ValueError(
+                    f"{self.__class__.__name__} data must be a dict containing "
+                    f"only {self.FUNCTION}"
+                )
+            value = value[self.FUNCTION]
+        self._args = value
+        self._digest_cache = None
+        self._encoded_cache = None
+
+    def digest(self) -> str:
+        """Get the SHA-256 digest of the helper function's output."""
+        digest: Optional[str] = getattr(self, "_digest_cache", None)
+        if digest is None:
+            digest = self._digest_cache = get_digest(self._encode(self))
+        return digest
+
+    def invalidate(self) -> None:
+        """Clear the cached digest and output.
+
+        Called automatically when an object contained in ``data`` is modified.
+        Must be called after modifying a value contained in ``data`` in place.
 
-    data: Dict[str, Any]
+        """
+        self._digest_cache = None
+        self._encoded_cache = None
+
+    def _encode(self, dependent: Optional[_DependentProtocol]) -> Any:
+        """Encode the output of the helper function, using cached output if available.
+
+        Output is only cached when the arguments are constant (they don't
+        contain a :class:`troposphere.BaseAWSObject`) so the same helper
+        function used by many objects is only encoded once.
+
+        Args:
+            dependent: Object whose output will contain the encoded output.
+
+        """
+        encoded = getattr(self, "_encoded_cache", None)
+        if encoded is None:
+            encoded = encode(self.data, dependent)
+            self._encoded_cache = encoded if is_constant(self._args) else None
+        return encoded
 
     def to_dict(self) -> Dict[str, Any]:
         """Output object as a dictionary."""
-        return encode_to_dict(self.data)
+        return copy_output(self._encode(None))
+
+    def _to_shared_dict(self) -> Dict[str, Any]:
+        """Output object as a dictionary, sharing the cached output."""
+        return self._encode(None)
 
     @staticmethod
     def getdata(data: Union[BaseAWSObject, _T]) -> Union[str, _T]:
@@ -228,15 +669,19 @@ class AWSHelperFn(mixins.ToJsonMixin):
             return data.title
         return data
 
+    def __getstate__(self) -> Any:
+        """Get state for pickling, excluding cached output."""
+        return None, {"_args": self._args}
+
     def __eq__(self, other: object) -> bool:
         """Evaluate equality."""
-        if isinstance(other, self.__class__):
-            return self.data == other.data
-        return self.to_dict() == other
+        if isinstance(other, AWSHelperFn):
+            return self.digest() == other.digest()
+        return self._encode(None) == other
 
-    def __hash__(self):
+    def __hash__(self) -> int:
         """Return the object's hash."""
-        return hash(self.data)
+        return hash(self.digest())
 
     def __ne__(self, other: object) -> bool:
         """Evaluate inequality."""
@@ -244,7 +689,7 @@ class AWSHelperFn(mixins.ToJsonMixin):
 
     def __str__(self) -> str:
         """Return the representation of the object."""
-        return json.dumps(self.to_dict())
+        return json.dumps(self._encode(None))
 
     @classmethod
     def __get_validators__(
@@ -262,7 +707,7 @@ class AWSHelperFn(mixins.ToJsonMixin):
         """Validate value."""
         if isinstance(__v, cls):
             return __v
-        return cls()
+        raise TypeError(f"{cls.__qualname__} required")
 
 
 AWSHelperFnOrDict = Union[Dict[str, Any], AWSHelperFn]
@@ -284,6 +729,31 @@ class AWSDeclaration(BaseAWSObject):
 class Template(BaseModel, mixins.ToJsonMixin):
     """Python representation of a CloudFormation Template."""
 
+    SECTIONS: ClassVar[FrozenSet[str]] = frozenset(
+        [
+            "conditions",
+            "mappings",
+            "metadata",
+            "outputs",
+            "parameters",
+            "resources",
+            "rules",
+        ]
+    )
+    """Sections of the Template that are excluded from the output when empty."""
+    STREAMED_SECTIONS: ClassVar[FrozenSet[str]] = frozenset(
+        ["outputs", "parameters", "resources"]
+    )
+    """Sections of the Template that are streamed one entry at a time."""
+
+    __slots__ = ("__weakref__",)
+
+    _deferred: List[BaseAWSObject] = PrivateAttr(default_factory=list)
+    _digest_cache: Optional[str] = PrivateAttr(default=None)
+    _enforce_limits: bool = PrivateAttr(default=True)
+    _graph: Optional[DependencyGraph] = PrivateAttr(default=None)
+    _size_cache: Optional[int] = PrivateAttr(default=None)
+
     conditions: Dict[str, Any] = Field(default={}, alias="Conditions")
     description: Optional[str] = Field(default=None, alias="Description")
     globals: Optional[AWSHelperFnOrDict] = Field(default=None, alias="Globals")
@@ -293,7 +763,7 @@ class Template(BaseModel, mixins.ToJsonMixin):
     parameters: Dict[str, Parameter] = Field(default={}, alias="Parameters")
     resources: Dict[str, BaseAWSObject] = Field(default={}, alias="Resources")
     rules: Dict[str, Dict[str, Any]] = Field(default={}, alias="Rules")
-    transform: Optional[str] = Field(default=None, alias="Transform")
+    transform: Optional[Union[str, List[str]]] = Field(default=None, alias="Transform")
     version: Optional[str] = Field(
         default="2010-09-09", alias="AWSTemplateFormatVersion"
     )
@@ -318,23 +788,136 @@ class Template(BaseModel, mixins.ToJsonMixin):
     ) -> List[BaseAWSObjectType]:
         ...
 
+    @instrumented(
+        "add", label=lambda _self, _current, new_values: get_label(new_values)
+    )
     def _update(
         self,
         current_value: Dict[str, Any],
         new_values: Union[List[BaseAWSObjectType], BaseAWSObjectType],
     ) -> Union[List[BaseAWSObjectType], BaseAWSObjectType]:
-        """Update attribute vale."""
+        """Update attribute vale.
+
+        A list of values is checked for duplicate titles before any are added.
+        Objects whose validation was deferred are validated by this Template.
+
+        """
+        # pylint: disable=protected-access
         if isinstance(new_values, list):
-            for v in new_values:
-                if v.title in current_value:
-                    self.handle_duplicate_key(v.title)
-                current_value[v.title] = v
+            titles = [v.title for v in new_values]
+            repeated = len(set(titles)) != len(titles)
+            if repeated or not current_value.keys().isdisjoint(titles):
+                seen = set(current_value)
+                for title in titles:
+                    if title in seen:
+                        self.handle_duplicate_key(title)
+                    seen.add(title)
+            current_value.update(zip(titles, new_values))
+            self._deferred.extend(v for v in new_values if v._pending_validation)
         else:
             if new_values.title in current_value:
                 self.handle_duplicate_key(new_values.title)
             current_value[new_values.title] = new_values
+            if new_values._pending_validation:
+                self._deferred.append(new_values)
+        self.invalidate()
         return new_values
 
+    def _iter_sections(self) -> Iterator[Tuple[str, str, Any]]:
+        """Iterate over the sections of the Template that are included in output.
+
+        Yields:
+            Tuple containing the field name, alias and (unserialized) value
+            of each section.
+
+        """
+        fields = self.__fields__
+        for name, value in self.__dict__.items():
+            if value is None or (not value and name in self.SECTIONS):
+                continue
+            yield name, fields[name].alias, value
+
+    @contextmanager
+    def bulk(self, validate: bool = True) -> Iterator[Template]:
+        """Defer validation of objects instantiated inside this context.
+
+        Objects are validated by the Template they are added to, together, the
+        next time it is output or when
+        :meth:`troposphere.Template.validate_deferred` is called. Objects
+        contained by another object are validated with it.
+
+        Args:
+            validate: Validate objects later. When ``False``, objects are
+                never validated so this should only be used with trusted data.
+
+        Example:
+            .. code-block:: python
+
+                with template.bulk():
+                    for i in range(1000):
+                        WaitConditionHandle(title=f"Handle{i}", template=template)
+
+        """
+        token = _DEFER_VALIDATION.set(validate)
+        try:
+            yield self
+        finally:
+            _DEFER_VALIDATION.reset(token)
+
+    @contextmanager
+    def interning(self) -> Iterator[Template]:
+        """Share identical values between objects instantiated inside this context.
+
+        Helper functions, dicts and lists assigned to fields are replaced by a
+        shared instance when an identical value was already used. Shared
+        values are output once and can't be modified. See
+        :class:`troposphere.interning.Interner`.
+
+        Example:
+            .. code-block:: python
+
+                with template.interning():
+                    for i in range(1000):
+                        Stack(
+                            title=f"Stack{i}",
+                            template=template,
+                            TemplateURL=Sub("https://${Bucket}.s3.amazonaws.com/x"),
+                            Tags=[{"Key": "Team", "Value": "Platform"}],
+                        )
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from .interning import Interner
+
+        token = _INTERN.set(Interner().intern)
+        try:
+            yield self
+        finally:
+            _INTERN.reset(token)
+
+    @contextmanager
+    def without_limits(self) -> Iterator[Template]:
+        """Allow more entries than CloudFormation permits to be added in this context.
+
+        Used to build a Template that is then split into nested stacks using
+        :meth:`troposphere.Template.split`.
+
+        Example:
+            .. code-block:: python
+
+                with template.without_limits():
+                    for i in range(1000):
+                        WaitConditionHandle(title=f"Handle{i}", template=template)
+                nested = template.split()
+
+        """
+        previous = self._enforce_limits
+        self._enforce_limits = False
+        try:
+            yield self
+        finally:
+            self._enforce_limits = previous
+
     def add_condition(self, name: str, condition: Any) -> str:  # TODO set type
         """Add Template Condition.
 
@@ -347,6 +930,7 @@ class Template(BaseModel, mixins.ToJsonMixin):
 
         """
         self.conditions[name] = condition
+        self.invalidate()
         return name
 
     def add_mapping(self, name: str, mapping: Dict[str, Any]) -> None:
@@ -357,24 +941,59 @@ class Template(BaseModel, mixins.ToJsonMixin):
             mapping: Contents of the mapping.
 
         """
-        if len(self.mappings) >= MAX_MAPPINGS:
+        if self._enforce_limits and len(self.mappings) >= MAX_MAPPINGS:
             raise ValueError(f"Maximum mappings {MAX_MAPPINGS} reached")
         if name not in self.mappings:
             self.mappings[name] = {}
         self.mappings[name].update(mapping)
+        self.invalidate()
 
     def add_output(self, output: Output) -> Output:
         """Add :class:`troposphere.Output` to Template."""
-        if len(self.outputs) >= MAX_OUTPUTS:
+        if self._enforce_limits and len(self.outputs) >= MAX_OUTPUTS:
+            raise ValueError(f"Maximum outputs {MAX_OUTPUTS} reached")
+        self._update(self.outputs, output)
+        if self._graph is not None:
+            self._graph.add("outputs", output)
+        return output
+
+    def add_outputs(self, outputs: Iterable[Output]) -> List[Output]:
+        """Add multiple :class:`troposphere.Output` to Template.
+
+        The limit and duplicate titles are checked for every Output before
+        any are added so either all or none of them are added.
+
+        """
+        new_outputs = list(outputs)
+        if self._enforce_limits and len(self.outputs) + len(new_outputs) > MAX_OUTPUTS:
             raise ValueError(f"Maximum outputs {MAX_OUTPUTS} reached")
-        return self._update(self.outputs, output)
+        self._update(self.outputs, new_outputs)
+        if self._graph is not None:
+            for output in new_outputs:
+                self._graph.add("outputs", output)
+        return new_outputs
 
     def add_parameter(self, parameter: Parameter) -> Parameter:
         """Add :class:`troposphere.Parameter` to Template."""
-        if len(self.parameters) >= MAX_PARAMETERS:
+        if self._enforce_limits and len(self.parameters) >= MAX_PARAMETERS:
             raise ValueError(f"Maximum parameters {MAX_PARAMETERS} reached")
         return self._update(self.parameters, parameter)
 
+    def add_parameters(self, parameters: Iterable[Parameter]) -> List[Parameter]:
+        """Add multiple :class:`troposphere.Parameter` to Template.
+
+        The limit and duplicate titles are checked for every Parameter before
+        any are added so either all or none of them are added.
+
+        """
+        new_parameters = list(parameters)
+        if (
+            self._enforce_limits
+            and len(self.parameters) + len(new_parameters) > MAX_PARAMETERS
+        ):
+            raise ValueError(f"Maximum parameters {MAX_PARAMETERS} reached")
+        return self._update(self.parameters, new_parameters)
+
     def add_parameter_to_group(
         self, parameter: Union[BaseAWSObject, str], group_name: str
     ):
@@ -401,14 +1020,46 @@ class Template(BaseModel, mixins.ToJsonMixin):
             groups.append(existing_group)
 
         existing_group["Parameters"].append(parameter)
+        self.invalidate()
 
         return group_name
 
     def add_resource(self, resource: BaseAWSObjectType) -> BaseAWSObjectType:
         """Add Template Resource."""
-        if len(self.resources) >= MAX_RESOURCES:
+        if self._enforce_limits and len(self.resources) >= MAX_RESOURCES:
             raise ValueError(f"Maximum number of resources {MAX_RESOURCES} reached")
-        return self._update(self.resources, resource)
+        self._update(self.resources, resource)
+        if self._graph is not None:
+            self._graph.add("resources", resource)
+        return resource
+
+    def add_resources(
+        self, resources: Iterable[BaseAWSObjectType]
+    ) -> List[BaseAWSObjectType]:
+        """Add multiple resources to Template.
+
+        The limit and duplicate titles are checked for every resource before
+        any are added so either all or none of them are added.
+
+        Example:
+            .. code-block:: python
+
+                template.add_resources(
+                    WaitConditionHandle(title=f"Handle{i}") for i in range(100)
+                )
+
+        """
+        new_resources = list(resources)
+        if (
+            self._enforce_limits
+            and len(self.resources) + len(new_resources) > MAX_RESOURCES
+        ):
+            raise ValueError(f"Maximum number of resources {MAX_RESOURCES} reached")
+        self._update(self.resources, new_resources)
+        if self._graph is not None:
+            for resource in new_resources:
+                self._graph.add("resources", resource)
+        return new_resources
 
     def add_rule(self, name: str, rule: Dict[str, Any]):
         """Add a Rule to the template to enforce extra constraints on the parameters.
@@ -427,6 +1078,132 @@ class Template(BaseModel, mixins.ToJsonMixin):
         if name in self.rules:
             self.handle_duplicate_key(name)
         self.rules[name] = rule
+        self.invalidate()
+
+    def check_limits(self, max_size: int = MAX_TEMPLATE_BODY_SIZE) -> None:
+        """Check that the Template is within the limits enforced by CloudFormation.
+
+        The size is checked using :meth:`troposphere.Template.estimate_size` so
+        it can be checked as entries are added without rendering the Template.
+        The number of entries in each section and the number of attributes of
+        each Mapping are also checked.
+
+        Args:
+            max_size: Max size in bytes of the Template. Use
+                :data:`troposphere.constants.MAX_TEMPLATE_URL_SIZE` for
+                Templates that will be uploaded to S3.
+
+        Raises:
+            TemplateLimitError: One or more limits are exceeded. Contains
+                every limit that is exceeded.
+
+        """
+        from .limits import (  # pylint: disable=import-outside-toplevel
+            find_limit_violations,
+        )
+
+        violations = find_limit_violations(self, max_size)
+        if violations:
+            raise TemplateLimitError(violations)
+
+    def evaluate_conditions(
+        self,
+        parameters: Optional[Mapping[str, Any]] = None,
+        pseudo_parameters: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, bool]:
+        """Evaluate every Condition of the Template without deploying it.
+
+        See :class:`troposphere.conditions.ConditionEvaluator`.
+
+        Args:
+            parameters: Values of the Template's Parameters. Parameters
+                without a value use their ``Default``.
+            pseudo_parameters: Values of pseudo parameters, keyed by name
+                (e.g. ``{AWS_REGION: "us-east-1"}``).
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from .conditions import ConditionEvaluator
+
+        return ConditionEvaluator(self, parameters, pseudo_parameters).evaluate_all()
+
+    def resolve_conditions(
+        self,
+        parameters: Optional[Mapping[str, Any]] = None,
+        pseudo_parameters: Optional[Mapping[str, Any]] = None,
+    ) -> Template:
+        """Build a copy of the Template with the Conditions resolved.
+
+        Resources and Outputs whose condition is false are removed, ``Fn::If``
+        is replaced by the selected value and ``AWS::NoValue`` is removed.
+        See :meth:`troposphere.conditions.ConditionEvaluator.prune`.
+
+        Args:
+            parameters: Values of the Template's Parameters. Parameters
+                without a value use their ``Default``.
+            pseudo_parameters: Values of pseudo parameters, keyed by name
+                (e.g. ``{AWS_REGION: "us-east-1"}``).
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from .conditions import ConditionEvaluator
+
+        return ConditionEvaluator(self, parameters, pseudo_parameters).prune()
+
+    def fold_constants(self) -> FoldResult:
+        """Build a copy of the Template with constant intrinsic functions folded.
+
+        ``Fn::Base64``, ``Fn::Cidr``, ``Fn::Join``, ``Fn::Select``,
+        ``Fn::Split`` and ``Fn::Sub`` whose arguments are constant are replaced
+        by their value when it is not larger. See
+        :class:`troposphere.optimize.ConstantFolder`.
+
+        Returns:
+            The new Template and the intrinsic functions that were folded.
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from .optimize import fold_constants
+
+        return fold_constants(self)
+
+    def compress_mappings(self) -> CompressResult:
+        """Build a copy of the Template with repeated values moved to Mappings.
+
+        ``Fn::If`` chains selecting a value for each allowed value of a
+        parameter and long strings repeated in resource properties and output
+        values are replaced by ``Fn::FindInMap`` when it makes the Template
+        smaller. See :class:`troposphere.optimize.MappingCompressor`.
+
+        Returns:
+            The new Template, the Mappings added, the number of values
+            replaced and the number of bytes saved.
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from .optimize import compress_mappings
+
+        return compress_mappings(self)
+
+    def diff(self, other: Template) -> TemplateDiff:
+        """Compare the Template with another Template.
+
+        Conditions, Mappings, Outputs, Parameters and Resources are compared.
+        Entries with the same digest are skipped so the cost scales with the
+        number of changed entries.
+
+        Args:
+            other: Template to compare to. Changes are reported as going from
+                this Template to ``other`` (e.g. ``deployed.diff(generated)``).
+
+        Returns:
+            Entries that were added, modified or removed and the JSONPath of
+            each changed value.
+
+        """
+        from .diff import diff_templates  # pylint: disable=import-outside-toplevel
+
+        return diff_templates(self, other)
 
     def dict(
         self,
@@ -457,6 +1234,108 @@ class Template(BaseModel, mixins.ToJsonMixin):
             )
         )
 
+    def dependency_graph(self) -> DependencyGraph:
+        """Get the graph of references between the entries of the Template.
+
+        The graph is built on first use and kept up to date as entries are
+        added or modified so later calls only index what changed.
+
+        """
+        self.validate_deferred()
+        if self._graph is None:
+            from .graph import (  # pylint: disable=import-outside-toplevel
+                DependencyGraph,
+            )
+
+            self._graph = DependencyGraph(self)
+        else:
+            self._graph.refresh()
+        return self._graph
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Template:
+        """Instantiate class from a dict containing a CloudFormation template.
+
+        Resources are instantiated using the class registered for their type
+        in :attr:`troposphere.AWSObject.RESOURCE_TYPES`. Intrinsic functions
+        are instantiated as :class:`troposphere.AWSHelperFn` subclasses.
+
+        """
+        from .loader import load_template  # pylint: disable=import-outside-toplevel
+
+        return load_template(data, cls)
+
+    @classmethod
+    def from_json(cls, source: str) -> Template:
+        """Instantiate class from a CloudFormation template in JSON format."""
+        return cls.from_dict(json.loads(source))
+
+    @classmethod
+    def from_yaml(cls, source: str) -> Template:
+        """Instantiate class from a CloudFormation template in YAML format."""
+        return cls.from_dict(cfn_yaml.load_yaml(source))
+
+    @classmethod
+    def validate(cls: Type[Template], value: Any) -> Template:
+        """Validate value of a field containing a Template.
+
+        Templates are not copied (the default for pydantic models) so objects
+        are added to, and invalidate the cached information of, the Template
+        that was passed to them.
+
+        """
+        if isinstance(value, cls):
+            return value
+        return super().validate(value)
+
+    def validate_references(self) -> None:
+        """Validate that every reference is to a name defined in the Template.
+
+        ``Ref``, ``Fn::GetAtt``, ``Fn::Sub`` and ``DependsOn`` must reference
+        a resource, parameter or pseudo parameter (e.g.
+        :data:`troposphere.AWS_REGION`) as appropriate for where they are used.
+        References from Outputs and Resources are indexed by
+        :meth:`troposphere.Template.dependency_graph` so only entries modified
+        since the last call are searched again.
+
+        Raises:
+            InvalidReferenceError: One or more references are to undefined
+                names. Contains every invalid reference and its JSONPath.
+
+        """
+        from .graph import (  # pylint: disable=import-outside-toplevel
+            find_invalid_references,
+        )
+
+        invalid = find_invalid_references(self)
+        if invalid:
+            raise InvalidReferenceError(invalid)
+
+    @instrumented("validate")
+    def validate_deferred(self) -> None:
+        """Validate objects instantiated inside of :meth:`troposphere.Template.bulk`.
+
+        Only objects added to this Template are validated. Invalid objects stay
+        pending so they are reported again until they are fixed.
+
+        Raises:
+            DeferredValidationError: One or more objects failed validation.
+                Contains every error that was encountered.
+
+        """
+        if not self._deferred:
+            return
+        errors: List[Tuple[BaseAWSObject, Any]] = []
+        for obj in self._deferred:
+            # pylint: disable=protected-access
+            if obj._pending_validation:  # may have been validated with a parent
+                error = validate_pending(obj)
+                if error is not None:
+                    errors.append((obj, error))
+        self._deferred[:] = [obj for obj, _ in errors]
+        if errors:
+            raise DeferredValidationError(errors)
+
     def get_or_add_parameter(self, parameter: Parameter) -> Parameter:
         """Get a :class:`troposphere.Parameter` from the Template or add it."""
         if parameter.title in self.parameters:
@@ -494,8 +1373,9 @@ class Template(BaseModel, mixins.ToJsonMixin):
             parameter = parameter.title
 
         labels[parameter] = {"default": label}
+        self.invalidate()
 
-    def set_transform(self, transform: str) -> None:
+    def set_transform(self, transform: Union[str, List[str]]) -> None:
         """Set Template transform."""
         # this isn't really needed
         self.transform = transform
@@ -508,39 +1388,149 @@ class Template(BaseModel, mixins.ToJsonMixin):
         else:
             self.version = "2010-09-09"
 
+    def split(
+        self,
+        max_resources: int = MAX_RESOURCES,
+        prefix: str = "Stack",
+        template_url: Optional[Callable[[str], Union[str, AWSHelperFn]]] = None,
+    ) -> NestedStacks:
+        """Split the Template into a parent Template and nested stacks.
+
+        See :func:`troposphere.nested.split_template`.
+
+        """
+        from .nested import split_template  # pylint: disable=import-outside-toplevel
+
+        return split_template(self, max_resources, prefix, template_url)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Output Template as a dictionary."""
-        return self.dict(
-            by_alias=True,
-            exclude={
-                i
-                for i in [
-                    "conditions",
-                    "mappings",
-                    "metadata",
-                    "outputs",
-                    "parameters",
-                    "resources",
-                    "rules",
-                ]
-                if not getattr(self, i, None)
-            },
-            exclude_none=True,
-        )
+        """Output Template as a dictionary.
 
+        Equivalent to ``.dict(by_alias=True, exclude_none=True)`` with empty
+        sections excluded but each value is only serialized once.
+
+        """
+        return copy_output(self._to_shared_dict())
+
+    def _to_shared_dict(self) -> Dict[str, Any]:
+        """Output Template as a dictionary, sharing the cached output."""
+        self.validate_deferred()
+        return {alias: encode(value, self) for _, alias, value in self._iter_sections()}
+
+    def invalidate(self) -> None:
+        """Clear cached information about the Template.
+
+        Called automatically when the Template or an object in it is modified.
+        Must be called after modifying the value of a section in place
+        (e.g. ``template.mappings["Name"]["Key"] = value``).
+
+        """
+        if self._digest_cache is None and self._size_cache is None:
+            return
+        self._digest_cache = None
+        self._size_cache = None
+
+    def digest(self) -> str:
+        """Get the SHA-256 digest of the Template's content.
+
+        The digest is calculated from the cached digest of each Output,
+        Parameter and Resource so it is cheap to recalculate after one of them
+        is modified. Templates with identical output have the same digest.
+
+        """
+        self.validate_deferred()
+        digest = self._digest_cache
+        if digest is None:
+            digest = self._digest_cache = get_digest(
+                {
+                    alias: {
+                        title: obj._digest(self)  # pylint: disable=protected-access
+                        for title, obj in value.items()
+                    }
+                    if name in self.STREAMED_SECTIONS
+                    else encode(value, self)
+                    for name, alias, value in self._iter_sections()
+                }
+            )
+        return digest
+
+    def estimate_size(self) -> int:
+        """Get the size in bytes of the Template when output as compact JSON.
+
+        The size is calculated from the cached size of each Output, Parameter
+        and Resource so it is cheap to recalculate after entries are added or
+        modified. It is the size of ``.to_json(indent=None, separators=(",",
+        ":"))``; indented output is larger.
+
+        """
+        self.validate_deferred()
+        size = self._size_cache
+        if size is None:
+            sections = list(self._iter_sections())
+            # braces and separators between sections
+            size = 2 + max(len(sections) - 1, 0)
+            for name, alias, value in sections:
+                size += len(json.dumps(alias)) + 1
+                if name not in self.STREAMED_SECTIONS:
+                    size += len(
+                        json.dumps(
+                            encode(value, self),
+                            cls=JsonEncoder,
+                            separators=(",", ":"),
+                        )
+                    )
+                    continue
+                entries = cast(Dict[str, BaseAWSObject], value)
+                size += 2 + max(len(entries) - 1, 0)
+                for title, obj in entries.items():
+                    # pylint: disable=protected-access
+                    size += len(json.dumps(title)) + 1 + obj._size(self)
+            self._size_cache = size
+        return size
+
+    def iter_json_chunks(
+        self,
+        indent: Optional[Union[int, str]] = 4,
+        sort_keys: bool = True,
+        separators: Tuple[str, str] = (",", ": "),
+    ) -> Iterator[str]:
+        """Output Template as JSON, one chunk at a time.
+
+        Outputs, Parameters and Resources are serialized and encoded one entry
+        at a time as the chunks are consumed so the entire Template is never
+        held in memory as a dict or string. Cached output is reused but the
+        output of entries that aren't cached is not kept. The concatenated chunks are
+        identical to the output of ``.to_json()`` when called with the same
+        arguments.
+
+        """
+        return iter_json_chunks(self, indent, sort_keys, separators)
+
+    @instrumented("to_yaml")
     def to_yaml(
         self, clean_up: bool = False, long_form: bool = False, sort_keys: bool = True
     ) -> str:
-        """Output Template as JSON."""
-        return cfn_flip.to_yaml(
-            self.to_json(sort_keys=sort_keys), clean_up=clean_up, long_form=long_form
+        """Output Template as YAML.
+
+        The Template is converted to YAML directly, without first being output
+        as JSON. Output is identical to passing the JSON representation of the
+        Template through ``cfn_flip.to_yaml()``.
+
+        """
+        return cfn_yaml.dump_yaml(
+            self._to_shared_dict(),
+            clean_up=clean_up,
+            long_form=long_form,
+            sort_keys=sort_keys,
         )
 
     @validator("globals")
     def _validate_globals(cls, v: Any, values: Dict[str, Any]) -> Any:
         """Validate value of ``globals`` field."""
         transform = values.get("transform")  # only included for assignment after init
-        if transform != SERVERLESS_TRANSFORM:
+        if SERVERLESS_TRANSFORM not in (
+            transform if isinstance(transform, list) else [transform]
+        ):
             raise ValueError(
                 "Cannot set Globals for non-Serverless template "
                 f"(set transform to '{SERVERLESS_TRANSFORM}' first)"
@@ -548,9 +1538,13 @@ class Template(BaseModel, mixins.ToJsonMixin):
         return v
 
     @validator("transform")
-    def _validate_transform(cls, v: str, values: Dict[str, Any]) -> str:
+    def _validate_transform(
+        cls, v: Union[str, List[str]], values: Dict[str, Any]
+    ) -> Union[str, List[str]]:
         """Validate value of ``transform`` field."""
-        if values.get("globals") and v != SERVERLESS_TRANSFORM:
+        if values.get("globals") and SERVERLESS_TRANSFORM not in (
+            v if isinstance(v, list) else [v]
+        ):
             raise ValueError(
                 "Cannot set transform to non-Serverless while using Globals"
             )
@@ -559,13 +1553,54 @@ class Template(BaseModel, mixins.ToJsonMixin):
     def __eq__(self, other: object) -> bool:
         """Evaluate equality."""
         if isinstance(other, Template):
-            return self.to_json() == other.to_json()
+            return self.digest() == other.digest()
         return False
 
+    def __hash__(self) -> int:
+        """Return the object's hash.
+
+        The hash changes if the Template is modified.
+
+        """
+        return hash(self.digest())
+
     def __ne__(self, other: object) -> bool:
         """Evaluate inequality."""
         return not self.__eq__(other)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute value, invalidating cached information."""
+        super().__setattr__(name, value)
+        if name not in self.__private_attributes__:
+            self.invalidate()
+
+    def _copy_and_set_values(
+        self, values: Any, fields_set: Any, *, deep: bool
+    ) -> Template:
+        """Copy the Template, excluding the dependency graph."""
+        copied = super()._copy_and_set_values(values, fields_set, deep=deep)
+        object.__setattr__(copied, "_graph", None)
+        return copied
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        """Get state for pickling, excluding the dependency graph."""
+        state = super().__getstate__()
+        state["__private_attribute_values__"] = {
+            k: v
+            for k, v in state["__private_attribute_values__"].items()
+            if k != "_graph"
+        }
+        return state
+
+    def __setstate__(self, state: Dict[Any, Any]) -> None:
+        """Set state when unpickling, restoring back-references to the Template."""
+        self._init_private_attributes()
+        super().__setstate__(state)
+        for name in self.STREAMED_SECTIONS:
+            for obj in cast(Dict[str, BaseAWSObject], self.__dict__[name]).values():
+                if obj.template is None and "template" in obj.__fields_set__:
+                    obj.__dict__["template"] = self
+
     def __str__(self) -> str:
         """Return the representation of the object."""
         return self.json()
@@ -574,6 +1609,8 @@ class Template(BaseModel, mixins.ToJsonMixin):
 class Export(AWSHelperFn):
     """Export value in an ``Output``."""
 
+    __slots__ = ()
+
     def __init__(self, name: str):
         """Instantiate class.
 
@@ -601,6 +1638,7 @@ ExportTypedDict = TypedDict("ExportTypedDict", Name=str)
 class Output(AWSDeclaration):
     """Stack output."""
 
+    Condition: Optional[str] = None
     Description: Optional[str] = None
     Export: Optional[Union[Export, ExportTypedDict]] = None
     Value: Union[str, AWSHelperFnOrDict]
@@ -614,7 +1652,7 @@ class Output(AWSDeclaration):
 class Parameter(AWSDeclaration, BaseAWSObject):
     """CloudFormation Parameter."""
 
-    title: str = Field(..., max_length=PARAMETER_TITLE_MAX, regex=r"^[a-zA-Z0-9]+$")
+    title: str = Field(..., max_length=PARAMETER_TITLE_MAX)
     Type: str  # needs to be set first for other fields to be validated
 
     AllowedPattern: Optional[str] = None
@@ -663,6 +1701,7 @@ class Parameter(AWSDeclaration, BaseAWSObject):
                         raise TypeError(
                             error_template.format(param_type, type(i), v_split)
                         )
+        return v
 
     @validator("MaxValue", "MinValue")
     def _validate_number_only_fields(
@@ -712,6 +1751,8 @@ class AWSProperty(BaseAWSObject):
 class GenericHelperFn(AWSHelperFn):
     """Used as a fallback for the template generator."""
 
+    __slots__ = ()
+
     def __init__(self, data: Any) -> None:
         """Instantiate class."""
         self.data = self.getdata(data)  # type: ignore
@@ -720,22 +1761,34 @@ class GenericHelperFn(AWSHelperFn):
 class And(AWSHelperFn):
     """CloudFormation ``Fn::And`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::And"
+
     def __init__(self, *conds: AWSHelperFnOrDict) -> None:
         """Instantiate class."""
-        self.data = {"Fn::And": list(conds)}
+        self._args = list(conds)
 
 
 class Base64(AWSHelperFn):
     """CloudFormation ``Fn::Base64`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Base64"
+
     def __init__(self, data: Union[AWSHelperFnOrDict, str, BaseAWSObject]) -> None:
         """Instantiate class."""
-        self.data = {"Fn::Base64": data}
+        self._args = data
 
 
 class Cidr(AWSHelperFn):
     """CloudFormation ``Fn::Cidr`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Cidr"
+
     def __init__(
         self, ip_block: str, count: int, cidr_bits: Optional[int] = None
     ) -> None:
@@ -750,26 +1803,32 @@ class Cidr(AWSHelperFn):
                 a CIDR with a mask of "/24".
 
         """
-        self.data = {
-            "Fn::Cidr": [ip_block, count, cidr_bits] if cidr_bits else [ip_block, count]
-        }
+        self._args = [ip_block, count, cidr_bits] if cidr_bits else [ip_block, count]
 
 
 class Equals(AWSHelperFn):
     """CloudFormation ``Fn::Equals`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Equals"
+
     def __init__(
         self,
         value_one: Union[str, AWSHelperFnOrDict, BaseAWSObject],
         value_two: Union[str, AWSHelperFnOrDict, BaseAWSObject],
     ) -> None:
         """Instantiate class."""
-        self.data = {"Fn::Equals": [self.getdata(value_one), self.getdata(value_two)]}
+        self._args = [self.getdata(value_one), self.getdata(value_two)]
 
 
 class FindInMap(AWSHelperFn):
     """CloudFormation ``Fn::FindInMap`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::FindInMap"
+
     def __init__(
         self,
         map_name: Union[str, AWSHelperFnOrDict],
@@ -777,32 +1836,42 @@ class FindInMap(AWSHelperFn):
         second_level_key: Union[str, AWSHelperFnOrDict],
     ) -> None:
         """Instantiate class."""
-        self.data = {
-            "Fn::FindInMap": [self.getdata(map_name), top_level_key, second_level_key]
-        }
+        self._args = [self.getdata(map_name), top_level_key, second_level_key]
 
 
 class GetAtt(AWSHelperFn):
     """CloudFormation ``Fn::GetAtt`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::GetAtt"
+
     def __init__(
         self, logical_name: Union[str, AWSHelperFnOrDict, BaseAWSObject], attr_name: str
     ):
         """Instantiate class."""
-        self.data = {"Fn::GetAtt": [self.getdata(logical_name), attr_name]}
+        self._args = [self.getdata(logical_name), attr_name]
 
 
 class GetAZs(AWSHelperFn):
     """CloudFormation ``Fn::GetAZs`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::GetAZs"
+
     def __init__(self, region: Union[str, AWSHelperFnOrDict] = "") -> None:
         """Instantiate class."""
-        self.data = {"Fn::GetAZs": region}
+        self._args = region
 
 
 class If(AWSHelperFn):
     """CloudFormation ``Fn::If`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::If"
+
     def __init__(
         self,
         cond: AWSHelperFnOrDict,
@@ -810,40 +1879,85 @@ class If(AWSHelperFn):
         if_false: Union[BaseAWSObject, AWSHelperFnOrDict],
     ) -> None:
         """Instantiate class."""
-        self.data = {"Fn::If": [self.getdata(cond), if_true, if_false]}
+        self._args = [self.getdata(cond), if_true, if_false]
 
 
 class Join(AWSHelperFn):
     """CloudFormation ``Fn::Join`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Join"
+
     def __init__(self, delimiter: str, values: AWSHelperFnOrDict) -> None:
         """Instantiate class."""
         validators.validate_delimiter(delimiter)
-        self.data = {"Fn::Join": [delimiter, values]}
+        self._args = [delimiter, values]
 
 
 class Not(AWSHelperFn):
     """CloudFormation ``Fn::Not`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Not"
+
     def __init__(self, cond: AWSHelperFnOrDict) -> None:
         """Instantiate class."""
-        self.data = {"Fn::Not": [self.getdata(cond)]}
+        self._args = [self.getdata(cond)]
 
 
 class Or(AWSHelperFn):
     """CloudFormation ``Fn::Or`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Or"
+
     def __init__(self, *conds: AWSHelperFnOrDict) -> None:
         """Instantiate class."""
-        self.data = {"Fn::Or": list(conds)}
+        self._args = list(conds)
 
 
 class Ref(AWSHelperFn):
-    """CloudFormation ``Ref`` intrinsic function."""
+    """CloudFormation ``Ref`` intrinsic function.
+
+    Instances referencing the same name are shared so they can't be modified.
+
+    """
+
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Ref"
+
+    def __new__(cls, data: Union[BaseAWSObject, str, None] = None) -> Ref:
+        """Get an instance, reusing the instance that references the same name."""
+        name = data.title if isinstance(data, BaseAWSObject) else data
+        if cls is not Ref or not isinstance(name, str):
+            return super().__new__(cls)
+        ref = _REFS.get(name)
+        if ref is None:
+            ref = super().__new__(cls)
+            if len(_REFS) < _REFS_MAX:
+                _REFS[name] = ref
+        return ref
 
     def __init__(self, data: Union[BaseAWSObject, str]) -> None:
         """Instantiate class."""
-        self.data = {"Ref": self.getdata(data)}
+        self._args = self.getdata(data)
+
+    @AWSHelperFn.data.setter
+    def data(self, value: Any) -> None:
+        """Set the output of the helper function."""
+        if _REFS.get(getattr(self, "_args", None)) is self:  # type: ignore
+            raise AttributeError(f"{self!r} is shared and can't be modified")
+        AWSHelperFn.data.fset(self, value)  # type: ignore
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        """Support pickling, reusing instances when unpickled."""
+        if self.__class__ is Ref and isinstance(getattr(self, "_args", None), str):
+            return Ref, (self._args,)
+        return super().__reduce_ex__(protocol)
 
     @classmethod
     def validate(cls, v: Any) -> Ref:
@@ -860,25 +1974,37 @@ class Ref(AWSHelperFn):
 class Select(AWSHelperFn):
     """CloudFormation ``Fn::Select`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Select"
+
     def __init__(
         self, index: int, objects: Union[AWSHelperFn, Dict[str, Any], List[Any]]
     ):
         """Instantiate class."""
-        self.data = {"Fn::Select": [index, objects]}
+        self._args = [index, objects]
 
 
 class Split(AWSHelperFn):
     """CloudFormation ``Fn::Split`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Split"
+
     def __init__(self, delimiter: str, values: Union[str, AWSHelperFnOrDict]) -> None:
         """Instantiate class."""
         validators.validate_delimiter(delimiter)
-        self.data = {"Fn::Split": [delimiter, values]}
+        self._args = [delimiter, values]
 
 
 class Sub(AWSHelperFn):
     """CloudFormation ``Fn::Sub`` intrinsic function."""
 
+    __slots__ = ()
+
+    FUNCTION: ClassVar[Optional[str]] = "Fn::Sub"
+
     def __init__(
         self,
         input_str: str,
@@ -889,7 +2015,7 @@ class Sub(AWSHelperFn):
         # merge dict
         if dict_values:
             values.update(dict_values)
-        self.data = {"Fn::Sub": [input_str, values] if values else input_str}
+        self._args = [input_str, values] if values else input_str
 
 
 class DefaultTypedDict(TypedDict):
@@ -921,6 +2047,25 @@ class AWSObject(BaseAWSObject):
 
     DICT_NAME: ClassVar[str] = "Properties"
     RESOURCE_TYPE: ClassVar[str]
+    RESOURCE_TYPES: ClassVar[Dict[str, Type[AWSObject]]] = {}
+    """Mapping of resource type to the class that defines it.
+
+    Populated as subclasses that define ``RESOURCE_TYPE`` are created.
+
+    """
+
+    Condition: Optional[str] = None
+    DeletionPolicy: Optional[str] = None
+    DependsOn: Optional[Union[str, List[str]]] = None
+    Metadata: Optional[Dict[str, Any]] = None
+    UpdateReplacePolicy: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Register subclasses that define a resource type."""
+        super().__init_subclass__(**kwargs)
+        resource_type = cls.__dict__.get("RESOURCE_TYPE")
+        if resource_type:
+            AWSObject.RESOURCE_TYPES.setdefault(resource_type, cls)
 
     def get_att(self, value: str) -> GetAtt:
         """Return a reference to an attribute of this object."""
@@ -950,6 +2095,28 @@ class AWSObject(BaseAWSObject):
         data["Type"] = self.RESOURCE_TYPE
         return data
 
+    def _serialize(self) -> Dict[str, Any]:
+        """Serialize the fields of the object."""
+        data = super()._serialize()
+        data["Type"] = self.RESOURCE_TYPE
+        return data
+
     def ref(self) -> Ref:
         """Return a reference to this object."""
         return Ref(self)
+
+
+# imported last since these modules check the types of objects defined above
+from .serialization import (  # noqa: E402 pylint: disable=cyclic-import
+    SCALAR_TYPES,
+    copy_output,
+    encode,
+    encode_to_dict,
+    is_constant,
+    iter_json_chunks,
+    serialize_fields,
+)
+from .validation import (  # noqa: E402 pylint: disable=cyclic-import
+    validate_model,
+    validate_pending,
+)
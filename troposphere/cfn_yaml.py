@@ -0,0 +1,301 @@
+"""CloudFormation YAML.
+
+Dump and load CloudFormation templates as YAML without first converting them
+to or from a JSON string. Dependencies are imported on first use to keep
+``import troposphere`` fast.
+
+The dumpers provided by ``cfn_flip`` are used to emit YAML so that output is
+identical to ``cfn_flip.to_yaml()``. They rely on the pure Python emitter
+(libyaml does not support the indentation style used by ``cfn_flip``) but
+loading will use the libyaml parser when PyYAML was built with it.
+
+"""
+# pylint: disable=import-outside-toplevel
+from __future__ import annotations
+
+import datetime
+import json
+from decimal import Decimal
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    cast,
+)
+
+from .profiling import instrumented
+from .utils import JsonEncoder
+
+if TYPE_CHECKING:
+    import yaml
+
+
+_DUMPERS: Dict[Tuple[bool, bool], Type[yaml.Dumper]] = {}
+_LOADER: Any = None
+_ENCODER = JsonEncoder()
+
+_NATIVE_TYPES = frozenset([type(None), bool, float, int, list, str])
+"""Types that the ``cfn_flip`` dumpers represent the same way as when they are
+loaded from JSON."""
+
+
+def _get_loader() -> Type[yaml.SafeLoader]:
+    """Get the YAML loader class, building it on first use."""
+    global _LOADER  # pylint: disable=global-statement
+    if _LOADER is None:
+        import yaml
+        from cfn_tools import yaml_loader
+
+        if yaml.__with_libyaml__:
+
+            class CfnYamlCLoader(yaml.CSafeLoader):  # type: ignore
+                """YAML loader using libyaml that supports CloudFormation tags."""
+
+            CfnYamlCLoader.add_constructor(
+                yaml_loader.TAG_MAP, yaml_loader.construct_mapping
+            )
+            CfnYamlCLoader.add_multi_constructor("!", yaml_loader.multi_constructor)
+            _LOADER = CfnYamlCLoader
+        else:
+            _LOADER = yaml_loader.CfnYamlLoader
+    return _LOADER
+
+
+@lru_cache(maxsize=None)
+def _get_literal_properties() -> Optional[Tuple[Dict[str, str], Callable[[Any], bool]]]:
+    """Get the properties of resources output as literal JSON strings.
+
+    These are not part of the public API of ``cfn_flip``.
+
+    Returns:
+        The name of the property keyed by resource type and the function
+        checking whether the keys of a property contain intrinsic functions,
+        or ``None`` when the installed version of ``cfn_flip`` doesn't provide
+        them (``cfn_flip.cfn_literal_parser()`` is used instead).
+
+    """
+    try:
+        from cfn_clean import UNCONVERTED_KEYS, has_intrinsic_functions
+    except ImportError:
+        return None
+    return dict(UNCONVERTED_KEYS), has_intrinsic_functions
+
+
+def _encode_key(key: Any) -> str:
+    """Encode a dict key the same way it would be encoded as JSON."""
+    if isinstance(key, str):
+        return str(key)
+    return json.dumps(key)
+
+
+def _encode_value(value: Any) -> Any:
+    """Encode a value that isn't a dict or list the same way as JSON."""
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, (float, Decimal)):
+        return float(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return _ENCODER.default(value)
+
+
+def to_yaml_data(obj: Any, sort_keys: bool = True) -> Any:
+    """Copy data as the structure loaded from its JSON representation.
+
+    The result is equal to the result of loading the JSON representation of
+    the data with ``cfn_flip`` (e.g. mappings become ``ODict`` and tuples
+    become lists) and can be modified.
+
+    Args:
+        obj: Data to convert. Usually the output of ``.to_dict()``.
+        sort_keys: Sort the keys of mappings.
+
+    """
+    from cfn_tools.odict import ODict
+
+    def _convert(value: Any) -> Any:
+        value_type = type(value)
+        if value_type in (str, int, float, bool) or value is None:
+            return value
+        if isinstance(value, dict):
+            items = sorted(value.items()) if sort_keys else value.items()
+            return ODict((_encode_key(k), _convert(v)) for k, v in items)
+        if isinstance(value, (list, tuple)):
+            return [_convert(i) for i in value]
+        return _convert(_encode_value(value))
+
+    return _convert(obj)
+
+
+def _get_dumper(clean_up: bool, long_form: bool) -> Type[yaml.Dumper]:
+    """Get the YAML dumper class, building it on first use.
+
+    The dumper classes subclass those provided by ``cfn_flip`` to represent
+    the output of ``.to_dict()`` as is, instead of a copy of it made of
+    ``ODict``. Keys are sorted and encoded, values that aren't JSON types are
+    encoded and literal JSON properties are output when the mapping containing
+    them is represented. The output is never modified and objects it contains
+    more than once are represented every time instead of by an alias.
+
+    """
+    dumper = _DUMPERS.get((clean_up, long_form))
+    if dumper is not None:
+        return dumper
+
+    import cfn_flip
+    from cfn_flip.yaml_dumper import TAG_MAP, fn_representer
+    from cfn_tools.literal import LiteralString
+    from cfn_tools.odict import ODict
+
+    # without them, literals are parsed by cfn_flip before the data is dumped
+    literal_properties, has_intrinsic_functions = _get_literal_properties() or (
+        {},
+        bool,
+    )
+
+    def _items(dumper: yaml.Dumper, value: Dict[Any, Any]) -> List[Tuple[str, Any]]:
+        items = sorted(value.items()) if dumper.sort_keys else value.items()
+        return [
+            (key if key.__class__ is str else _encode_key(key), nested)
+            for key, nested in items
+        ]
+
+    def _literal(dumper: yaml.Dumper, value: Dict[str, Any]) -> Dict[str, Any]:
+        resource_type = value["Type"]
+        name = (
+            literal_properties.get(resource_type)
+            if isinstance(resource_type, str)
+            else None
+        )
+        properties = value.get("Properties")
+        if not name or not properties or not properties.get(name):
+            return value
+        prop = properties[name]
+        if not isinstance(prop, dict) or has_intrinsic_functions(prop.keys()):
+            return value
+        literal = LiteralString(
+            json.dumps(
+                prop,
+                cls=JsonEncoder,
+                indent=2,
+                separators=(",", ": "),
+                sort_keys=dumper.sort_keys,
+            )
+        )
+        return {**value, "Properties": {**properties, name: literal}}
+
+    def _represent_mapping(dumper: yaml.Dumper, value: Dict[Any, Any]) -> Any:
+        if "Type" in value:
+            value = _literal(dumper, value)
+        return dumper.represent_mapping(
+            TAG_MAP, _items(dumper, value), flow_style=False
+        )
+
+    def _represent_function_or_mapping(
+        dumper: yaml.Dumper, value: Dict[Any, Any]
+    ) -> Any:
+        if len(value) == 1:
+            key, arg = next(iter(value.items()))
+            if key.__class__ is not str:
+                key = _encode_key(key)
+            if isinstance(arg, dict):
+                arg = dict(_items(dumper, arg))
+            if key in ("Condition", "Ref"):
+                return fn_representer(dumper, key, arg)
+            if key.startswith("Fn::"):
+                return fn_representer(dumper, key[4:], arg)
+        return _represent_mapping(dumper, value)
+
+    def _represent_sequence(dumper: yaml.Dumper, value: Any) -> Any:
+        return dumper.represent_list(list(value))
+
+    def _represent_other(dumper: yaml.Dumper, value: Any) -> Any:
+        if isinstance(value, dict):
+            return represent_dict(dumper, value)
+        if isinstance(value, (list, tuple)):
+            return _represent_sequence(dumper, value)
+        return dumper.represent_data(_encode_value(value))
+
+    represent_dict = _represent_mapping if long_form else _represent_function_or_mapping
+    base = cfn_flip.get_dumper(clean_up, long_form)
+    dumper = cast(
+        "Type[yaml.Dumper]",
+        type(
+            "CfnYamlDumper",
+            (base,),
+            {"ignore_aliases": lambda _self, _data: True},
+        ),
+    )
+    for data_type in tuple(base.yaml_representers):
+        if data_type is not None and data_type not in _NATIVE_TYPES:
+            dumper.add_representer(data_type, _represent_other)
+    dumper.add_representer(LiteralString, base.yaml_representers[LiteralString])
+    dumper.add_representer(ODict, represent_dict)
+    # cfn_flip outputs the Fn::Join it can't replace with Fn::Sub as a dict
+    dumper.add_representer(dict, _represent_mapping if clean_up else represent_dict)
+    dumper.add_representer(tuple, _represent_sequence)
+    dumper.add_multi_representer(object, _represent_other)
+    _DUMPERS[(clean_up, long_form)] = dumper
+    return dumper
+
+
+@instrumented("dump_yaml", label=lambda *_args, **_kwargs: "YAML")
+def dump_yaml(
+    data: Dict[str, Any],
+    clean_up: bool = False,
+    long_form: bool = False,
+    sort_keys: bool = True,
+) -> str:
+    """Output data as CloudFormation YAML.
+
+    Intrinsic functions are output in their short form (e.g. ``!Ref``)
+    unless ``long_form`` is used. The data is not modified.
+
+    Args:
+        data: Data to output. Usually the output of ``.to_dict()``.
+        clean_up: Replace ``Fn::Join`` with ``Fn::Sub`` where possible and use
+            literal style for multi-line strings.
+        long_form: Output intrinsic functions in their long form.
+        sort_keys: Sort the keys of mappings.
+
+    """
+    import cfn_flip
+    import yaml
+
+    parse_literals = _get_literal_properties() is None
+    if clean_up or parse_literals:
+        # both modify the data in place so they are given a sorted copy
+        data = to_yaml_data(data, sort_keys=sort_keys)
+        sort_keys = False
+        if clean_up:
+            data = cfn_flip.clean(data)
+        if parse_literals:
+            data = cfn_flip.cfn_literal_parser(data)
+    return yaml.dump(
+        data,
+        Dumper=_get_dumper(clean_up, long_form),
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=sort_keys,
+        width=cfn_flip.config.max_col_width,
+    )
+
+
+def load_yaml(source: str) -> Any:
+    """Load CloudFormation YAML.
+
+    Intrinsic functions using the short form (e.g. ``!Ref``) are converted
+    to their long form.
+
+    """
+    import yaml
+
+    return yaml.load(source, Loader=_get_loader())  # nosec
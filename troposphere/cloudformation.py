@@ -6,11 +6,23 @@ https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/AWS_CloudFormatio
 # pylint: disable=no-self-argument,no-self-use
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import Field, root_validator
 
-from . import AWSHelperFnOrDict, AWSObject, policies
+from . import AWSHelperFn, AWSHelperFnOrDict, AWSObject, policies
+
+
+class Stack(AWSObject):
+    """AWS::CloudFormation::Stack resource."""
+
+    RESOURCE_TYPE = "AWS::CloudFormation::Stack"
+
+    NotificationARNs: Optional[Union[AWSHelperFn, List[Union[str, AWSHelperFn]]]] = None
+    Parameters: Optional[AWSHelperFnOrDict] = None
+    Tags: Optional[Union[AWSHelperFn, List[AWSHelperFnOrDict]]] = None
+    TemplateURL: Union[str, AWSHelperFn]
+    TimeoutInMinutes: Optional[int] = None
 
 
 class WaitCondition(AWSObject):
@@ -0,0 +1,358 @@
+"""Evaluate the Conditions of a Template for a set of parameter values.
+
+Example:
+    .. code-block:: python
+
+        from troposphere import AWS_REGION
+
+        for environment in ("dev", "prod"):
+            variant = template.resolve_conditions(
+                {"Environment": environment}, {AWS_REGION: "us-east-1"}
+            )
+            variant.validate_references()
+
+"""
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Set, cast
+
+from . import (
+    AWS_NO_VALUE,
+    AWS_PARTITION,
+    AWS_REGION,
+    AWS_URL_SUFFIX,
+    Template,
+)
+from .graph import SUB_VARIABLE
+from .loader import load_output, load_resource
+from .serialization import encode_shared
+
+if TYPE_CHECKING:
+    from . import BaseAWSObject
+
+NO_VALUE = {"Ref": AWS_NO_VALUE}
+"""Serialized value of ``AWS::NoValue``."""
+
+
+def get_pseudo_parameters(region: str) -> Dict[str, str]:
+    """Get the values of the pseudo parameters that are derived from a region.
+
+    Returns:
+        ``AWS::Partition``, ``AWS::Region`` and ``AWS::URLSuffix``.
+
+    """
+    if region.startswith("cn-"):
+        partition, url_suffix = "aws-cn", "amazonaws.com.cn"
+    elif region.startswith("us-gov-"):
+        partition, url_suffix = "aws-us-gov", "amazonaws.com"
+    else:
+        partition, url_suffix = "aws", "amazonaws.com"
+    return {
+        AWS_PARTITION: partition,
+        AWS_REGION: region,
+        AWS_URL_SUFFIX: url_suffix,
+    }
+
+
+def _to_string(value: Any) -> Any:
+    """Convert a value to the string CloudFormation compares it as."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, list):
+        return [_to_string(i) for i in cast(List[Any], value)]
+    return value
+
+
+class ConditionEvaluator:
+    """Evaluate the Conditions of a Template for a set of parameter values.
+
+    Each Condition is evaluated at most once. Conditions referencing other
+    Conditions reuse their result.
+
+    """
+
+    def __init__(
+        self,
+        template: Template,
+        parameters: Optional[Mapping[str, Any]] = None,
+        pseudo_parameters: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """Instantiate class.
+
+        Args:
+            template: Template containing the Conditions.
+            parameters: Values of the Template's Parameters. Parameters
+                without a value use their ``Default``.
+            pseudo_parameters: Values of pseudo parameters, keyed by name
+                (e.g. ``{AWS_REGION: "us-east-1"}``). ``AWS::Partition`` and
+                ``AWS::URLSuffix`` are derived from ``AWS::Region`` when not
+                provided.
+
+        """
+        self.template = template
+        self.parameters = dict(parameters or {})
+        self.pseudo_parameters = dict(pseudo_parameters or {})
+        if AWS_REGION in self.pseudo_parameters:
+            self.pseudo_parameters = {
+                **get_pseudo_parameters(self.pseudo_parameters[AWS_REGION]),
+                **self.pseudo_parameters,
+            }
+        self.results: Dict[str, bool] = {}
+        self._evaluating: List[str] = []
+
+    def evaluate(self, name: str) -> bool:
+        """Evaluate a Condition.
+
+        Raises:
+            ValueError: The Condition is not defined, references a value that
+                is not available or depends on itself.
+
+        """
+        result = self.results.get(name)
+        if result is not None:
+            return result
+        if name in self._evaluating:
+            raise ValueError(
+                "Circular dependency between conditions: "
+                + " -> ".join(self._evaluating[self._evaluating.index(name) :] + [name])
+            )
+        if name not in self.template.conditions:
+            raise ValueError(f"Condition {name} is not defined")
+        self._evaluating.append(name)
+        try:
+            result = self._condition(encode_shared(self.template.conditions[name]))
+        except ValueError as exc:
+            raise ValueError(f"Condition {name}: {exc}") from exc
+        finally:
+            self._evaluating.pop()
+        self.results[name] = result
+        return result
+
+    def evaluate_all(self) -> Dict[str, bool]:
+        """Evaluate every Condition of the Template."""
+        return {name: self.evaluate(name) for name in self.template.conditions}
+
+    def _condition(self, value: Any) -> bool:
+        """Evaluate a serialized condition function."""
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, dict) and len(cast(Dict[str, Any], value)) == 1:
+            key, args = next(iter(cast(Dict[str, Any], value).items()))
+            if key == "Condition" and isinstance(args, str):
+                return self.evaluate(args)
+            if key == "Fn::Equals" and isinstance(args, list):
+                left, right = cast(List[Any], args)
+                return _to_string(self._value(left)) == _to_string(self._value(right))
+            if key == "Fn::And" and isinstance(args, list):
+                return all(self._condition(i) for i in cast(List[Any], args))
+            if key == "Fn::Or" and isinstance(args, list):
+                return any(self._condition(i) for i in cast(List[Any], args))
+            if key == "Fn::Not" and isinstance(args, list):
+                return not self._condition(cast(List[Any], args)[0])
+        raise ValueError(f"unsupported condition function {value!r}")
+
+    def _value(self, value: Any) -> Any:
+        """Resolve a serialized value used in a condition function."""
+        if isinstance(value, list):
+            return [self._value(i) for i in cast(List[Any], value)]
+        if not isinstance(value, dict):
+            return value
+        value = cast(Dict[str, Any], value)
+        if len(value) != 1:
+            return {k: self._value(v) for k, v in value.items()}
+        key, args = next(iter(value.items()))
+        if key == "Ref":
+            return self._ref(args)
+        if key == "Fn::FindInMap":
+            name, top_key, second_key = self._value(args)
+            try:
+                return encode_shared(self.template.mappings[name][top_key][second_key])
+            except KeyError:
+                raise ValueError(
+                    f"Mapping {name} has no value for {top_key}.{second_key}"
+                ) from None
+        if key == "Fn::If":
+            condition, if_true, if_false = args
+            return self._value(if_true if self.evaluate(condition) else if_false)
+        if key == "Fn::Join":
+            delimiter, values = self._value(args)
+            return delimiter.join(_to_string(i) for i in values)
+        if key == "Fn::Select":
+            index, values = self._value(args)
+            return values[int(index)]
+        if key == "Fn::Split":
+            delimiter, string = self._value(args)
+            return string.split(delimiter)
+        if key == "Fn::Sub":
+            return self._sub(args)
+        raise ValueError(f"can't evaluate {key} locally")
+
+    def _ref(self, name: str) -> Any:
+        """Get the value of a parameter or pseudo parameter."""
+        if name in self.pseudo_parameters:
+            return self.pseudo_parameters[name]
+        parameter = self.template.parameters.get(name)
+        if parameter is None:
+            raise ValueError(f"no value for {name}")
+        value = self.parameters.get(name, parameter.Default)
+        if value is None:
+            raise ValueError(f"no value for parameter {name}")
+        if isinstance(value, str) and (
+            parameter.Type.startswith("List<") or parameter.Type == "CommaDelimitedList"
+        ):
+            return value.split(",")
+        return value
+
+    def _sub(self, args: Any) -> str:
+        """Resolve the arguments of a ``Fn::Sub``."""
+        string, variables = args, {}
+        if isinstance(args, list):
+            string, variables = cast(List[Any], args)
+        variables = cast(Dict[str, Any], self._value(variables))
+
+        def _replace_variable(match: re.Match[str]) -> str:
+            name = match.group(1).strip()
+            return str(
+                _to_string(variables[name] if name in variables else self._ref(name))
+            )
+
+        return SUB_VARIABLE.sub(_replace_variable, string).replace("${!", "${")
+
+    def resolve(self, value: Any) -> Any:
+        """Collapse ``Fn::If`` and remove ``AWS::NoValue`` from a serialized value.
+
+        Returns:
+            The value itself when it contains neither so unchanged values can
+            be shared.
+
+        """
+        if isinstance(value, dict):
+            value = cast(Dict[str, Any], value)
+            if len(value) == 1:
+                key, args = next(iter(value.items()))
+                if key == "Fn::If" and isinstance(args, list):
+                    condition, if_true, if_false = cast(List[Any], args)
+                    return self.resolve(
+                        if_true if self.evaluate(condition) else if_false
+                    )
+            result: Dict[str, Any] = {}
+            changed = False
+            for key, nested in value.items():
+                resolved = self.resolve(nested)
+                changed = changed or resolved is not nested
+                if resolved != NO_VALUE:
+                    result[key] = resolved
+                else:
+                    changed = True
+            return result if changed else value
+        if isinstance(value, list):
+            items: List[Any] = []
+            changed = False
+            for nested in cast(List[Any], value):
+                resolved = self.resolve(nested)
+                changed = changed or resolved is not nested
+                if resolved != NO_VALUE:
+                    items.append(resolved)
+                else:
+                    changed = True
+            return items if changed else value
+        return value
+
+    def _resolve_entries(
+        self, section: Dict[str, BaseAWSObject]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve the entries of a section whose condition is true.
+
+        Returns:
+            Resolved output of each entry, keyed by title. ``None`` when the
+            output is unchanged and the entry can be reused.
+
+        """
+        entries: Dict[str, Optional[Dict[str, Any]]] = {}
+        for title, obj in section.items():
+            data = encode_shared(obj)
+            condition = data.get("Condition")
+            if condition is not None and not self.evaluate(condition):
+                continue
+            resolved = self.resolve(
+                data
+                if condition is None
+                else {k: v for k, v in data.items() if k != "Condition"}
+            )
+            entries[title] = None if resolved is data else resolved
+        return entries
+
+    def prune(self) -> Template:
+        """Build a Template with the Conditions resolved.
+
+        Resources and Outputs whose condition is false are removed along with
+        ``DependsOn`` references to removed resources. ``Fn::If`` is replaced
+        by the selected value and ``AWS::NoValue`` is removed. Parameters,
+        Mappings and Rules are kept, and references to parameters are not
+        replaced, so the Template can still be deployed. Resources and
+        Outputs that are unchanged are shared with the original Template.
+
+        """
+        template = self.template
+        template.validate_deferred()
+        resources = self._resolve_entries(template.resources)
+        outputs = self._resolve_entries(template.outputs)
+        removed: Set[str] = set(template.resources) - set(resources)
+        if removed:
+            for title, data in resources.items():
+                data = (
+                    encode_shared(template.resources[title]) if data is None else data
+                )
+                kept = _remove_depends_on(data, removed)
+                if kept is not data:
+                    resources[title] = kept
+        pruned = template.__class__()
+        pruned.set_version(template.version)
+        if template.description:
+            pruned.set_description(template.description)
+        if template.transform:
+            pruned.set_transform(template.transform)
+        if template.globals:
+            pruned.set_globals(self.resolve(encode_shared(template.globals)))
+        if template.metadata:
+            pruned.set_metadata(self.resolve(encode_shared(template.metadata)))
+        for name, rule in template.rules.items():
+            pruned.add_rule(name, rule)
+        with pruned.without_limits():
+            for name, mapping in template.mappings.items():
+                pruned.add_mapping(name, mapping)
+            pruned.add_parameters(template.parameters.values())
+            pruned.add_resources(
+                template.resources[title]
+                if data is None
+                else load_resource(title, data)
+                for title, data in resources.items()
+            )
+            pruned.add_outputs(
+                template.outputs[title] if data is None else load_output(title, data)
+                for title, data in outputs.items()
+            )
+        return pruned
+
+
+def _remove_depends_on(data: Dict[str, Any], removed: Set[str]) -> Dict[str, Any]:
+    """Remove ``DependsOn`` references to resources that were removed.
+
+    Returns:
+        The value itself when it doesn't reference a removed resource.
+
+    """
+    depends_on = data.get("DependsOn")
+    if depends_on is None or not removed:
+        return data
+    names: List[str] = depends_on if isinstance(depends_on, list) else [depends_on]
+    kept = [name for name in names if name not in removed]
+    if len(kept) == len(names):
+        return data
+    result = {k: v for k, v in data.items() if k != "DependsOn"}
+    if kept:
+        result["DependsOn"] = kept[0] if len(kept) == 1 else kept
+    return result
@@ -1,5 +1,8 @@
 """Constants."""
 # Template Limits
+MAX_MAPPING_ATTRIBUTES = 200
+"""Max number of attributes permitted under each top-level key of a Mapping."""
+
 MAX_MAPPINGS = 200
 """Max number of Mappings permitted in a Template."""
 
@@ -12,6 +15,12 @@ MAX_PARAMETERS = 200
 MAX_RESOURCES = 500
 """Max number of Resources permitted in a Template."""
 
+MAX_TEMPLATE_BODY_SIZE = 51200
+"""Max size in bytes of a Template passed directly to CloudFormation."""
+
+MAX_TEMPLATE_URL_SIZE = 1000000
+"""Max size in bytes of a Template uploaded to S3 and passed by URL."""
+
 PARAMETER_TITLE_MAX = 255
 """Max length of a Template Parameter's title."""
 
@@ -0,0 +1,165 @@
+"""Compare Templates."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NamedTuple, Optional
+
+from . import BaseAWSObject
+from .serialization import copy_output, encode_shared, encode_to_dict
+from .utils import join_path
+
+if TYPE_CHECKING:
+    from . import Template
+
+DIFF_SECTIONS = ("conditions", "mappings", "outputs", "parameters", "resources")
+"""Sections of a Template that are compared."""
+
+
+class Change(NamedTuple):
+    """Difference between two Templates.
+
+    Attributes:
+        action: ``Add``, ``Modify`` or ``Remove``.
+        path: JSONPath of the value (e.g. ``$.Resources.Bucket.Properties``).
+        old: Previous value. ``None`` when the value was added.
+        new: New value. ``None`` when the value was removed.
+
+    """
+
+    action: str
+    path: str
+    old: Any
+    new: Any
+
+
+class TemplateDiff:
+    """Changes between two Templates.
+
+    Attributes:
+        changes: Every change, with changes to the values of modified entries
+            reported individually.
+        added: Names of entries that were added, keyed by section alias.
+        modified: Names of entries that were modified, keyed by section alias.
+        removed: Names of entries that were removed, keyed by section alias.
+
+    """
+
+    def __init__(self) -> None:
+        """Instantiate class."""
+        self.changes: List[Change] = []
+        self.added: Dict[str, List[str]] = {}
+        self.modified: Dict[str, List[str]] = {}
+        self.removed: Dict[str, List[str]] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Output the changes as a dictionary."""
+        return {
+            "added": self.added,
+            "changes": [change._asdict() for change in self.changes],
+            "modified": self.modified,
+            "removed": self.removed,
+        }
+
+    def __bool__(self) -> bool:
+        """Whether there are any changes."""
+        return bool(self.changes)
+
+    def __iter__(self) -> Iterator[Change]:
+        """Iterate over changes."""
+        return iter(self.changes)
+
+    def __len__(self) -> int:
+        """Number of changes."""
+        return len(self.changes)
+
+
+def diff_values(path: str, old: Any, new: Any) -> Iterator[Change]:
+    """Compare two serialized values, yielding the changes between them.
+
+    Only the parts of the values that are not equal are visited.
+
+    """
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, old_value in old.items():
+            if key not in new:
+                yield Change("Remove", join_path(path, key), old_value, None)
+            else:
+                yield from diff_values(join_path(path, key), old_value, new[key])
+        for key, new_value in new.items():
+            if key not in old:
+                yield Change("Add", join_path(path, key), None, new_value)
+    elif isinstance(old, list) and isinstance(new, list):
+        for index, (old_value, new_value) in enumerate(zip(old, new)):
+            yield from diff_values(join_path(path, index), old_value, new_value)
+        for index in range(len(new), len(old)):
+            yield Change("Remove", join_path(path, index), old[index], None)
+        for index in range(len(old), len(new)):
+            yield Change("Add", join_path(path, index), None, new[index])
+    else:
+        yield Change("Modify", path, old, new)
+
+
+def _diff_entry(path: str, old: Any, new: Any) -> Iterator[Change]:
+    """Compare the values of an entry that exists in both Templates.
+
+    The cached output of the entries is compared without copying it. Only
+    the values of the changes are copied.
+
+    """
+    if old is new:
+        return
+    if isinstance(old, BaseAWSObject) and isinstance(new, BaseAWSObject):
+        if old.digest() == new.digest():
+            return
+    for change in diff_values(path, encode_shared(old), encode_shared(new)):
+        yield change._replace(old=copy_output(change.old), new=copy_output(change.new))
+
+
+def diff_templates(
+    old: Template, new: Template, sections: Optional[List[str]] = None
+) -> TemplateDiff:
+    """Compare two Templates.
+
+    Entries are compared by their cached digest so only entries that were
+    added, removed or modified are serialized and compared in depth.
+
+    Args:
+        old: Template to compare from (e.g. the deployed Template).
+        new: Template to compare to (e.g. a newly generated Template).
+        sections: Names of the Template fields to compare. Defaults to
+            :data:`DIFF_SECTIONS`.
+
+    """
+    result = TemplateDiff()
+    if old is new or (sections is None and old.digest() == new.digest()):
+        return result
+    for name in sections or DIFF_SECTIONS:
+        old_section: Dict[str, Any] = getattr(old, name)
+        new_section: Dict[str, Any] = getattr(new, name)
+        if old_section is new_section:
+            continue
+        alias = old.__fields__[name].alias
+        path = join_path("$", alias)
+        for key, old_value in old_section.items():
+            if key not in new_section:
+                result.changes.append(
+                    Change(
+                        "Remove", join_path(path, key), encode_to_dict(old_value), None
+                    )
+                )
+                result.removed.setdefault(alias, []).append(key)
+                continue
+            changes = list(
+                _diff_entry(join_path(path, key), old_value, new_section[key])
+            )
+            if changes:
+                result.changes.extend(changes)
+                result.modified.setdefault(alias, []).append(key)
+        for key, new_value in new_section.items():
+            if key not in old_section:
+                result.changes.append(
+                    Change("Add", join_path(path, key), None, encode_to_dict(new_value))
+                )
+                result.added.setdefault(alias, []).append(key)
+    return result
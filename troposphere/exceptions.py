@@ -0,0 +1,96 @@
+"""Exceptions."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+if TYPE_CHECKING:
+    from pydantic import ValidationError
+
+    from . import BaseAWSObject
+    from .graph import Reference
+    from .limits import LimitViolation
+
+
+class DeferredValidationError(ValueError):
+    """Objects whose validation was deferred failed validation."""
+
+    errors: List[Tuple[BaseAWSObject, ValidationError]]
+
+    def __init__(self, errors: List[Tuple[BaseAWSObject, ValidationError]]) -> None:
+        """Instantiate class.
+
+        Args:
+            errors: Objects that failed validation paired with the error
+                raised by pydantic.
+
+        """
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} object(s) failed validation\n"
+            + "\n".join(
+                f"{obj.__dict__.get('title')} ({obj.__class__.__name__}): {error}"
+                for obj, error in errors
+            )
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Support pickling."""
+        return self.__class__, (self.errors,)
+
+
+class InvalidReferenceError(ValueError):
+    """References to names that are not defined in the Template."""
+
+    references: List[Reference]
+
+    def __init__(self, references: List[Reference]) -> None:
+        """Instantiate class.
+
+        Args:
+            references: References to names that are not defined.
+
+        """
+        self.references = references
+        super().__init__(
+            f"{len(references)} invalid reference(s)\n"
+            + "\n".join(
+                f"{reference.path}: {reference.kind} to undefined "
+                + (
+                    f"{reference.target}.{reference.attribute}"
+                    if reference.attribute
+                    else reference.target
+                )
+                for reference in references
+            )
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Support pickling."""
+        return self.__class__, (self.references,)
+
+
+class TemplateLimitError(ValueError):
+    """Template exceeds limits enforced by CloudFormation."""
+
+    violations: List[LimitViolation]
+
+    def __init__(self, violations: List[LimitViolation]) -> None:
+        """Instantiate class.
+
+        Args:
+            violations: Limits that are exceeded.
+
+        """
+        self.violations = violations
+        super().__init__(
+            f"{len(violations)} limit(s) exceeded\n"
+            + "\n".join(
+                f"{violation.path}: {violation.value} {violation.name} exceeds "
+                f"the limit of {violation.limit}"
+                for violation in violations
+            )
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Support pickling."""
+        return self.__class__, (self.violations,)
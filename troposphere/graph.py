@@ -0,0 +1,454 @@
+"""Dependencies between the entries of a Template."""
+from __future__ import annotations
+
+import re
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+
+from . import PSEUDO_PARAMETERS
+from .serialization import encode_shared
+from .utils import join_path
+
+if TYPE_CHECKING:
+    from . import BaseAWSObject, Template
+
+EntryKey = Tuple[str, str]
+"""Alias of the section and title of an entry in a Template."""
+
+SOURCE_SECTIONS = ("outputs", "resources")
+"""Sections of a Template containing entries that can reference other entries."""
+
+PARAMETER_SECTIONS = ("conditions", "rules")
+"""Sections of a Template containing entries that can only reference parameters."""
+
+SUB_VARIABLE = re.compile(r"\$\{([^!}][^}]*)\}")
+"""Matches variables in the string of a ``Fn::Sub``."""
+
+
+class Reference(NamedTuple):
+    """Reference from an entry of a Template to a resource or parameter.
+
+    Attributes:
+        section: Alias of the section containing the entry (e.g. ``Resources``).
+        source: Title of the entry containing the reference.
+        kind: ``DependsOn``, ``Fn::GetAtt``, ``Fn::Sub`` or ``Ref``.
+        target: Name of the referenced resource or parameter.
+        attribute: Name of the referenced attribute, if any.
+        path: JSONPath of the reference.
+
+    """
+
+    section: str
+    source: str
+    kind: str
+    target: str
+    attribute: Optional[str]
+    path: str
+
+
+def iter_references(
+    section: str, source: str, value: Any, path: str
+) -> Iterator[Reference]:
+    """Find references in the serialized value of an entry.
+
+    Args:
+        section: Alias of the section containing the entry.
+        source: Title of the entry.
+        value: Value to search, as output by ``.to_dict()``.
+        path: JSONPath of the value.
+
+    """
+    if isinstance(value, dict):
+        value = cast(Dict[str, Any], value)
+        if len(value) == 1:
+            key, args = next(iter(value.items()))
+            if key == "Ref" and isinstance(args, str):
+                yield Reference(section, source, key, args, None, path)
+                return
+            if key == "Fn::GetAtt":
+                if isinstance(args, str):
+                    target, _, attribute = args.partition(".")
+                    yield Reference(section, source, key, target, attribute, path)
+                    return
+                if isinstance(args, list) and args and isinstance(args[0], str):
+                    args = cast(List[Any], args)
+                    attribute = args[1] if len(args) > 1 else None
+                    yield Reference(
+                        section,
+                        source,
+                        key,
+                        args[0],
+                        attribute if isinstance(attribute, str) else None,
+                        path,
+                    )
+                    # the attribute name can be the result of a function
+                    for index, arg in enumerate(args[1:], 1):
+                        yield from iter_references(
+                            section, source, arg, join_path(join_path(path, key), index)
+                        )
+                    return
+            if key == "Fn::Sub":
+                string, variables = args, {}
+                if isinstance(args, list) and len(args) == 2:
+                    string, variables = cast(List[Any], args)
+                    yield from iter_references(
+                        section,
+                        source,
+                        variables,
+                        join_path(join_path(path, key), 1),
+                    )
+                if isinstance(string, str):
+                    for match in SUB_VARIABLE.finditer(string):
+                        target, _, attribute = match.group(1).strip().partition(".")
+                        if target not in variables:
+                            yield Reference(
+                                section, source, key, target, attribute or None, path
+                            )
+                    return
+        for key, nested in value.items():
+            yield from iter_references(section, source, nested, join_path(path, key))
+    elif isinstance(value, list):
+        for index, nested in enumerate(cast(List[Any], value)):
+            yield from iter_references(section, source, nested, join_path(path, index))
+
+
+def iter_entry_references(
+    section: str, title: str, data: Dict[str, Any]
+) -> Iterator[Reference]:
+    """Find references in the serialized value of an entry, including ``DependsOn``.
+
+    Args:
+        section: Alias of the section containing the entry.
+        title: Title of the entry.
+        data: Output of the entry's ``.to_dict()``.
+
+    """
+    path = join_path(join_path("$", section), title)
+    for key, value in data.items():
+        if key == "DependsOn":
+            depends_on = cast(List[Any], value if isinstance(value, list) else [value])
+            for index, target in enumerate(depends_on):
+                yield Reference(
+                    section,
+                    title,
+                    key,
+                    target,
+                    None,
+                    join_path(join_path(path, key), index)
+                    if isinstance(value, list)
+                    else join_path(path, key),
+                )
+        else:
+            yield from iter_references(section, title, value, join_path(path, key))
+
+
+class _Entry:
+    """Entry of a Template tracked by a :class:`DependencyGraph`."""
+
+    __slots__ = ("__weakref__", "dirty", "key", "obj", "references")
+
+    def __init__(self, key: EntryKey, obj: BaseAWSObject, dirty: Set[EntryKey]):
+        """Instantiate class."""
+        self.dirty = dirty
+        self.key = key
+        self.obj = obj
+        self.references: List[Reference] = []
+
+    def invalidate(self) -> None:
+        """Mark the entry as needing to be indexed again."""
+        self.dirty.add(self.key)
+
+
+class DependencyGraph:
+    """Dependencies between the entries of a Template.
+
+    References from Outputs and Resources are found using the cached output of
+    each entry and indexed by the name they reference. The graph is updated
+    as entries are added to the Template and only entries that were modified
+    are indexed again.
+
+    Entries that are replaced or removed without using the methods of the
+    Template (e.g. ``del template.resources["Name"]``) are only detected when
+    the number of entries changes. Call :meth:`rebuild` after doing so.
+
+    """
+
+    def __init__(self, template: Template) -> None:
+        """Instantiate class.
+
+        Args:
+            template: Template to track.
+
+        """
+        self.template = template
+        self._counts: Dict[str, int] = {}
+        self._dirty: Set[EntryKey] = set()
+        self._entries: Dict[EntryKey, _Entry] = {}
+        self._referrers: Dict[str, Dict[EntryKey, None]] = {}
+        self.rebuild()
+
+    def add(self, name: str, obj: BaseAWSObject) -> None:
+        """Track an entry that was added to the Template.
+
+        The entry is indexed the next time the graph is used.
+
+        Args:
+            name: Name of the Template field containing the entry.
+            obj: Entry that was added.
+
+        """
+        key = (self.template.__fields__[name].alias, obj.title)
+        previous = self._entries.pop(key, None)
+        if previous:
+            self._unindex(previous)
+        else:
+            self._counts[name] += 1
+        self._entries[key] = _Entry(key, obj, self._dirty)
+        self._dirty.add(key)
+
+    def rebuild(self) -> None:
+        """Index every entry of the Template."""
+        self._counts.clear()
+        self._dirty.clear()
+        self._entries.clear()
+        self._referrers.clear()
+        for name in SOURCE_SECTIONS:
+            alias = self.template.__fields__[name].alias
+            section: Dict[str, BaseAWSObject] = getattr(self.template, name)
+            self._counts[name] = len(section)
+            for title, obj in section.items():
+                entry = _Entry((alias, title), obj, self._dirty)
+                self._entries[entry.key] = entry
+                self._index(entry)
+
+    def refresh(self) -> None:
+        """Index entries that were modified since they were last indexed."""
+        if any(
+            len(getattr(self.template, name)) != count
+            for name, count in self._counts.items()
+        ):
+            self.rebuild()
+            return
+        while self._dirty:
+            entry = self._entries.get(self._dirty.pop())
+            if entry:
+                self._unindex(entry)
+                self._index(entry)
+
+    def _index(self, entry: _Entry) -> None:
+        """Find and index the references of an entry."""
+        section, title = entry.key
+        data = entry.obj._render(entry)  # pylint: disable=protected-access
+        entry.references = list(iter_entry_references(section, title, data))
+        for reference in entry.references:
+            self._referrers.setdefault(reference.target, {})[entry.key] = None
+
+    def _unindex(self, entry: _Entry) -> None:
+        """Remove the references of an entry from the index."""
+        for reference in entry.references:
+            referrers = self._referrers.get(reference.target)
+            if referrers is not None:
+                referrers.pop(entry.key, None)
+                if not referrers:
+                    del self._referrers[reference.target]
+        entry.references = []
+
+    def references(self, section: str, title: str) -> List[Reference]:
+        """Get the references made by an entry.
+
+        Args:
+            section: Alias of the section containing the entry (e.g. ``Outputs``).
+            title: Title of the entry.
+
+        """
+        self.refresh()
+        entry = self._entries.get((section, title))
+        return list(entry.references) if entry else []
+
+    def iter_references(self) -> Iterator[Reference]:
+        """Iterate over every reference made by the entries of the Template."""
+        self.refresh()
+        for entry in self._entries.values():
+            yield from entry.references
+
+    def referrers(self, name: str) -> List[EntryKey]:
+        """Get the entries that reference a resource or parameter.
+
+        Args:
+            name: Name of the resource or parameter.
+
+        Returns:
+            Section alias and title of each entry referencing ``name``.
+
+        """
+        self.refresh()
+        return list(self._referrers.get(name, {}))
+
+    def dependencies(self, title: str) -> List[str]:
+        """Get the names of the resources a resource depends on."""
+        resources = self.template.resources
+        return list(
+            dict.fromkeys(
+                reference.target
+                for reference in self.references("Resources", title)
+                if reference.target in resources
+            )
+        )
+
+    def dangling(self) -> List[Reference]:
+        """Get references to names that are not a resource or parameter.
+
+        References to pseudo parameters (e.g. ``AWS::Region``) are not
+        dangling.
+
+        """
+        self.refresh()
+        resources, parameters = self.template.resources, self.template.parameters
+        return [
+            reference
+            for target, referrers in self._referrers.items()
+            if target not in resources
+            and target not in parameters
+            and target not in PSEUDO_PARAMETERS
+            for key in referrers
+            for reference in self._entries[key].references
+            if reference.target == target
+        ]
+
+    def _adjacency(self) -> Dict[str, List[str]]:
+        """Get the resources each resource depends on."""
+        self.refresh()
+        resources = self.template.resources
+        return {
+            title: list(
+                dict.fromkeys(
+                    reference.target
+                    for reference in self._entries[("Resources", title)].references
+                    if reference.target in resources
+                )
+            )
+            for title in resources
+        }
+
+    def find_cycles(self) -> List[List[str]]:
+        """Find groups of resources that depend on each other.
+
+        Uses Tarjan's strongly connected components algorithm so the cost is
+        linear in the number of resources and references.
+
+        Returns:
+            Names of the resources in each cycle.
+
+        """
+        adjacency = self._adjacency()
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        cycles: List[List[str]] = []
+        for root in adjacency:
+            if root in index:
+                continue
+            work: List[Tuple[str, int]] = [(root, 0)]
+            while work:
+                node, position = work.pop()
+                if position == 0:
+                    index[node] = lowlink[node] = len(index)
+                    stack.append(node)
+                    on_stack.add(node)
+                children = adjacency[node]
+                if position > 0:
+                    lowlink[node] = min(lowlink[node], lowlink[children[position - 1]])
+                while position < len(children) and children[position] in index:
+                    child = children[position]
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    position += 1
+                if position < len(children):
+                    work.append((node, position + 1))
+                    work.append((children[position], 0))
+                    continue
+                if lowlink[node] == index[node]:
+                    component: List[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in children:
+                        cycles.append(component[::-1])
+        return cycles
+
+    def topological_order(self) -> List[str]:
+        """Get the names of resources ordered so dependencies come first.
+
+        Raises:
+            ValueError: Resources depend on each other.
+
+        """
+        adjacency = self._adjacency()
+        remaining = {
+            title: len(dependencies) for title, dependencies in adjacency.items()
+        }
+        dependents: Dict[str, List[str]] = {}
+        for title, dependencies in adjacency.items():
+            for dependency in dependencies:
+                dependents.setdefault(dependency, []).append(title)
+        order = [title for title, count in remaining.items() if not count]
+        for title in order:
+            for dependent in dependents.get(title, []):
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    order.append(dependent)
+        if len(order) != len(adjacency):
+            raise ValueError(
+                "Circular dependency between resources: "
+                + "; ".join(" -> ".join(cycle) for cycle in self.find_cycles())
+            )
+        return order
+
+
+def find_invalid_references(template: Template) -> List[Reference]:
+    """Find references to names that are not defined in a Template.
+
+    References from Outputs and Resources are taken from the Template's
+    :class:`DependencyGraph`. ``Fn::GetAtt`` and ``DependsOn`` must reference
+    a resource while ``Ref`` and ``Fn::Sub`` variables can also reference a
+    parameter or pseudo parameter. Conditions and Rules can only reference
+    parameters and pseudo parameters.
+
+    """
+    resources, parameters = template.resources, template.parameters
+    invalid: List[Reference] = []
+    for reference in template.dependency_graph().iter_references():
+        target = reference.target
+        if target in resources:
+            continue
+        if reference.kind in ("DependsOn", "Fn::GetAtt") or reference.attribute:
+            invalid.append(reference)
+        elif target not in parameters and target not in PSEUDO_PARAMETERS:
+            invalid.append(reference)
+    for name in PARAMETER_SECTIONS:
+        alias = template.__fields__[name].alias
+        path = join_path("$", alias)
+        for title, value in cast(Dict[str, Any], getattr(template, name)).items():
+            invalid.extend(
+                reference
+                for reference in iter_references(
+                    alias, title, encode_shared(value), join_path(path, title)
+                )
+                if reference.target not in parameters
+                and reference.target not in PSEUDO_PARAMETERS
+            )
+    return invalid
@@ -0,0 +1,123 @@
+"""Share structurally identical values between the objects of a Template.
+
+Large templates repeat the same helper functions and property values many
+times (e.g. the same ``Sub`` of an ARN or the same list of tags). Interning
+replaces each of them with a single shared instance so they are stored once
+and, since their output is cached, encoded once.
+
+Example:
+    .. code-block:: python
+
+        with template.interning():
+            build(template)
+
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, cast
+
+from . import _SHARED_HELPERS, AWSHelperFn
+from .serialization import SCALAR_TYPES
+from .utils import FrozenDict, FrozenList
+
+_Interned = Tuple[Any, Optional[Hashable]]
+"""Shared value and the key identifying its structure (``None`` if not shared)."""
+
+
+class Interner:
+    """Replace values by a shared instance of an identical value.
+
+    Helper functions, dicts, lists and tuples are shared when they only
+    contain constants. Values containing a :class:`troposphere.BaseAWSObject`
+    or an object of another type are left as-is.
+
+    Shared dicts and lists are converted to :class:`troposphere.utils.FrozenDict`
+    and :class:`troposphere.utils.FrozenList` and shared helper functions can't
+    be assigned new data, so modifying one doesn't modify every object using
+    it. The structure of a container is identified by the ids of its shared
+    items so each value is only walked once.
+
+    Attributes:
+        reused: Number of values that were replaced by a shared instance.
+
+    """
+
+    def __init__(self) -> None:
+        """Instantiate class."""
+        self.reused = 0
+        self._shared_ids: Set[int] = set()
+        self._values: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        """Number of shared values."""
+        return len(self._values)
+
+    def intern(self, value: Any) -> Any:
+        """Get the shared instance of a value.
+
+        Returns:
+            The value itself when it can't be shared or when it is the first
+            occurrence of a helper function.
+
+        """
+        return self._intern(value)[0]
+
+    def _share(self, key: Hashable, value: Any) -> _Interned:
+        """Get the shared value for a key, sharing the value if there is none."""
+        shared = self._values.get(key)
+        if shared is None:
+            self._values[key] = shared = value
+            self._shared_ids.add(id(shared))
+        else:
+            self.reused += 1
+        return shared, id(shared)
+
+    def _intern(self, value: Any) -> _Interned:
+        """Get the shared instance of a value and the key identifying it."""
+        cls = value.__class__
+        if value is None or cls in SCALAR_TYPES:
+            return value, value if cls is str else (cls, value)
+        if id(value) in self._shared_ids:
+            # shared values are kept alive so their id can't be reused
+            return value, id(value)
+        if isinstance(value, AWSHelperFn):
+            if not hasattr(value, "_args"):
+                return value, None
+            # pylint: disable=protected-access
+            args, key = self._intern(value._args)
+            if key is None:
+                return value, None
+            shared, shared_key = self._share((cls, key), value)
+            if shared is value and _SHARED_HELPERS.get(id(value)) is not value:
+                value._args = args
+                _SHARED_HELPERS[id(value)] = value
+            return shared, shared_key
+        if isinstance(value, dict):
+            keys: List[Hashable] = []
+            items: Dict[str, Any] = {}
+            for name, item in cast("Dict[str, Any]", value).items():
+                item, key = self._intern(item)
+                if key is None:
+                    return value, None
+                items[name] = item
+                keys.append((name, key))
+            key = (dict, tuple(keys))
+            if key in self._values:
+                return self._share(key, None)
+            return self._share(key, FrozenDict(items))
+        if isinstance(value, (list, tuple)):
+            keys = []
+            shared_items: List[Any] = []
+            for item in cast("List[Any]", value):
+                item, key = self._intern(item)
+                if key is None:
+                    return value, None
+                shared_items.append(item)
+                keys.append(key)
+            key = (tuple if cls is tuple else list, tuple(keys))
+            if key in self._values:
+                return self._share(key, None)
+            if cls is tuple:
+                return self._share(key, tuple(shared_items))
+            return self._share(key, FrozenList(shared_items))
+        return value, None
@@ -0,0 +1,88 @@
+"""Limits that CloudFormation enforces on Templates."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, cast
+
+from .constants import (
+    MAX_MAPPING_ATTRIBUTES,
+    MAX_MAPPINGS,
+    MAX_OUTPUTS,
+    MAX_PARAMETERS,
+    MAX_RESOURCES,
+    MAX_TEMPLATE_BODY_SIZE,
+)
+from .utils import join_path
+
+if TYPE_CHECKING:
+    from . import Template
+
+SECTION_LIMITS = {
+    "mappings": MAX_MAPPINGS,
+    "outputs": MAX_OUTPUTS,
+    "parameters": MAX_PARAMETERS,
+    "resources": MAX_RESOURCES,
+}
+"""Max number of entries in each section of a Template, keyed by field name."""
+
+
+class LimitViolation(NamedTuple):
+    """Limit that is exceeded by a Template.
+
+    Attributes:
+        path: JSONPath of the value exceeding the limit (``$`` for the size of
+            the Template).
+        name: What is counted (e.g. ``bytes`` or ``resources``).
+        value: Size or number of entries of the value.
+        limit: Maximum permitted by CloudFormation.
+
+    """
+
+    path: str
+    name: str
+    value: int
+    limit: int
+
+
+def find_limit_violations(
+    template: Template, max_size: int = MAX_TEMPLATE_BODY_SIZE
+) -> List[LimitViolation]:
+    """Find limits that are exceeded by a Template.
+
+    Checks the size of the Template, the number of entries in each section and
+    the number of attributes under each top-level key of each Mapping.
+
+    Args:
+        template: Template to check.
+        max_size: Max size in bytes of the Template as compact JSON. Use
+            :data:`troposphere.constants.MAX_TEMPLATE_URL_SIZE` for Templates
+            that will be uploaded to S3.
+
+    """
+    violations: List[LimitViolation] = []
+    size = template.estimate_size()
+    if size > max_size:
+        violations.append(LimitViolation("$", "bytes", size, max_size))
+    for name, limit in SECTION_LIMITS.items():
+        count = len(getattr(template, name))
+        if count > limit:
+            violations.append(
+                LimitViolation(
+                    join_path("$", template.__fields__[name].alias), name, count, limit
+                )
+            )
+    path = join_path("$", template.__fields__["mappings"].alias)
+    for title, mapping in template.mappings.items():
+        for key, attributes in mapping.items():
+            if not isinstance(attributes, dict):
+                continue
+            count = len(cast(Dict[str, Any], attributes))
+            if count > MAX_MAPPING_ATTRIBUTES:
+                violations.append(
+                    LimitViolation(
+                        join_path(join_path(path, title), key),
+                        "attributes",
+                        count,
+                        MAX_MAPPING_ATTRIBUTES,
+                    )
+                )
+    return violations
@@ -0,0 +1,288 @@
+"""Load CloudFormation templates into Template objects."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, TypeVar, cast
+
+from pydantic import Extra
+
+from . import (
+    And,
+    AWSHelperFn,
+    AWSObject,
+    Base64,
+    BaseAWSObject,
+    BaseAWSObjectType,
+    Cidr,
+    Equals,
+    Export,
+    FindInMap,
+    GenericHelperFn,
+    GetAtt,
+    GetAZs,
+    If,
+    Join,
+    Not,
+    Or,
+    Output,
+    Parameter,
+    Ref,
+    Select,
+    Split,
+    Sub,
+    Template,
+    cloudformation,
+)
+from .profiling import instrumented
+
+if TYPE_CHECKING:
+    from .spec import ResourceSpecification
+
+TemplateType = TypeVar("TemplateType", bound=Template)
+
+RESOURCE_MODULES = (cloudformation,)
+"""Modules whose resource classes are registered when the loader is imported."""
+
+FUNCTIONS: Dict[str, Type[AWSHelperFn]] = {
+    "Fn::And": And,
+    "Fn::Base64": Base64,
+    "Fn::Cidr": Cidr,
+    "Fn::Equals": Equals,
+    "Fn::FindInMap": FindInMap,
+    "Fn::GetAtt": GetAtt,
+    "Fn::GetAZs": GetAZs,
+    "Fn::If": If,
+    "Fn::Join": Join,
+    "Fn::Not": Not,
+    "Fn::Or": Or,
+    "Fn::Select": Select,
+    "Fn::Split": Split,
+    "Fn::Sub": Sub,
+    "Ref": Ref,
+}
+"""Mapping of intrinsic function name to the class used to represent it."""
+
+
+class GenericResource(AWSObject):
+    """Resource with a type that does not have a class.
+
+    A subclass is created for each resource type. Properties can be provided
+    as keyword arguments or as a dict passed as ``Properties``, which keeps
+    properties that have the name of a resource attribute (e.g. ``Metadata``)
+    separate from the attribute.
+
+    """
+
+    RESOURCE_TYPE = ""
+
+    class Config:
+        """Model configuration."""
+
+        extra = Extra.allow
+
+    def __init__(self, **data: Any) -> None:
+        """Instantiate class."""
+        super().__init__(**data)
+        # pydantic does not store extra fields in the order they were provided
+        for name in [k for k in data if k not in self.__fields__]:
+            self.__dict__[name] = self.__dict__.pop(name)
+
+    def _serialize(self) -> Dict[str, Any]:
+        """Serialize the fields of the object, including ``Properties``."""
+        data = super()._serialize()
+        properties = data[self.DICT_NAME].pop(self.DICT_NAME, None)
+        if properties:
+            data[self.DICT_NAME] = {**properties, **data[self.DICT_NAME]}
+        return data
+
+
+_GENERIC_RESOURCES: Dict[str, Type[GenericResource]] = {}
+"""Subclasses of :class:`GenericResource`, keyed by resource type."""
+
+_CLASSES: Dict[str, Type[GenericResource]] = {}
+"""Subclasses of :class:`GenericResource`, keyed by qualified name."""
+
+_SPECIFICATIONS: List[ResourceSpecification] = []
+"""Resource specifications used for resource types that don't have a class."""
+
+
+def __getattr__(name: str) -> Type[GenericResource]:
+    """Get a subclass of GenericResource so its objects can be pickled."""
+    try:
+        return _CLASSES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def get_resource_class(resource_type: str) -> Type[AWSObject]:
+    """Get the class of a resource type.
+
+    Classes that are registered for the resource type are used first, then
+    those of registered resource specifications. Falls back to a
+    :class:`GenericResource` subclass when neither defines the resource type.
+
+    """
+    resource_class = AWSObject.RESOURCE_TYPES.get(resource_type)
+    if resource_class:
+        return resource_class
+    for specification in _SPECIFICATIONS:
+        if resource_type in specification:
+            return specification.get_resource_class(resource_type)
+    generic = _GENERIC_RESOURCES.get(resource_type)
+    if not generic:
+        qualname = (
+            f"GenericResource_{re.sub(r'[^0-9A-Za-z]+', '_', resource_type)}"
+            f"_{len(_CLASSES)}"
+        )
+        generic = cast(
+            Type[GenericResource],
+            type(
+                "GenericResource",
+                (GenericResource,),
+                {"__module__": __name__, "__qualname__": qualname},
+            ),
+        )
+        # set after creation so the class is not registered as a resource type
+        generic.RESOURCE_TYPE = resource_type
+        _CLASSES[qualname] = _GENERIC_RESOURCES[resource_type] = generic
+    return generic
+
+
+@lru_cache(maxsize=None)
+def _get_nested_models(
+    model: Type[BaseAWSObject],
+) -> Dict[str, Type[BaseAWSObject]]:
+    """Get the fields of a model that contain other models, keyed by alias."""
+    nested: Dict[str, Type[BaseAWSObject]] = {}
+    for field in model.__fields__.values():
+        if isinstance(field.type_, type) and issubclass(field.type_, BaseAWSObject):
+            nested[field.alias] = field.type_
+    return nested
+
+
+def load_value(value: Any) -> Any:
+    """Load a value, instantiating intrinsic functions.
+
+    Dicts containing a single key that is the name of an intrinsic function
+    are converted to :class:`troposphere.AWSHelperFn`. Unknown functions are
+    converted to :class:`troposphere.GenericHelperFn`.
+
+    """
+    if isinstance(value, dict):
+        value = cast(Dict[str, Any], value)
+        if len(value) == 1:
+            name, args = next(iter(value.items()))
+            function = FUNCTIONS.get(name)
+            if function:
+                helper = function.__new__(function)
+                helper.data = {name: load_value(args)}
+                return helper
+            if name.startswith("Fn::") or name == "Condition":
+                return GenericHelperFn({name: load_value(args)})
+        return {k: load_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [load_value(i) for i in cast(List[Any], value)]
+    return value
+
+
+def load_object(
+    model: Type[BaseAWSObjectType], title: str, data: Dict[str, Any]
+) -> BaseAWSObjectType:
+    """Instantiate a model from a dict.
+
+    Dicts provided for fields that contain other models are instantiated as
+    that model using the field's name as the title.
+
+    """
+    nested = _get_nested_models(model)
+    values: Dict[str, Any] = {}
+    for key, value in data.items():
+        nested_model = nested.get(key)
+        if nested_model and isinstance(value, dict):
+            values[key] = load_object(nested_model, key, cast(Dict[str, Any], value))
+        elif nested_model and isinstance(value, list):
+            values[key] = [
+                load_object(nested_model, key, i) if isinstance(i, dict) else i
+                for i in cast(List[Any], value)
+            ]
+        else:
+            values[key] = load_value(value)
+    return model.from_dict(title, values)
+
+
+@instrumented("load", label=lambda _title, data: str(data.get("Type")))
+def load_resource(title: str, data: Dict[str, Any]) -> AWSObject:
+    """Instantiate a resource from a dict.
+
+    Raises:
+        ValueError: A property has the name of a resource attribute and the
+            class of the resource type can't keep them separate.
+
+    """
+    model = get_resource_class(data["Type"])
+    values = {k: v for k, v in data.items() if k not in (model.DICT_NAME, "Type")}
+    properties: Dict[str, Any] = data.get(model.DICT_NAME) or {}
+    if issubclass(model, GenericResource):
+        values[model.DICT_NAME] = properties
+    else:
+        for name, value in properties.items():
+            if name in model.ATTRIBUTES or name in values:
+                raise ValueError(
+                    f"{title}: property {name} of {data['Type']} has the name of "
+                    "a resource attribute"
+                )
+            values[name] = value
+    return load_object(model, title, values)
+
+
+def load_output(title: str, data: Dict[str, Any]) -> Output:
+    """Instantiate an Output from a dict."""
+    values = dict(data)
+    export = values.pop("Export", None)
+    output = load_object(Output, title, values)
+    if isinstance(export, dict) and "Name" in export:
+        # the name of an export can be an intrinsic function
+        output.Export = Export(load_value(export["Name"]))
+    return output
+
+
+def load_template(
+    data: Dict[str, Any], template_class: Optional[Type[TemplateType]] = None
+) -> TemplateType:
+    """Instantiate a Template from a dict containing a CloudFormation template.
+
+    Args:
+        data: CloudFormation template.
+        template_class: Class to instantiate. Defaults to
+            :class:`troposphere.Template`.
+
+    """
+    template = cast(TemplateType, (template_class or Template)())
+    template.version = data.get("AWSTemplateFormatVersion")
+    if "Description" in data:
+        template.set_description(data["Description"])
+    if "Transform" in data:
+        template.set_transform(data["Transform"])
+    if "Globals" in data:
+        template.set_globals(load_value(data["Globals"]))
+    if "Metadata" in data:
+        template.set_metadata(load_value(data["Metadata"]))
+    for name, mapping in data.get("Mappings", {}).items():
+        template.add_mapping(name, mapping)
+    for name, condition in data.get("Conditions", {}).items():
+        template.add_condition(name, load_value(condition))
+    for name, rule in data.get("Rules", {}).items():
+        template.add_rule(name, load_value(rule))
+    template.add_parameters(
+        load_object(Parameter, title, parameter)
+        for title, parameter in data.get("Parameters", {}).items()
+    )
+    template.add_resources(
+        load_resource(title, resource)
+        for title, resource in data.get("Resources", {}).items()
+    )
+    template.add_outputs(
+        load_output(title, output) for title, output in data.get("Outputs", {}).items()
+    )
+    return template
@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple, Union
 
+from .profiling import instrumented
 from .utils import JsonEncoder
 
 if TYPE_CHECKING:
-    from .protocols import ToDictProtocol
+    from .protocols import SupportsWriteProtocol
 
 
 class ToJsonMixin:
@@ -17,17 +18,70 @@ class ToJsonMixin:
 
     """
 
+    __slots__ = ()
+
+    def _to_shared_dict(self) -> Dict[str, Any]:
+        """Output object as a dictionary that may share cached output.
+
+        Used to output JSON without copying the output of ``.to_dict()``.
+        The result must not be modified.
+
+        """
+        return self.to_dict()  # type: ignore
+
+    def iter_json_chunks(
+        self,
+        indent: Optional[Union[int, str]] = 4,
+        sort_keys: bool = True,
+        separators: Tuple[str, str] = (",", ": "),
+    ) -> Iterator[str]:
+        """Output object as JSON, one chunk at a time.
+
+        The concatenated chunks are identical to the output of ``.to_json()``
+        when called with the same arguments.
+
+        """
+        return JsonEncoder(
+            indent=indent, sort_keys=sort_keys, separators=separators
+        ).iterencode(self._to_shared_dict())
+
+    @instrumented("to_json")
     def to_json(
-        self: ToDictProtocol,
-        indent: int = 4,
+        self,
+        indent: Optional[Union[int, str]] = 4,
         sort_keys: bool = True,
         separators: Tuple[str, str] = (",", ": "),
     ):
         """Output object as JSON."""
         return json.dumps(
-            self.to_dict(),
+            self._to_shared_dict(),
             cls=JsonEncoder,
             indent=indent,
             sort_keys=sort_keys,
             separators=separators,
         )
+
+    @instrumented("to_json")
+    def write_json(
+        self,
+        fp: SupportsWriteProtocol,
+        indent: Optional[Union[int, str]] = 4,
+        sort_keys: bool = True,
+        separators: Tuple[str, str] = (",", ": "),
+    ) -> None:
+        """Write object as JSON to a file-like object.
+
+        Output is written incrementally using ``.iter_json_chunks()`` instead
+        of building the entire JSON string in memory.
+
+        Args:
+            fp: File-like object with a ``.write()`` method accepting strings.
+            indent: Passed to :class:`json.JSONEncoder`.
+            sort_keys: Passed to :class:`json.JSONEncoder`.
+            separators: Passed to :class:`json.JSONEncoder`.
+
+        """
+        for chunk in self.iter_json_chunks(
+            indent=indent, sort_keys=sort_keys, separators=separators
+        ):
+            fp.write(chunk)
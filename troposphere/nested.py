@@ -0,0 +1,748 @@
+"""Split Templates that exceed the limits of CloudFormation into nested stacks.
+
+Resources are partitioned into child Templates using the
+:class:`troposphere.graph.DependencyGraph` of the Template. Each child is
+created by an ``AWS::CloudFormation::Stack`` resource in a parent Template
+that keeps the Parameters, Conditions, Mappings, Rules, Metadata and Outputs
+of the original Template.
+
+Example:
+    .. code-block:: python
+
+        template = Template()
+        with template.without_limits():
+            build_resources(template)
+        nested = template.split()
+        nested.write("build")  # then `aws cloudformation package`
+
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+from . import (
+    AWS_NO_VALUE,
+    AWS_STACK_ID,
+    AWS_STACK_NAME,
+    AWSHelperFn,
+    GetAtt,
+    If,
+    Join,
+    Output,
+    Parameter,
+    Ref,
+    Template,
+)
+from .cloudformation import Stack
+from .constants import MAX_RESOURCES
+from .graph import SUB_VARIABLE, iter_references
+from .loader import load_output, load_resource, load_value
+from .render import MIN_PARALLEL_RESOURCES, RenderResult, render_many
+from .serialization import encode_shared
+
+if TYPE_CHECKING:
+    from .graph import DependencyGraph, Reference
+
+ExportKey = Tuple[str, Optional[str]]
+"""Name of a resource and the attribute of it (``None`` for ``Ref``)."""
+
+_NON_ALPHANUMERIC = re.compile(r"[^A-Za-z0-9]")
+
+_SSM_PARAMETER_TYPE = "AWS::SSM::Parameter::Value<"
+
+_STACK_PSEUDO_PARAMETERS = {
+    AWS_STACK_ID: "ParentStackId",
+    AWS_STACK_NAME: "ParentStackName",
+}
+"""Pseudo parameters of the parent passed to children, with the Parameter name."""
+
+
+class NestedStacks:
+    """Parent Template and the child Templates it creates as nested stacks.
+
+    Attributes:
+        parent: Template containing the Parameters, Conditions, Mappings,
+            Rules, Metadata and Outputs of the original Template and an
+            ``AWS::CloudFormation::Stack`` resource for each child.
+        children: Child Templates, keyed by the title of the
+            ``AWS::CloudFormation::Stack`` resource that creates them.
+
+    """
+
+    def __init__(self, parent: Template, children: Dict[str, Template]) -> None:
+        """Instantiate class."""
+        self.parent = parent
+        self.children = children
+
+    def render(
+        self,
+        formats: Sequence[str] = ("json",),
+        workers: Optional[int] = None,
+        options: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        min_parallel_resources: int = MIN_PARALLEL_RESOURCES,
+    ) -> List[RenderResult]:
+        """Render the parent and child Templates in parallel.
+
+        See :func:`troposphere.render.render_many`.
+
+        Returns:
+            Result for the parent followed by the result for each child, in
+            the same order as :attr:`children`.
+
+        """
+        return render_many(
+            [self.parent, *self.children.values()],
+            formats,
+            workers,
+            options,
+            min_parallel_resources,
+        )
+
+    def write(
+        self,
+        directory: Union[str, os.PathLike[str]],
+        parent_name: str = "template",
+        workers: Optional[int] = None,
+    ) -> None:
+        """Write the parent and child Templates to a directory as JSON.
+
+        Each child is written to ``<title>.json``, the default ``TemplateURL``
+        of the ``AWS::CloudFormation::Stack`` resources, so the files can be
+        uploaded using ``aws cloudformation package``.
+
+        Args:
+            directory: Directory to write the files to. Created if needed.
+            parent_name: Name of the file of the parent, without extension.
+            workers: Maximum number of processes used to render the Templates.
+
+        Raises:
+            Exception: The first error raised while rendering a Template.
+
+        """
+        results = self.render(workers=workers)
+        for result in results:
+            if result.error is not None:
+                raise result.error
+        os.makedirs(directory, exist_ok=True)
+        for name, result in zip([parent_name, *self.children], results):
+            with open(
+                os.path.join(directory, f"{name}.json"), "w", encoding="utf-8"
+            ) as file:
+                file.write(result.outputs["json"])
+
+    def __iter__(self) -> Iterator[Template]:
+        """Iterate over the parent and child Templates."""
+        yield self.parent
+        yield from self.children.values()
+
+    def __len__(self) -> int:
+        """Number of Templates, including the parent."""
+        return len(self.children) + 1
+
+
+def _default_template_url(title: str) -> str:
+    """Get the path of the file a child Template is written to."""
+    return f"{title}.json"
+
+
+def _order_resources(graph: DependencyGraph) -> List[str]:
+    """Order resources so dependencies come first, keeping related ones together.
+
+    Uses a depth-first search so each resource is followed closely by the
+    resources that depend on it.
+
+    Raises:
+        ValueError: Resources depend on each other.
+
+    """
+    adjacency = graph._adjacency()  # pylint: disable=protected-access
+    done: Set[str] = set()
+    visiting: Set[str] = set()
+    order: List[str] = []
+    for root in adjacency:
+        if root in done:
+            continue
+        visiting.add(root)
+        stack: List[Tuple[str, Iterator[str]]] = [(root, iter(adjacency[root]))]
+        while stack:
+            node, dependencies = stack[-1]
+            for dependency in dependencies:
+                if dependency in visiting:
+                    raise ValueError(
+                        "Circular dependency between resources: "
+                        + "; ".join(" -> ".join(cycle) for cycle in graph.find_cycles())
+                    )
+                if dependency not in done:
+                    visiting.add(dependency)
+                    stack.append((dependency, iter(adjacency[dependency])))
+                    break
+            else:
+                stack.pop()
+                visiting.discard(node)
+                done.add(node)
+                order.append(node)
+    return order
+
+
+def _find_components(graph: DependencyGraph, order: List[str]) -> List[List[str]]:
+    """Group resources that are connected by references, keeping their order."""
+    adjacency = graph._adjacency()  # pylint: disable=protected-access
+    roots: Dict[str, str] = {title: title for title in order}
+
+    def find(title: str) -> str:
+        while roots[title] != title:
+            roots[title] = roots[roots[title]]
+            title = roots[title]
+        return title
+
+    for title, dependencies in adjacency.items():
+        for dependency in dependencies:
+            root, other = find(title), find(dependency)
+            if root != other:
+                roots[other] = root
+    components: Dict[str, List[str]] = {}
+    for title in order:
+        components.setdefault(find(title), []).append(title)
+    return list(components.values())
+
+
+def partition_resources(
+    graph: DependencyGraph, max_resources: int = MAX_RESOURCES
+) -> List[List[str]]:
+    """Partition the resources of a Template into groups of limited size.
+
+    Groups of resources connected by references are kept in the same
+    partition when they fit, packed using first-fit decreasing. Larger groups
+    are cut in dependency order so a partition only references partitions
+    before it. The cost is near-linear in the number of resources and
+    references.
+
+    Args:
+        graph: Dependency graph of the Template.
+        max_resources: Max number of resources in each partition.
+
+    Returns:
+        Titles of the resources in each partition.
+
+    Raises:
+        ValueError: Resources depend on each other.
+
+    """
+    if max_resources < 1:
+        raise ValueError("max_resources must be greater than 0")
+    components = _find_components(graph, _order_resources(graph))
+    partitions: List[List[str]] = []
+    small: List[List[str]] = []
+    for component in components:
+        if len(component) <= max_resources:
+            small.append(component)
+            continue
+        for start in range(0, len(component), max_resources):
+            partitions.append(component[start : start + max_resources])
+    available = [
+        partition for partition in partitions if len(partition) < max_resources
+    ]
+    for component in sorted(small, key=len, reverse=True):
+        for index, partition in enumerate(available):
+            if len(partition) + len(component) <= max_resources:
+                partition.extend(component)
+                if len(partition) == max_resources:
+                    del available[index]
+                break
+        else:
+            partitions.append(list(component))
+            if len(component) < max_resources:
+                available.append(partitions[-1])
+    return partitions
+
+
+def _rewrite(
+    value: Any, replace: Callable[[str, Optional[str]], Optional[Tuple[str, Any]]]
+) -> Any:
+    """Rewrite the references in a serialized value.
+
+    Args:
+        value: Value to rewrite, as output by ``.to_dict()``.
+        replace: Called with the name and attribute (``None`` for ``Ref``) of
+            each reference. Returns the name of the variable that replaces it
+            in a ``Fn::Sub`` and the value that replaces the function, or
+            ``None`` to keep the reference.
+
+    """
+    if isinstance(value, dict):
+        value = cast(Dict[str, Any], value)
+        if len(value) == 1:
+            key, args = next(iter(value.items()))
+            if key == "Ref" and isinstance(args, str):
+                replacement = replace(args, None)
+                return value if replacement is None else replacement[1]
+            if key == "Fn::GetAtt":
+                if isinstance(args, str):
+                    target, _, attribute = args.partition(".")
+                elif (
+                    isinstance(args, list)
+                    and len(cast(List[Any], args)) == 2
+                    and all(isinstance(i, str) for i in cast(List[Any], args))
+                ):
+                    target, attribute = cast(List[str], args)
+                else:
+                    target, attribute = "", ""
+                replacement = replace(target, attribute) if attribute else None
+                return value if replacement is None else replacement[1]
+            if key == "Fn::Sub":
+                return _rewrite_sub(args, replace)
+        return {key: _rewrite(nested, replace) for key, nested in value.items()}
+    if isinstance(value, list):
+        return [_rewrite(nested, replace) for nested in cast(List[Any], value)]
+    return value
+
+
+def _rewrite_sub(
+    args: Any, replace: Callable[[str, Optional[str]], Optional[Tuple[str, Any]]]
+) -> Dict[str, Any]:
+    """Rewrite the references in the arguments of a ``Fn::Sub``."""
+    string, variables = args, {}
+    if isinstance(args, list) and len(cast(List[Any], args)) == 2:
+        string, variables = cast(List[Any], args)
+        variables = cast(Dict[str, Any], _rewrite(variables, replace))
+    if not isinstance(string, str):
+        return {"Fn::Sub": args}
+    variables = dict(variables)
+
+    def _replace_variable(match: re.Match[str]) -> str:
+        target, _, attribute = match.group(1).strip().partition(".")
+        if target in variables:
+            return match.group(0)
+        replacement = replace(target, attribute or None)
+        if replacement is None:
+            return match.group(0)
+        name, new_value = replacement
+        if new_value != {"Ref": name}:
+            variables[name] = new_value
+        return "${" + name + "}"
+
+    string = SUB_VARIABLE.sub(_replace_variable, string)
+    return {"Fn::Sub": [string, variables] if variables else string}
+
+
+def _find_names(value: Any, conditions: Set[str], mappings: Set[str]) -> None:
+    """Find the names of the Conditions and Mappings used by a serialized value."""
+    if isinstance(value, dict):
+        value = cast(Dict[str, Any], value)
+        if len(value) == 1:
+            key, args = next(iter(value.items()))
+            if key == "Condition" and isinstance(args, str):
+                conditions.add(args)
+                return
+            if isinstance(args, list) and args and isinstance(args[0], str):
+                if key == "Fn::If":
+                    conditions.add(cast(List[str], args)[0])
+                elif key == "Fn::FindInMap":
+                    mappings.add(cast(List[str], args)[0])
+        for nested in value.values():
+            _find_names(nested, conditions, mappings)
+    elif isinstance(value, list):
+        for nested in cast(List[Any], value):
+            _find_names(nested, conditions, mappings)
+
+
+class _Splitter:
+    """Split a Template into a parent and child Templates."""
+
+    def __init__(
+        self,
+        template: Template,
+        partitions: List[List[str]],
+        prefix: str,
+        template_url: Callable[[str], Union[str, AWSHelperFn]],
+    ) -> None:
+        """Instantiate class."""
+        self.template = template
+        self.graph = template.dependency_graph()
+        self.partitions = partitions
+        self.template_url = template_url
+        self.partition_of = {
+            title: index
+            for index, partition in enumerate(partitions)
+            for title in partition
+        }
+        self.titles: List[str] = []
+        number = 0
+        for _ in partitions:
+            number += 1
+            while f"{prefix}{number}" in template.parameters:
+                number += 1
+            self.titles.append(f"{prefix}{number}")
+        self.used_names: Set[str] = set(template.resources) | set(template.parameters)
+        self.stack_parameters: Dict[str, str] = {}
+        for pseudo, base in _STACK_PSEUDO_PARAMETERS.items():
+            name, number = base, 1
+            while name in self.used_names:
+                number += 1
+                name = f"{base}{number}"
+            self.used_names.add(name)
+            self.stack_parameters[pseudo] = name
+        self.exports: Dict[ExportKey, str] = {}
+        self.outputs: List[Dict[str, ExportKey]] = [{} for _ in partitions]
+        self.imports: List[Dict[str, ExportKey]] = [{} for _ in partitions]
+        self.depends_on: List[Set[int]] = [set() for _ in partitions]
+        self.rewritten: Set[Tuple[str, str]] = set()
+        self._condition_names: Dict[str, Tuple[Set[str], Set[str], Set[str]]] = {}
+
+    def export(self, target: str, attribute: Optional[str]) -> str:
+        """Get the name of the Output and Parameter used to pass a value."""
+        key = (target, attribute)
+        name = self.exports.get(key)
+        if name is None:
+            if attribute is None:
+                name = target
+            else:
+                base = name = target + _NON_ALPHANUMERIC.sub("", attribute)
+                number = 1
+                while name in self.used_names:
+                    number += 1
+                    name = f"{base}{number}"
+                self.used_names.add(name)
+            self.exports[key] = name
+            self.outputs[self.partition_of[target]][name] = key
+        return name
+
+    def collect(self) -> None:
+        """Find references between partitions and from Outputs to resources."""
+        resources = self.template.resources
+        for index, partition in enumerate(self.partitions):
+            for title in partition:
+                for reference in self.graph.references("Resources", title):
+                    if reference.target in self.stack_parameters:
+                        # would resolve to the child stack
+                        self.rewritten.add(("Resources", title))
+                        continue
+                    other = self.partition_of.get(reference.target)
+                    if other is None or other == index:
+                        continue
+                    self.rewritten.add(("Resources", title))
+                    if reference.kind == "DependsOn":
+                        self.depends_on[index].add(other)
+                        continue
+                    key = self._export_key(reference)
+                    self.imports[index][self.export(*key)] = key
+        for title in self.template.outputs:
+            for reference in self.graph.references("Outputs", title):
+                if reference.target in resources:
+                    self.rewritten.add(("Outputs", title))
+                    self.export(*self._export_key(reference))
+
+    @staticmethod
+    def _export_key(reference: Reference) -> ExportKey:
+        """Get the value passed for a reference."""
+        if reference.kind == "Fn::GetAtt" and not reference.attribute:
+            raise ValueError(
+                f"{reference.path}: Fn::GetAtt with an attribute name that is "
+                "not a string can't be passed between nested stacks"
+            )
+        return reference.target, reference.attribute
+
+    def condition_names(self, name: str) -> Tuple[Set[str], Set[str], Set[str]]:
+        """Get the Conditions, Mappings and Parameters a Condition depends on."""
+        names = self._condition_names.get(name)
+        if names is None:
+            conditions, mappings, parameters = {name}, set(), set()
+            self._condition_names[name] = (conditions, mappings, parameters)
+            value = self.template.conditions.get(name)
+            if value is not None:
+                data = encode_shared(value)
+                nested: Set[str] = set()
+                _find_names(data, nested, mappings)
+                targets = {
+                    reference.target
+                    for reference in iter_references("Conditions", name, data, "$")
+                }
+                parameters.update(
+                    target
+                    for target in targets
+                    if target in self.template.parameters
+                    or target in self.stack_parameters
+                )
+                if not targets.isdisjoint(self.stack_parameters):
+                    self.rewritten.add(("Conditions", name))
+                for condition in nested - conditions:
+                    other = self.condition_names(condition)
+                    conditions.update(other[0])
+                    mappings.update(other[1])
+                    parameters.update(other[2])
+            names = self._condition_names[name]
+        return names
+
+    def child(self, index: int) -> Template:
+        """Build the Template of a partition."""
+        template = self.template
+        child = Template()
+        child.set_version(template.version)
+        if template.transform:
+            child.set_transform(template.transform)
+        if template.globals:
+            child.set_globals(template.globals)
+        conditions: Set[str] = set()
+        mappings: Set[str] = set()
+        parameters: Set[str] = set()
+
+        def replace(target: str, attribute: Optional[str]) -> Optional[Tuple[str, Any]]:
+            if target in self.stack_parameters and attribute is None:
+                name = self.stack_parameters[target]
+                return name, {"Ref": name}
+            other = self.partition_of.get(target)
+            if other is None or other == index:
+                return None
+            name = self.exports[(target, attribute)]
+            return name, {"Ref": name}
+
+        with child.without_limits():
+            for title in self.partitions[index]:
+                obj = template.resources[title]
+                data = encode_shared(obj)
+                if ("Resources", title) in self.rewritten:
+                    data = _rewrite(data, replace)
+                    depends_on = data.get("DependsOn")
+                    if depends_on is not None:
+                        depends_on = [
+                            name
+                            for name in (
+                                depends_on
+                                if isinstance(depends_on, list)
+                                else [depends_on]
+                            )
+                            if self.partition_of.get(name) == index
+                        ]
+                        if depends_on:
+                            data["DependsOn"] = depends_on
+                        else:
+                            del data["DependsOn"]
+                    obj = load_resource(title, data)
+                child.add_resource(obj)
+                if isinstance(data.get("Condition"), str):
+                    conditions.add(data["Condition"])
+                _find_names(data, conditions, mappings)
+                parameters.update(
+                    reference.target
+                    for reference in self.graph.references("Resources", title)
+                    if reference.target in template.parameters
+                    or reference.target in self.stack_parameters
+                )
+            for name in sorted(conditions):
+                _, nested_mappings, nested_parameters = self.condition_names(name)
+                mappings.update(nested_mappings)
+                parameters.update(nested_parameters)
+            for name in sorted(
+                set().union(*(self.condition_names(name)[0] for name in conditions))
+            ):
+                if name not in template.conditions:
+                    continue
+                condition = template.conditions[name]
+                if ("Conditions", name) in self.rewritten:
+                    condition = load_value(_rewrite(encode_shared(condition), replace))
+                child.add_condition(name, condition)
+            for name in sorted(mappings):
+                if name in template.mappings:
+                    child.add_mapping(name, template.mappings[name])
+            for name in template.parameters:
+                if name in parameters:
+                    child.add_parameter(_child_parameter(template.parameters[name]))
+            for pseudo, name in self.stack_parameters.items():
+                if pseudo in parameters:
+                    child.add_parameter(Parameter(title=name, Type="String"))
+            for name, (target, _) in self.imports[index].items():
+                parameter = Parameter(title=name, Type="String")
+                if encode_shared(template.resources[target]).get("Condition"):
+                    # the Output is not created when the condition is false
+                    parameter.Default = ""
+                child.add_parameter(parameter)
+            for name, (target, attribute) in self.outputs[index].items():
+                resource = template.resources[target]
+                child.add_output(
+                    Output(
+                        title=name,
+                        Condition=encode_shared(resource).get("Condition"),
+                        Value=Ref(target)
+                        if attribute is None
+                        else GetAtt(target, attribute),
+                    )
+                )
+        return child
+
+    def parent(self, children: Dict[str, Template]) -> Template:
+        """Build the parent Template."""
+        template = self.template
+        parent = Template()
+        parent.set_version(template.version)
+        if template.description:
+            parent.set_description(template.description)
+        if template.transform:
+            parent.set_transform(template.transform)
+        if template.globals:
+            parent.set_globals(template.globals)
+        if template.metadata:
+            parent.set_metadata(dict(template.metadata))
+
+        exports = {name: key for key, name in self.exports.items()}
+        pseudo_parameters = {name: key for key, name in self.stack_parameters.items()}
+
+        def imported(name: str) -> Any:
+            target, _ = exports[name]
+            value = self.stack_output(target, name)
+            condition = encode_shared(template.resources[target]).get("Condition")
+            if condition:
+                return If(condition, value, Ref(AWS_NO_VALUE))
+            return value
+
+        def replace(target: str, attribute: Optional[str]) -> Optional[Tuple[str, Any]]:
+            if target not in self.partition_of:
+                return None
+            name = self.exports[(target, attribute)]
+            return name, self.stack_output(target, name).to_dict()
+
+        with parent.without_limits():
+            for name, mapping in template.mappings.items():
+                parent.add_mapping(name, mapping)
+            for name, condition in template.conditions.items():
+                parent.add_condition(name, condition)
+            for name, rule in template.rules.items():
+                parent.add_rule(name, rule)
+            for parameter in template.parameters.values():
+                parent.add_parameter(parameter)
+            for index, (title, child) in enumerate(children.items()):
+                parameters: Dict[str, Any] = {}
+                for name, parameter in child.parameters.items():
+                    if name in self.imports[index]:
+                        parameters[name] = imported(name)
+                    elif name in pseudo_parameters:
+                        parameters[name] = Ref(pseudo_parameters[name])
+                    elif _is_list_parameter(template.parameters[name]):
+                        parameters[name] = Join(",", Ref(name))
+                    else:
+                        parameters[name] = Ref(name)
+                parent.add_resource(
+                    Stack(
+                        title=title,
+                        DependsOn=[
+                            self.titles[other]
+                            for other in sorted(self.depends_on[index])
+                        ]
+                        or None,
+                        Parameters=parameters or None,
+                        TemplateURL=self.template_url(title),
+                    )
+                )
+            for title, output in template.outputs.items():
+                if ("Outputs", title) in self.rewritten:
+                    output = load_output(
+                        title, _rewrite(encode_shared(output), replace)
+                    )
+                parent.add_output(output)
+        return parent
+
+    def stack_output(self, target: str, name: str) -> GetAtt:
+        """Get an Output of the child containing a resource."""
+        return GetAtt(self.titles[self.partition_of[target]], f"Outputs.{name}")
+
+    def split(self) -> NestedStacks:
+        """Split the Template."""
+        self.collect()
+        children = {title: self.child(index) for index, title in enumerate(self.titles)}
+        return NestedStacks(self.parent(children), children)
+
+
+def _is_list_parameter(parameter: Parameter) -> bool:
+    """Whether the value of a Parameter is a list."""
+    type_ = parameter.Type
+    if type_.startswith(_SSM_PARAMETER_TYPE):
+        type_ = type_[len(_SSM_PARAMETER_TYPE) : -1]
+    return type_.startswith("List<") or type_ == "CommaDelimitedList"
+
+
+def _child_parameter(parameter: Parameter) -> Parameter:
+    """Get the Parameter of a child Template that receives a Parameter's value.
+
+    The value of a SSM parameter type is resolved by the parent so the child
+    receives it as a plain value.
+
+    """
+    if not parameter.Type.startswith(_SSM_PARAMETER_TYPE):
+        return parameter
+    return Parameter(
+        title=parameter.title,
+        Type="CommaDelimitedList" if _is_list_parameter(parameter) else "String",
+        Description=parameter.Description,
+        NoEcho=parameter.NoEcho,
+    )
+
+
+def split_template(
+    template: Template,
+    max_resources: int = MAX_RESOURCES,
+    prefix: str = "Stack",
+    template_url: Optional[Callable[[str], Union[str, AWSHelperFn]]] = None,
+) -> NestedStacks:
+    """Split a Template into a parent Template and nested stacks.
+
+    Resources are partitioned using :func:`partition_resources` and each
+    partition becomes a child Template. ``Ref``, ``Fn::GetAtt`` and
+    ``Fn::Sub`` references to a resource in another partition are replaced
+    by a Parameter of the child that is passed an Output of the other child
+    by the parent. ``AWS::StackId`` and ``AWS::StackName`` are also passed
+    as Parameters so they keep referring to the parent stack. ``DependsOn`` a
+    resource in another partition becomes ``DependsOn`` between the
+    ``AWS::CloudFormation::Stack`` resources. Resources without such
+    references are shared with the original Template.
+
+    Each child only contains the Parameters, Conditions and Mappings its
+    resources use. Values of SSM parameter types are resolved by the parent
+    and values of list types are passed as comma-delimited strings. Values of
+    attributes that are lists can't be passed between stacks.
+
+    Args:
+        template: Template to split.
+        max_resources: Max number of resources in each child.
+        prefix: Prefix of the title of each ``AWS::CloudFormation::Stack``
+            resource, followed by its number.
+        template_url: Called with the title of each
+            ``AWS::CloudFormation::Stack`` resource to get its
+            ``TemplateURL``. Defaults to ``<title>.json``, the file written
+            by :meth:`NestedStacks.write`.
+
+    Returns:
+        The original Template without children when it is within
+        ``max_resources``.
+
+    Raises:
+        ValueError: Resources depend on each other or more nested stacks are
+            needed than the parent can contain.
+
+    """
+    template.validate_deferred()
+    if len(template.resources) <= max_resources:
+        return NestedStacks(template, {})
+    partitions = partition_resources(template.dependency_graph(), max_resources)
+    if len(partitions) > MAX_RESOURCES:
+        raise ValueError(
+            f"{len(partitions)} nested stacks are needed; the parent can only "
+            f"contain {MAX_RESOURCES}"
+        )
+    return _Splitter(
+        template, partitions, prefix, template_url or _default_template_url
+    ).split()
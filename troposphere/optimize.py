@@ -0,0 +1,745 @@
+"""Optimizations that make a Template smaller without changing its behavior.
+
+Example:
+    .. code-block:: python
+
+        result = template.fold_constants()
+        for folded in result.folded:
+            print(f"{folded.path}: {folded.original} -> {folded.folded}")
+        compressed = result.template.compress_mappings()
+        print(f"{compressed.bytes_saved} bytes saved")
+        compressed.template.to_json()
+
+"""
+from __future__ import annotations
+
+import base64
+import ipaddress
+import json
+import re
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+
+from .constants import MAX_MAPPING_ATTRIBUTES, MAX_MAPPINGS
+from .loader import load_output, load_resource
+from .serialization import encode_shared
+from .utils import join_path
+
+if TYPE_CHECKING:
+    from . import BaseAWSObject, Template
+
+_SUB_TOKEN = re.compile(r"\$\{!|\$\{([^!}][^}]*)\}")
+"""Matches escaped ``${`` and variables in the string of a ``Fn::Sub``."""
+
+_UNFOLDED = object()
+"""Returned by a function that can't be folded."""
+
+
+class FoldedConstant(NamedTuple):
+    """Intrinsic function that was replaced by a constant.
+
+    Attributes:
+        path: JSONPath of the intrinsic function.
+        original: Serialized intrinsic function.
+        folded: Value that replaced it. Can still contain intrinsic functions
+            when only some of the arguments are constant (e.g. adjacent strings
+            of a ``Fn::Join`` are merged).
+
+    """
+
+    path: str
+    original: Any
+    folded: Any
+
+
+class FoldResult(NamedTuple):
+    """Result of :func:`fold_constants`.
+
+    Attributes:
+        template: Template with the constants folded.
+        folded: Intrinsic functions that were replaced.
+
+    """
+
+    template: Template
+    folded: List[FoldedConstant]
+
+
+def _size(value: Any) -> int:
+    """Get the size of a serialized value as compact JSON."""
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Convert a constant integer or string of digits to an integer."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _fold_base64(args: Any) -> Any:
+    """Encode a constant string."""
+    if not isinstance(args, str):
+        return _UNFOLDED
+    return base64.b64encode(args.encode()).decode()
+
+
+def _fold_cidr(args: Any) -> Any:
+    """Generate the CIDR blocks of a constant IPv4 block."""
+    if not isinstance(args, list) or len(cast(List[Any], args)) != 3:
+        return _UNFOLDED
+    ip_block, count, cidr_bits = cast(List[Any], args)
+    count, cidr_bits = _to_int(count), _to_int(cidr_bits)
+    if not isinstance(ip_block, str) or count is None or cidr_bits is None:
+        return _UNFOLDED
+    if not 0 < count <= 256 or cidr_bits < 1:
+        return _UNFOLDED
+    try:
+        # only IPv4 since CloudFormation formats IPv6 addresses its own way
+        network = ipaddress.IPv4Network(ip_block)
+    except ValueError:
+        return _UNFOLDED
+    prefix = network.max_prefixlen - cidr_bits
+    if prefix < network.prefixlen:
+        return _UNFOLDED
+    subnets = [str(i) for i in islice(network.subnets(new_prefix=prefix), count)]
+    return subnets if len(subnets) == count else _UNFOLDED
+
+
+def _fold_join(args: Any) -> Any:
+    """Join constant strings, merging adjacent ones when others aren't constant."""
+    if not isinstance(args, list) or len(cast(List[Any], args)) != 2:
+        return _UNFOLDED
+    delimiter, values = cast(List[Any], args)
+    if not isinstance(delimiter, str) or not isinstance(values, list):
+        return _UNFOLDED
+    merged: List[Any] = []
+    for value in cast(List[Any], values):
+        if merged and isinstance(value, str) and isinstance(merged[-1], str):
+            merged[-1] = merged[-1] + delimiter + value
+        else:
+            merged.append(value)
+    if not merged:
+        return ""
+    if len(merged) == 1 and isinstance(merged[0], str):
+        return merged[0]
+    if len(merged) == len(cast(List[Any], values)):
+        return _UNFOLDED
+    return {"Fn::Join": [delimiter, merged]}
+
+
+def _fold_select(args: Any) -> Any:
+    """Select an item from a constant list."""
+    if not isinstance(args, list) or len(cast(List[Any], args)) != 2:
+        return _UNFOLDED
+    index, values = _to_int(args[0]), args[1]
+    if index is None or not isinstance(values, list):
+        return _UNFOLDED
+    # CloudFormation rejects negative indexes
+    if not 0 <= index < len(cast(List[Any], values)):
+        return _UNFOLDED
+    return cast(List[Any], values)[index]
+
+
+def _fold_split(args: Any) -> Any:
+    """Split a constant string."""
+    if not isinstance(args, list) or len(cast(List[Any], args)) != 2:
+        return _UNFOLDED
+    delimiter, string = cast(List[Any], args)
+    if not isinstance(delimiter, str) or not delimiter or not isinstance(string, str):
+        return _UNFOLDED
+    return string.split(delimiter)
+
+
+def _fold_sub(args: Any) -> Any:
+    """Substitute the constant variables of a string."""
+    string, variables = args, {}
+    if isinstance(args, list) and len(cast(List[Any], args)) == 2:
+        string, variables = cast(List[Any], args)
+    if not isinstance(string, str) or not isinstance(variables, dict):
+        return _UNFOLDED
+    variables = cast(Dict[str, Any], variables)
+    constants = {k: v for k, v in variables.items() if isinstance(v, str)}
+    remaining = {k: v for k, v in variables.items() if k not in constants}
+    names = [m.group(1) for m in _SUB_TOKEN.finditer(string) if m.group(1)]
+    if all(name.strip() in constants for name in names):
+
+        def _replace(match: re.Match[str]) -> str:
+            if not match.group(1):
+                return "${"
+            return constants[match.group(1).strip()]
+
+        return _SUB_TOKEN.sub(_replace, string)
+    if not constants:
+        return _UNFOLDED
+
+    def _replace_constant(match: re.Match[str]) -> str:
+        name = (match.group(1) or "").strip()
+        if name not in constants:
+            return match.group(0)
+        return constants[name].replace("${", "${!")
+
+    string = _SUB_TOKEN.sub(_replace_constant, string)
+    return {"Fn::Sub": [string, remaining] if remaining else string}
+
+
+_FUNCTIONS: Dict[str, Callable[[Any], Any]] = {
+    "Fn::Base64": _fold_base64,
+    "Fn::Cidr": _fold_cidr,
+    "Fn::Join": _fold_join,
+    "Fn::Select": _fold_select,
+    "Fn::Split": _fold_split,
+    "Fn::Sub": _fold_sub,
+}
+"""Intrinsic functions that can be folded, keyed by name."""
+
+
+def _copy_template(
+    template: Template,
+    conditions: Dict[str, Any],
+    resources: Dict[str, BaseAWSObject],
+    outputs: Dict[str, BaseAWSObject],
+    mappings: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Template:
+    """Build a Template with other Conditions, Resources and Outputs.
+
+    Args:
+        template: Template to copy.
+        conditions: Conditions of the new Template.
+        resources: Resources of the new Template.
+        outputs: Outputs of the new Template.
+        mappings: Mappings added to those of the copied Template.
+
+    """
+    result = template.__class__()
+    result.set_version(template.version)
+    if template.description:
+        result.set_description(template.description)
+    if template.transform:
+        result.set_transform(template.transform)
+    if template.globals:
+        result.set_globals(template.globals)
+    if template.metadata:
+        result.set_metadata(template.metadata)
+    for name, rule in template.rules.items():
+        result.add_rule(name, rule)
+    for name, condition in conditions.items():
+        result.add_condition(name, condition)
+    with result.without_limits():
+        for name, mapping in {**template.mappings, **(mappings or {})}.items():
+            result.add_mapping(name, mapping)
+        result.add_parameters(template.parameters.values())
+        result.add_resources(resources.values())
+        result.add_outputs(outputs.values())
+    return result
+
+
+class ConstantFolder:
+    """Replace intrinsic functions whose arguments are constant by their value.
+
+    Only functions whose value doesn't depend on the stack are folded:
+    ``Fn::Base64``, ``Fn::Cidr`` (IPv4), ``Fn::Join``, ``Fn::Select``,
+    ``Fn::Split`` and ``Fn::Sub``. Nested functions are folded from the inside
+    out so ``Fn::Select`` over ``Fn::Cidr`` becomes a single string. A function
+    is only replaced when its value is not larger than the function itself.
+    Values passed to ``Fn::Transform`` are left untouched since macros
+    receive them as written.
+
+    """
+
+    def __init__(self) -> None:
+        """Instantiate class."""
+        self.folded: List[FoldedConstant] = []
+
+    def fold(self, value: Any, path: str = "$") -> Any:
+        """Fold the constants of a serialized value.
+
+        Returns:
+            The value itself when nothing was folded.
+
+        """
+        if isinstance(value, list):
+            items = [
+                self.fold(item, join_path(path, index))
+                for index, item in enumerate(cast(List[Any], value))
+            ]
+            changed = any(i is not j for i, j in zip(items, cast(List[Any], value)))
+            return items if changed else value
+        if not isinstance(value, dict):
+            return value
+        value = cast(Dict[str, Any], value)
+        if len(value) == 1:
+            key, args = next(iter(value.items()))
+            if key == "Fn::Transform":
+                return value
+            if key in _FUNCTIONS:
+                result = self._evaluate(value)
+                if result is not value and _size(result) <= _size(value):
+                    self.folded.append(FoldedConstant(path, value, result))
+                    return result
+                # the value is larger, fold the arguments only
+                folded_args = self.fold(args, join_path(path, key))
+                return value if folded_args is args else {key: folded_args}
+        result = {k: self.fold(v, join_path(path, k)) for k, v in value.items()}
+        changed = any(result[k] is not v for k, v in value.items())
+        return result if changed else value
+
+    def _evaluate(self, value: Any) -> Any:
+        """Fold every constant of a serialized value regardless of its size."""
+        if isinstance(value, list):
+            items = [self._evaluate(i) for i in cast(List[Any], value)]
+            changed = any(i is not j for i, j in zip(items, cast(List[Any], value)))
+            return items if changed else value
+        if not isinstance(value, dict):
+            return value
+        value = cast(Dict[str, Any], value)
+        if len(value) == 1:
+            key, args = next(iter(value.items()))
+            if key == "Fn::Transform":
+                return value
+            if key in _FUNCTIONS:
+                folded_args = self._evaluate(args)
+                result = _FUNCTIONS[key](folded_args)
+                if result is not _UNFOLDED:
+                    return result
+                return value if folded_args is args else {key: folded_args}
+        result = {k: self._evaluate(v) for k, v in value.items()}
+        changed = any(result[k] is not v for k, v in value.items())
+        return result if changed else value
+
+    def _fold_entries(
+        self,
+        section: Dict[str, BaseAWSObject],
+        path: str,
+        load: Callable[[str, Dict[str, Any]], BaseAWSObject],
+    ) -> Dict[str, BaseAWSObject]:
+        """Fold the constants of the entries of a section.
+
+        Entries that are unchanged, or that no longer validate once folded,
+        are reused.
+
+        """
+        entries: Dict[str, BaseAWSObject] = {}
+        for title, obj in section.items():
+            count = len(self.folded)
+            data = encode_shared(obj)
+            folded = self.fold(data, join_path(path, title))
+            if folded is data:
+                entries[title] = obj
+                continue
+            try:
+                entries[title] = load(title, folded)
+            except ValueError:
+                del self.folded[count:]
+                entries[title] = obj
+        return entries
+
+    def fold_template(self, template: Template) -> Template:
+        """Build a Template with the constants folded.
+
+        Conditions, Resources and Outputs are folded. Unchanged entries are
+        shared with the original Template.
+
+        """
+        template.validate_deferred()
+        conditions: Dict[str, Any] = {}
+        for name, condition in template.conditions.items():
+            data = encode_shared(condition)
+            folded = self.fold(data, join_path(join_path("$", "Conditions"), name))
+            conditions[name] = condition if folded is data else folded
+        resources = self._fold_entries(
+            template.resources, join_path("$", "Resources"), load_resource
+        )
+        outputs = self._fold_entries(
+            template.outputs, join_path("$", "Outputs"), load_output
+        )
+        return _copy_template(template, conditions, resources, outputs)
+
+
+def fold_constants(template: Template) -> FoldResult:
+    """Replace intrinsic functions whose arguments are constant by their value.
+
+    See :class:`ConstantFolder`.
+
+    """
+    folder = ConstantFolder()
+    return FoldResult(folder.fold_template(template), folder.folded)
+
+
+_MAPPING_KEY = re.compile(r"^[A-Za-z0-9_.-]+$")
+"""Matches strings that can be used as a top-level key of a Mapping."""
+
+_REPLACEABLE_ARGUMENTS: Dict[str, Optional[Tuple[int, ...]]] = {
+    "Fn::Base64": None,
+    "Fn::If": (1, 2),
+    "Fn::Join": (1,),
+    "Fn::Split": (1,),
+    "Fn::Sub": (1,),
+}
+"""Arguments of intrinsic functions that can contain ``Fn::FindInMap``.
+
+Indexes of the arguments, keyed by function name. ``None`` when the function
+takes a single argument.
+
+"""
+
+_MIN_REPLACEMENT_SIZE = _size({"Fn::FindInMap": ["Literals", "K0", "V0"]})
+"""Size of the smallest ``Fn::FindInMap`` replacing a string."""
+
+_Table = Tuple[str, Tuple[Any, ...]]
+"""Parameter and the value for each of its allowed values."""
+
+_MappingGroup = Tuple[int, str, Dict[str, Dict[str, Any]], Dict[Any, Any]]
+"""Bytes saved, name, content and ``Fn::FindInMap`` of each value of a Mapping."""
+
+
+class CompressResult(NamedTuple):
+    """Result of :func:`compress_mappings`.
+
+    Attributes:
+        template: Template with values moved to Mappings.
+        mappings: Names of the Mappings that were added.
+        replaced: Number of values replaced by ``Fn::FindInMap``.
+        bytes_saved: Difference between the size of the Templates as compact
+            JSON.
+
+    """
+
+    template: Template
+    mappings: List[str]
+    replaced: int
+    bytes_saved: int
+
+
+def _literal(value: Any) -> Any:
+    """Get the hashable form of a value that can be stored in a Mapping.
+
+    Returns:
+        ``None`` when the value is not a string or a list of strings.
+
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(i, str) for i in value):
+        return tuple(cast(List[str], value))
+    return None
+
+
+def _unique_name(name: str, taken: Set[str]) -> str:
+    """Get a name that is not taken, appending a number if needed."""
+    candidate, index = name, 1
+    while candidate in taken:
+        candidate, index = f"{name}{index}", index + 1
+    taken.add(candidate)
+    return candidate
+
+
+class MappingCompressor:
+    """Move values repeated in Resources and Outputs to Mappings.
+
+    Two kinds of values are moved:
+
+    - Tables: ``Fn::If`` chains whose conditions compare a parameter with
+      ``AllowedValues`` to a string and whose branches are constant. The
+      value for each allowed value is stored in a Mapping keyed by the
+      parameter and the chain is replaced by ``Fn::FindInMap`` with a
+      ``Ref`` to the parameter. Identical tables share an attribute.
+    - Literals: strings that are repeated enough that replacing them by
+      ``Fn::FindInMap`` makes the Template smaller.
+
+    Values are only moved when it makes the Template smaller, without
+    exceeding :data:`troposphere.constants.MAX_MAPPINGS` or
+    :data:`troposphere.constants.MAX_MAPPING_ATTRIBUTES`. Only resource
+    properties and output values are changed, in places where CloudFormation
+    permits ``Fn::FindInMap``. Templates with a Transform are left unchanged
+    since macros receive them as written. Each value is visited a constant
+    number of times so the time taken is linear in the size of the Template.
+
+    """
+
+    def __init__(self, template: Template) -> None:
+        """Instantiate class."""
+        self.template = template
+        self.replaced = 0
+        self.allowed: Dict[str, List[str]] = {}
+        for title, parameter in template.parameters.items():
+            values = parameter.AllowedValues or []
+            if parameter.Type in ("Number", "String") and all(
+                isinstance(i, str) and _MAPPING_KEY.match(i) for i in values
+            ):
+                self.allowed[title] = list(dict.fromkeys(cast(List[str], values)))
+        self.conditions: Dict[str, Tuple[str, str]] = {}
+        for name, condition in template.conditions.items():
+            keyed = self._keyed_condition(encode_shared(condition))
+            if keyed:
+                self.conditions[name] = keyed
+        self._literals: Dict[str, int] = {}
+        self._tables: Dict[_Table, List[int]] = {}
+        self._refs: Dict[Any, Dict[str, Any]] = {}
+
+    def _keyed_condition(self, data: Any) -> Optional[Tuple[str, str]]:
+        """Get the parameter and string compared by a condition.
+
+        Returns:
+            ``None`` unless the condition is ``Fn::Equals`` of a parameter
+            with ``AllowedValues`` and a string.
+
+        """
+        if not isinstance(data, dict) or list(cast(Dict[str, Any], data)) != [
+            "Fn::Equals"
+        ]:
+            return None
+        args = cast(Dict[str, Any], data)["Fn::Equals"]
+        if not isinstance(args, list) or len(cast(List[Any], args)) != 2:
+            return None
+        for ref, string in (args, args[::-1]):
+            if (
+                isinstance(ref, dict)
+                and list(cast(Dict[str, Any], ref)) == ["Ref"]
+                and ref["Ref"] in self.allowed
+                and self.allowed[ref["Ref"]]
+                and isinstance(string, str)
+            ):
+                return ref["Ref"], string
+        return None
+
+    def _table(self, value: Any) -> Optional[_Table]:
+        """Get the table represented by a chain of ``Fn::If``."""
+        parameter: Optional[str] = None
+        branches: List[Tuple[str, Any]] = []
+        while isinstance(value, dict) and list(cast(Dict[str, Any], value)) == [
+            "Fn::If"
+        ]:
+            args = cast(Dict[str, Any], value)["Fn::If"]
+            if not isinstance(args, list) or len(cast(List[Any], args)) != 3:
+                return None
+            keyed = self.conditions.get(args[0]) if isinstance(args[0], str) else None
+            if keyed is None or parameter not in (None, keyed[0]):
+                return None
+            literal = _literal(args[1])
+            if literal is None:
+                return None
+            parameter = keyed[0]
+            branches.append((keyed[1], literal))
+            value = args[2]
+        default = _literal(value)
+        if parameter is None or default is None:
+            return None
+        return parameter, tuple(
+            next((v for string, v in branches if string == allowed), default)
+            for allowed in self.allowed[parameter]
+        )
+
+    def _walk(self, value: Any, replace: Callable[[Any], Any]) -> Any:
+        """Replace the values that can be replaced by ``Fn::FindInMap``.
+
+        Args:
+            value: Serialized value.
+            replace: Called with each string and ``Fn::If`` that can be
+                replaced. Returns the value itself when it is not replaced.
+
+        Returns:
+            The value itself when nothing was replaced.
+
+        """
+        if isinstance(value, str):
+            return replace(value)
+        if isinstance(value, list):
+            items = [self._walk(i, replace) for i in cast(List[Any], value)]
+            changed = any(i is not j for i, j in zip(items, cast(List[Any], value)))
+            return items if changed else value
+        if not isinstance(value, dict):
+            return value
+        value = cast(Dict[str, Any], value)
+        if len(value) == 1:
+            key, args = next(iter(value.items()))
+            if key == "Fn::If":
+                replaced = replace(value)
+                if replaced is not value:
+                    return replaced
+            if key in _REPLACEABLE_ARGUMENTS:
+                indexes = _REPLACEABLE_ARGUMENTS[key]
+                walked = args
+                if indexes is None:
+                    walked = self._walk(args, replace)
+                elif isinstance(args, list):
+                    walked = [
+                        self._walk(arg, replace) if index in indexes else arg
+                        for index, arg in enumerate(cast(List[Any], args))
+                    ]
+                    if all(i is j for i, j in zip(walked, cast(List[Any], args))):
+                        walked = args
+                return value if walked is args else {key: walked}
+            if key in ("Condition", "Ref") or key.startswith("Fn::"):
+                return value
+        result = {k: self._walk(v, replace) for k, v in value.items()}
+        changed = any(result[k] is not v for k, v in value.items())
+        return result if changed else value
+
+    def _count(self, value: Any) -> Any:
+        """Count a value that can be moved to a Mapping."""
+        if isinstance(value, str):
+            if len(value) + 2 > _MIN_REPLACEMENT_SIZE:
+                self._literals[value] = self._literals.get(value, 0) + 1
+            return value
+        table = self._table(value)
+        if table is None:
+            return value
+        stats = self._tables.setdefault(table, [0, 0])
+        stats[0] += 1
+        stats[1] += _size(value)
+        return table  # the branches of a table are not counted as literals
+
+    def _replace(self, value: Any) -> Any:
+        """Replace a value by ``Fn::FindInMap`` if it was moved to a Mapping."""
+        ref = self._refs.get(value if isinstance(value, str) else self._table(value))
+        if ref is None:
+            return value
+        self.replaced += 1
+        return ref
+
+    def _table_mappings(self, taken: Set[str]) -> List[_MappingGroup]:
+        """Plan a Mapping for the tables of each parameter."""
+        by_parameter: Dict[str, List[Tuple[_Table, int, int]]] = {}
+        for table, (count, size) in self._tables.items():
+            by_parameter.setdefault(table[0], []).append((table, count, size))
+        groups: List[_MappingGroup] = []
+        for parameter, tables in by_parameter.items():
+            name = _unique_name(f"{parameter}Values", taken)
+            mapping: Dict[str, Dict[str, Any]] = {
+                key: {} for key in self.allowed[parameter]
+            }
+            refs: Dict[Any, Any] = {}
+            saved = -_size({name: mapping})
+            for table, count, size in sorted(tables, key=lambda i: -i[2]):
+                attribute = f"V{len(refs)}"
+                ref = {"Fn::FindInMap": [name, {"Ref": parameter}, attribute]}
+                values = [list(i) if isinstance(i, tuple) else i for i in table[1]]
+                cost = sum(_size({attribute: i}) - 1 for i in values)
+                gain = size - count * _size(ref) - cost
+                if gain <= 0:
+                    continue
+                for key, table_value in zip(self.allowed[parameter], values):
+                    mapping[key][attribute] = table_value
+                refs[table] = ref
+                saved += gain
+                if len(refs) == MAX_MAPPING_ATTRIBUTES:
+                    break
+            if refs:
+                groups.append((saved, name, mapping, refs))
+        return groups
+
+    def _literal_mapping(self, taken: Set[str]) -> Optional[_MappingGroup]:
+        """Plan a Mapping for repeated strings."""
+        name = _unique_name("Literals", taken)
+        mapping: Dict[str, Dict[str, Any]] = {}
+        refs: Dict[Any, Any] = {}
+        saved = -_size({name: mapping})
+        candidates = [(k, v) for k, v in self._literals.items() if v > 1]
+        for literal, count in sorted(candidates, key=lambda i: -len(i[0]) * i[1]):
+            index = len(refs)
+            key = f"K{index // MAX_MAPPING_ATTRIBUTES}"
+            attribute = f"V{index % MAX_MAPPING_ATTRIBUTES}"
+            ref = {"Fn::FindInMap": [name, key, attribute]}
+            cost = _size({attribute: literal}) - 1
+            if key not in mapping:
+                cost += _size({key: {}}) - 1
+            gain = count * (_size(literal) - _size(ref)) - cost
+            if gain <= 0:
+                continue
+            mapping.setdefault(key, {})[attribute] = literal
+            refs[literal] = ref
+            saved += gain
+            if len(refs) == MAX_MAPPING_ATTRIBUTES**2:
+                break
+        return (saved, name, mapping, refs) if refs else None
+
+    def _replace_entries(
+        self,
+        section: Dict[str, BaseAWSObject],
+        key: str,
+        load: Callable[[str, Dict[str, Any]], BaseAWSObject],
+    ) -> Dict[str, BaseAWSObject]:
+        """Replace values moved to Mappings in a section of the Template.
+
+        Entries that are unchanged, or that no longer validate, are reused.
+
+        """
+        entries: Dict[str, BaseAWSObject] = {}
+        for title, obj in section.items():
+            data = encode_shared(obj)
+            replaced = self.replaced
+            value = data.get(key)
+            new_value = self._walk(value, self._replace)
+            if new_value is value:
+                entries[title] = obj
+                continue
+            try:
+                entries[title] = load(title, {**data, key: new_value})
+            except ValueError:
+                self.replaced = replaced
+                entries[title] = obj
+        return entries
+
+    def compress(self) -> CompressResult:
+        """Build a Template with repeated values moved to Mappings.
+
+        Returns:
+            The Template itself when no value can be moved.
+
+        """
+        template = self.template
+        template.validate_deferred()
+        unchanged = CompressResult(template, [], 0, 0)
+        available = MAX_MAPPINGS - len(template.mappings)
+        if template.transform or available <= 0:
+            return unchanged
+        for obj in template.resources.values():
+            self._walk(encode_shared(obj).get("Properties"), self._count)
+        for obj in template.outputs.values():
+            self._walk(encode_shared(obj).get("Value"), self._count)
+        taken = set(template.mappings)
+        groups = self._table_mappings(taken)
+        literals = self._literal_mapping(taken)
+        if literals:
+            groups.append(literals)
+        groups = [i for i in sorted(groups, key=lambda i: -i[0]) if i[0] > 0]
+        mappings: Dict[str, Dict[str, Any]] = {}
+        for _, name, mapping, refs in groups[:available]:
+            mappings[name] = mapping
+            self._refs.update(refs)
+        if not mappings:
+            return unchanged
+        resources = self._replace_entries(
+            template.resources, "Properties", load_resource
+        )
+        outputs = self._replace_entries(template.outputs, "Value", load_output)
+        result = _copy_template(
+            template, template.conditions, resources, outputs, mappings
+        )
+        bytes_saved = template.estimate_size() - result.estimate_size()
+        if bytes_saved <= 0:
+            return unchanged
+        return CompressResult(result, list(mappings), self.replaced, bytes_saved)
+
+
+def compress_mappings(template: Template) -> CompressResult:
+    """Move values repeated in Resources and Outputs to Mappings.
+
+    See :class:`MappingCompressor`.
+
+    """
+    return MappingCompressor(template).compress()
@@ -0,0 +1,248 @@
+"""Opt-in timing of the phases of building and outputting Templates.
+
+Example:
+    .. code-block:: python
+
+        from troposphere.profiling import profile
+
+        with profile() as profiler:
+            template = build_template()
+            template.to_json()
+        print(profiler.to_dict()["phases"])
+        profiler.write_chrome_trace("trace.json")
+
+When no profiler is active, instrumented functions only check a
+:class:`contextvars.ContextVar` before running. Hot paths (e.g. instantiating
+objects) check :func:`is_profiling` to skip the instrumented function
+entirely.
+
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_Active = Tuple["Profiler", List[float]]
+"""Active profiler and the time spent in calls nested in the current call."""
+
+_PROFILER: ContextVar[Optional[_Active]] = ContextVar("_PROFILER", default=None)
+
+PHASES = (
+    "validate",
+    "add",
+    "serialize",
+    "to_json",
+    "to_yaml",
+    "dump_yaml",
+    "load",
+)
+"""Phases that are recorded.
+
+``validate`` is pydantic validation of an object when instantiated or of the
+objects of a Template when deferred validation is run, ``add`` is adding an object to a Template,
+``serialize`` is converting an object to a dict (only when its output is not
+cached), ``to_json``/``to_yaml`` are outputting a Template, ``dump_yaml`` is
+converting a dict to YAML and ``load`` is loading a resource from a dict.
+
+"""
+
+
+class Profiler:
+    """Record the number of calls and time spent in each phase.
+
+    Time is recorded per phase and per label (the resource type or class name
+    of the object). ``total`` includes time spent in nested phases (e.g.
+    ``serialize`` inside ``to_json``) while ``self`` excludes it. Calls are
+    nested using the context of the caller so calls made by different threads
+    or tasks don't interleave.
+
+    """
+
+    def __init__(self, record_events: bool = True) -> None:
+        """Instantiate class.
+
+        Args:
+            record_events: Record each call so a Chrome trace can be exported.
+                Disable to reduce memory when profiling large builds.
+
+        """
+        self.events: List[Tuple[str, str, float, float, int]] = []
+        self.record_events = record_events
+        self.stats: Dict[Tuple[str, str], List[float]] = {}
+        self._origin = perf_counter()
+
+    def start(self) -> Tuple[float, Token[Optional[_Active]]]:
+        """Start recording a call in the current context.
+
+        Returns:
+            Start time and context token to pass to :meth:`stop`.
+
+        """
+        token = _PROFILER.set((self, [0.0]))
+        return perf_counter(), token
+
+    def stop(
+        self, phase: str, label: str, started: Tuple[float, Token[Optional[_Active]]]
+    ) -> None:
+        """Stop recording a call.
+
+        Args:
+            phase: Name of the phase.
+            label: Resource type or class name.
+            started: Value returned by :meth:`start`.
+
+        """
+        end = perf_counter()
+        start, token = started
+        duration = end - start
+        nested = cast(_Active, _PROFILER.get())[1][0]
+        _PROFILER.reset(token)
+        parent = _PROFILER.get()
+        if parent is not None:
+            parent[1][0] += duration
+        stats = self.stats.get((phase, label))
+        if stats is None:
+            stats = self.stats[(phase, label)] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] += duration - nested
+        if self.record_events:
+            self.events.append((phase, label, start, duration, threading.get_ident()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Output recorded statistics as a dictionary.
+
+        Returns:
+            ``phases`` contains the ``count``, ``total`` and ``self`` time (in
+            seconds) of each phase. ``labels`` contains the same statistics
+            for each label, keyed by phase.
+
+        """
+        phases: Dict[str, Dict[str, float]] = {}
+        labels: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (phase, label), (count, total, self_time) in self.stats.items():
+            summary = phases.setdefault(phase, {"count": 0, "total": 0.0, "self": 0.0})
+            summary["count"] += count
+            summary["total"] += total
+            summary["self"] += self_time
+            labels.setdefault(phase, {})[label] = {
+                "count": count,
+                "total": total,
+                "self": self_time,
+            }
+        return {"phases": phases, "labels": labels}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Output recorded calls in the Chrome trace event format.
+
+        The result can be written as JSON and opened with ``chrome://tracing``
+        or https://ui.perfetto.dev.
+
+        """
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "cat": phase,
+                    "dur": duration * 1e6,
+                    "name": f"{phase} {label}",
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": tid,
+                    "ts": (start - self._origin) * 1e6,
+                }
+                for phase, label, start, duration, tid in self.events
+            ],
+        }
+
+    def write_chrome_trace(self, path: Union[str, os.PathLike[str]]) -> None:
+        """Write recorded calls to a file in the Chrome trace event format."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+
+@contextmanager
+def profile(record_events: bool = True) -> Iterator[Profiler]:
+    """Record the phases of building and outputting Templates in this context.
+
+    Args:
+        record_events: Record each call so a Chrome trace can be exported.
+
+    """
+    profiler = Profiler(record_events=record_events)
+    token = _PROFILER.set((profiler, [0.0]))
+    try:
+        yield profiler
+    finally:
+        _PROFILER.reset(token)
+
+
+def get_label(obj: Any) -> str:
+    """Get the label of an object, preferring its resource type.
+
+    The label of a non-empty list is the label of its first item.
+
+    """
+    if isinstance(obj, list) and obj:
+        obj = cast(List[Any], obj)[0]
+    return getattr(obj, "RESOURCE_TYPE", None) or obj.__class__.__name__
+
+
+def is_profiling() -> bool:
+    """Check whether a profiler is active in the current context."""
+    return _PROFILER.get() is not None
+
+
+def instrumented(
+    phase: str, label: Optional[Callable[..., str]] = None
+) -> Callable[[_F], _F]:
+    """Record calls of the decorated function while a profiler is active.
+
+    Args:
+        phase: Name of the phase.
+        label: Function called with the same arguments as the decorated
+            function that returns the label. Defaults to the resource type or
+            class name of the first argument.
+
+    """
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            active = _PROFILER.get()
+            if active is None:
+                return func(*args, **kwargs)
+            profiler = active[0]
+            started = profiler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.stop(
+                    phase,
+                    label(*args, **kwargs) if label else get_label(args[0]),
+                    started,
+                )
+
+        return cast(_F, wrapper)
+
+    return decorator
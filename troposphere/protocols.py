@@ -11,3 +11,20 @@ class ToDictProtocol(Protocol):
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         raise NotImplementedError
+
+
+class SupportsWriteProtocol(Protocol):
+    """Class with a ``.write`` method that accepts a string (e.g. a file)."""
+
+    @abstractmethod
+    def write(self, __s: str) -> object:
+        raise NotImplementedError
+
+
+class DependentProtocol(Protocol):
+    """Class with output containing the output of other objects."""
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        """Clear cached output."""
+        raise NotImplementedError
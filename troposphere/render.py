@@ -0,0 +1,162 @@
+"""Render many Templates in parallel."""
+from __future__ import annotations
+
+import os
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+if TYPE_CHECKING:
+    from . import Template
+
+FORMATS = ("json", "yaml")
+"""Names of the formats that Templates can be rendered to."""
+
+MIN_PARALLEL_RESOURCES = 2000
+"""Total number of resources needed before a process pool is used.
+
+Below this, starting worker processes and transferring the Templates to them
+takes longer than rendering the Templates serially.
+
+"""
+
+
+class RenderResult(NamedTuple):
+    """Result of rendering a Template.
+
+    Attributes:
+        outputs: Rendered Template, keyed by format. Empty if an error occurred.
+        error: Exception raised while rendering the Template.
+
+    """
+
+    outputs: Dict[str, str]
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the Template was rendered without error."""
+        return self.error is None
+
+
+def render(
+    template: Template,
+    formats: Sequence[str] = ("json",),
+    options: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> Dict[str, str]:
+    """Render a Template to one or more formats.
+
+    Args:
+        template: Template to render.
+        formats: Names of the formats to render.
+        options: Keyword arguments passed to the method used to render each
+            format (e.g. ``{"yaml": {"long_form": True}}``), keyed by format.
+
+    """
+    options = options or {}
+    outputs: Dict[str, str] = {}
+    for fmt in formats:
+        if fmt == "json":
+            outputs[fmt] = template.to_json(**options.get(fmt, {}))
+        elif fmt == "yaml":
+            outputs[fmt] = template.to_yaml(**options.get(fmt, {}))
+        else:
+            raise ValueError(f"format must be one of {FORMATS}; got {fmt}")
+    return outputs
+
+
+def _render_safe(
+    template: Template,
+    formats: Sequence[str],
+    options: Optional[Mapping[str, Mapping[str, Any]]],
+) -> RenderResult:
+    """Render a Template, returning any error instead of raising it."""
+    try:
+        return RenderResult(render(template, formats, options))
+    except Exception as exc:  # pylint: disable=broad-except
+        return RenderResult({}, exc)
+
+
+def _render_in_worker(
+    template: Template,
+    formats: Sequence[str],
+    options: Optional[Mapping[str, Mapping[str, Any]]],
+) -> RenderResult:
+    """Render a Template in a worker process.
+
+    Errors that can't be pickled are replaced so they can be returned to the
+    parent process.
+
+    """
+    result = _render_safe(template, formats, options)
+    if result.error is not None:
+        try:
+            pickle.dumps(result.error)
+        except Exception:  # pylint: disable=broad-except
+            return RenderResult(
+                {}, RuntimeError(f"{type(result.error).__name__}: {result.error}")
+            )
+    return result
+
+
+def _result(future: Future[RenderResult]) -> RenderResult:
+    """Get the result of a future, including errors transferring data to it."""
+    try:
+        return future.result()
+    except Exception as exc:  # pylint: disable=broad-except
+        return RenderResult({}, exc)
+
+
+def render_many(
+    templates: Sequence[Template],
+    formats: Sequence[str] = ("json",),
+    workers: Optional[int] = None,
+    options: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    min_parallel_resources: int = MIN_PARALLEL_RESOURCES,
+) -> List[RenderResult]:
+    """Render many Templates using a pool of processes.
+
+    Rendering is CPU bound so a pool of processes is used to render Templates
+    on multiple cores. Templates are rendered serially when there is only one
+    Template or worker, or when the total number of resources is below
+    ``min_parallel_resources``.
+
+    Args:
+        templates: Templates to render.
+        formats: Names of the formats to render each Template to.
+        workers: Maximum number of processes. Defaults to the number of CPUs.
+        options: Keyword arguments passed to the method used to render each
+            format (e.g. ``{"json": {"indent": 2}}``), keyed by format.
+        min_parallel_resources: Total number of resources needed before a
+            process pool is used.
+
+    Returns:
+        Result for each Template, in the same order as ``templates``. An error
+        raised while rendering one Template does not affect the others.
+
+    """
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}; got {fmt}")
+    workers = min(workers or os.cpu_count() or 1, len(templates))
+    if (
+        workers <= 1
+        or sum(len(template.resources) for template in templates)
+        < min_parallel_resources
+    ):
+        return [_render_safe(template, formats, options) for template in templates]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_render_in_worker, template, formats, options)
+            for template in templates
+        ]
+        return [_result(future) for future in futures]
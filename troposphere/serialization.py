@@ -0,0 +1,254 @@
+"""Serialize objects to the dicts and JSON output by Templates.
+
+Objects provided by this library cache their output, so encoding a value
+reuses the output of the objects it contains. Output that is shared with a
+cache must not be modified; :func:`copy_output` copies it when it is returned
+to callers.
+
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from pydantic import BaseModel
+
+from . import AWSHelperFn, BaseAWSObject
+from .utils import FrozenDict, FrozenList, JsonEncoder
+
+if TYPE_CHECKING:
+    from . import Template
+    from .protocols import DependentProtocol, ToDictProtocol
+
+SCALAR_TYPES = frozenset([bool, float, int, str])
+"""Types that are output as-is without being encoded."""
+
+
+def encode_to_dict(
+    obj: Union[Dict[str, object], List[object], Tuple[object], object]
+) -> Any:
+    """Encode objects to dict.
+
+    This is the serializer engine used by ``.to_dict()``. Objects provided by
+    this library reuse their cached output instead of being walked a second
+    time. The result is a copy that can be modified.
+
+    """
+    return copy_output(encode(obj, None))
+
+
+def encode_shared(obj: object) -> Any:
+    """Encode objects to dict, sharing the cached output of the objects.
+
+    Used to read output without copying it. The result must not be modified.
+
+    """
+    return encode(obj, None)
+
+
+def copy_output(value: Any) -> Any:
+    """Copy the dicts and lists of encoded output so they can be modified."""
+    cls = value.__class__
+    if cls is dict:
+        return {k: copy_output(v) for k, v in cast("Dict[str, Any]", value).items()}
+    if cls is list:
+        return [copy_output(i) for i in cast("List[Any]", value)]
+    return value
+
+
+def encode(obj: object, dependent: Optional[DependentProtocol]) -> Any:
+    """Encode objects to dict.
+
+    Args:
+        obj: Object to encode.
+        dependent: Object whose output will contain the encoded object.
+            Any :class:`troposphere.BaseAWSObject` that is encoded will
+            invalidate it when modified.
+
+    """
+    if obj is None or obj.__class__ in SCALAR_TYPES:
+        return obj
+    if isinstance(obj, BaseAWSObject):
+        return obj._render(dependent)  # pylint: disable=protected-access
+    if isinstance(obj, AWSHelperFn):
+        return obj._encode(dependent)  # pylint: disable=protected-access
+    if obj.__class__ is FrozenDict:
+        # shared values only contain constants so their output is shared too
+        if obj.encoded is None:
+            obj.encoded = {name: encode(prop, None) for name, prop in obj.items()}
+        return obj.encoded
+    if obj.__class__ is FrozenList:
+        if obj.encoded is None:
+            obj.encoded = [encode(i, None) for i in obj]
+        return obj.encoded
+    if isinstance(obj, dict):
+        return {
+            name: encode(prop, dependent)
+            for name, prop in cast("Dict[str, object]", obj).items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [
+            encode(i, dependent)
+            for i in cast("Union[List[object], Tuple[object, ...]]", obj)
+        ]
+    if isinstance(obj, BaseModel):
+        return encode(obj.dict(by_alias=True, exclude_none=True), dependent)
+    if isinstance(obj, (str, int, float)):
+        return obj
+    if hasattr(obj, "to_dict"):
+        # Calling encode_to_dict to ensure object is
+        # nomalized to a base dictionary all the way down.
+        return encode(cast("ToDictProtocol", obj).to_dict(), dependent)
+    # This is useful when dealing with external libs using
+    # this format. Specifically awacs.
+    if hasattr(obj, "JSONrepr"):
+        return encode(obj.JSONrepr(), dependent)  # type: ignore
+    return obj
+
+
+def is_constant(value: object) -> bool:
+    """Check whether the output of an encoded value only changes when it is modified.
+
+    Values containing a :class:`troposphere.BaseAWSObject` or an object of an
+    unknown type are not constant. Must be called after encoding the value.
+
+    """
+    if value is None or value.__class__ in SCALAR_TYPES:
+        return True
+    if value.__class__ in (FrozenDict, FrozenList):
+        return True
+    if isinstance(value, AWSHelperFn):
+        return getattr(value, "_encoded_cache", None) is not None
+    if isinstance(value, dict):
+        return all(map(is_constant, cast("Dict[str, object]", value).values()))
+    if isinstance(value, (list, tuple)):
+        return all(map(is_constant, cast("List[object]", value)))
+    return False
+
+
+@lru_cache(maxsize=None)
+def get_serialization_plan(
+    model: Type[BaseAWSObject],
+) -> Dict[str, Optional[Tuple[str, bool]]]:
+    """Get how each field of a model is serialized, in order.
+
+    Returns:
+        Alias of each field and whether it is output as an attribute of the
+        object (outside of ``DICT_NAME``), keyed by field name. Excluded
+        fields are ``None``.
+
+    """
+    excluded = model.__exclude_fields__ or {}
+    attributes = set(model.ATTRIBUTES) if model.DICT_NAME else set()
+    return {
+        name: None if name in excluded else (field.alias, field.alias in attributes)
+        for name, field in model.__fields__.items()
+    }
+
+
+def serialize_fields(obj: BaseAWSObject) -> Dict[str, Any]:
+    """Serialize the fields of an object.
+
+    Runs the serialization plan of the class so aliases and attributes are
+    only resolved once per class rather than once per object.
+
+    """
+    plan = get_serialization_plan(obj.__class__)
+    dict_name = obj.DICT_NAME
+    data: Dict[str, Any] = {}
+    attributes: Optional[Dict[str, Any]] = None
+    for name, value in obj.__dict__.items():
+        if value is None:
+            continue
+        step = plan.get(name)
+        if step is None:
+            if name in plan:  # excluded
+                continue
+            # extra field
+            step = (name, bool(dict_name) and name in obj.ATTRIBUTES)
+        alias, is_attribute = step
+        if value.__class__ not in SCALAR_TYPES:
+            value = encode(value, obj)
+        if is_attribute:
+            if attributes is None:
+                attributes = {}
+            attributes[alias] = value
+        else:
+            data[alias] = value
+    if not dict_name:
+        return data
+    if attributes is None:
+        return {dict_name: data}
+    if len(attributes) > 1:  # output in the order of ATTRIBUTES
+        attributes = {
+            attr: attributes[attr] for attr in obj.ATTRIBUTES if attr in attributes
+        }
+    return {dict_name: data, **attributes}
+
+
+def iter_json_chunks(
+    template: Template,
+    indent: Optional[Union[int, str]] = 4,
+    sort_keys: bool = True,
+    separators: Tuple[str, str] = (",", ": "),
+) -> Iterator[str]:
+    """Output a Template as JSON, one chunk at a time.
+
+    See :meth:`troposphere.Template.iter_json_chunks`.
+
+    """
+    # pylint: disable=protected-access
+    template.validate_deferred()
+    encoder = JsonEncoder(indent=indent, sort_keys=sort_keys, separators=separators)
+    item_separator, key_separator = separators
+    if indent is None:
+        indent_str, newline = "", ""
+    else:
+        indent_str = " " * indent if isinstance(indent, int) else indent
+        newline = "\n"
+
+    def _encode_json(value: Any, level: int) -> str:
+        """Encode a value as JSON nested at the given indent level."""
+        encoded = encoder.encode(value)
+        if newline and level:
+            return encoded.replace(newline, newline + indent_str * level)
+        return encoded
+
+    sections = list(template._iter_sections())
+    if sort_keys:
+        sections.sort(key=lambda section: section[1])
+    if not sections:
+        yield "{}"
+        return
+    yield "{"
+    for index, (name, alias, value) in enumerate(sections):
+        prefix = (item_separator if index else "") + newline + indent_str
+        if name not in template.STREAMED_SECTIONS:
+            yield f"{prefix}{encoder.encode(alias)}{key_separator}" + _encode_json(
+                encode(value, template), 1
+            )
+            continue
+        yield f"{prefix}{encoder.encode(alias)}{key_separator}{{"
+        titles = sorted(value) if sort_keys else list(value)
+        for sub_index, title in enumerate(titles):
+            yield (
+                (item_separator if sub_index else "")
+                + newline
+                + indent_str * 2
+                + encoder.encode(title)
+                + key_separator
+                + _encode_json(value[title]._render_uncached(), 2)
+            )
+        yield newline + indent_str + "}"
+    yield newline + "}"
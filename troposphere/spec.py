@@ -0,0 +1,375 @@
+"""Create resource classes from the CloudFormation resource specification.
+
+The specification is read from a local copy of the JSON file published by AWS
+(``CloudFormationResourceSpecification.json``). Classes are only created when
+a resource or property type is first used, so using one service doesn't pay
+for the hundreds of others defined by the specification.
+
+Example:
+    .. code-block:: python
+
+        spec = ResourceSpecification.from_file("specification.json")
+        s3 = spec.service("AWS::S3")
+        bucket = s3.Bucket(title="Bucket", BucketName="example")
+
+        spec.register()  # load_template() creates resources of these types
+        template = load_template(data)
+
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import keyword
+import re
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from pydantic import Field, StrictInt, confloat, conint, conlist, constr
+
+from . import (
+    AWSHelperFn,
+    AWSHelperFnOrDict,
+    AWSObject,
+    AWSProperty,
+    BaseAWSObject,
+    policies,
+)
+from .loader import _SPECIFICATIONS
+
+_CLASSES: Dict[str, Type[BaseAWSObject]] = {}
+"""Classes created from a specification, keyed by qualified name."""
+
+PRIMITIVE_TYPES: Dict[str, Any] = {
+    "Boolean": bool,
+    "Double": Union[StrictInt, float],
+    "Integer": int,
+    "Json": Dict[str, Any],
+    "Long": int,
+    "String": str,
+    "Timestamp": str,
+}
+"""Mapping of primitive type to the type of the values it accepts."""
+
+
+class SpecificationResource(AWSObject):
+    """Resource created from a :class:`ResourceSpecification`.
+
+    The specification does not define which resources support
+    ``CreationPolicy`` and ``UpdatePolicy`` so they are accepted by all.
+
+    """
+
+    RESOURCE_TYPE = ""
+
+    CreationPolicy: Optional[policies.CreationPolicy] = None
+    UpdatePolicy: Optional[Dict[str, Any]] = None
+
+
+def __getattr__(name: str) -> Type[BaseAWSObject]:
+    """Get a class created from a specification so its objects can be pickled."""
+    try:
+        return _CLASSES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+class Service:
+    """Resource classes of a service, created on first access.
+
+    Example:
+        .. code-block:: python
+
+            s3 = spec.service("AWS::S3")
+            s3.Bucket  # class of AWS::S3::Bucket
+
+    """
+
+    def __init__(self, specification: ResourceSpecification, name: str) -> None:
+        """Instantiate class.
+
+        Args:
+            specification: Specification defining the resource types.
+            name: Prefix of the resource types of the service (e.g. ``AWS::S3``).
+
+        """
+        self.name = name
+        self.specification = specification
+
+    def __dir__(self) -> List[str]:
+        """Names of the resource types of the service."""
+        prefix = f"{self.name}::"
+        return [
+            resource_type[len(prefix) :]
+            for resource_type in self.specification.resource_types
+            if resource_type.startswith(prefix)
+        ]
+
+    def __getattr__(self, name: str) -> Type[AWSObject]:
+        """Get the class of a resource type of the service."""
+        resource_type = f"{self.name}::{name}"
+        if name.startswith("_") or resource_type not in self.specification:
+            raise AttributeError(f"{self.name} has no resource type {name}")
+        return self.specification.get_resource_class(resource_type)
+
+    def __repr__(self) -> str:
+        """Return the representation of the object."""
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+class ResourceSpecification:
+    """CloudFormation resource specification.
+
+    Each resource and property type is created as a subclass of
+    :class:`SpecificationResource` or :class:`troposphere.AWSProperty` when it
+    is first used. Properties that are not ``Required`` are optional and any
+    value other than a property type can be an intrinsic function.
+    Constraints of ``ValueTypes`` (allowed strings, patterns, lengths and
+    ranges) are enforced when values are validated.
+
+    Properties of a resource that have the name of a resource attribute
+    (e.g. ``Metadata``) are not supported and are omitted from its class.
+
+    """
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        """Instantiate class.
+
+        Args:
+            data: Parsed specification.
+
+        """
+        self.property_types: Mapping[str, Any] = data.get("PropertyTypes", {})
+        self.resource_types: Mapping[str, Any] = data.get("ResourceTypes", {})
+        self.value_types: Mapping[str, Any] = data.get("ValueTypes", {})
+        self.version: Optional[str] = data.get("ResourceSpecificationVersion")
+        self._classes: Dict[str, Type[BaseAWSObject]] = {}
+        self._creating: Set[str] = set()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> ResourceSpecification:
+        """Read a specification from a JSON file, which can be gzipped."""
+        path = Path(path)
+        if path.suffix == ".gz":
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                return cls(json.load(file))
+        with path.open(encoding="utf-8") as file:
+            return cls(json.load(file))
+
+    def __contains__(self, resource_type: object) -> bool:
+        """Whether a resource type is defined by the specification."""
+        return resource_type in self.resource_types
+
+    def get_resource_class(self, resource_type: str) -> Type[AWSObject]:
+        """Get the class of a resource type, creating it on first use.
+
+        Raises:
+            ValueError: The resource type is not defined by the specification.
+
+        """
+        resource_class = self._classes.get(resource_type)
+        if resource_class is None:
+            if resource_type not in self.resource_types:
+                raise ValueError(f"unknown resource type {resource_type}")
+            resource_class = self._create_class(
+                resource_type,
+                SpecificationResource,
+                self.resource_types[resource_type],
+            )
+        return cast("Type[AWSObject]", resource_class)
+
+    def get_property_class(self, property_type: str) -> Type[AWSProperty]:
+        """Get the class of a property type, creating it on first use.
+
+        Args:
+            property_type: Name of the property type (e.g.
+                ``AWS::S3::Bucket.CorsRule`` or ``Tag``).
+
+        Raises:
+            ValueError: The property type is not defined by the specification.
+
+        """
+        property_class = self._classes.get(property_type)
+        if property_class is None:
+            if property_type not in self.property_types:
+                raise ValueError(f"unknown property type {property_type}")
+            property_class = self._create_class(
+                property_type, AWSProperty, self.property_types[property_type]
+            )
+        return cast("Type[AWSProperty]", property_class)
+
+    def register(self) -> None:
+        """Use the specification when loading resources of unknown types.
+
+        :func:`troposphere.loader.get_resource_class` uses the classes of
+        registered specifications before falling back to
+        :class:`troposphere.loader.GenericResource`.
+
+        """
+        if self not in _SPECIFICATIONS:
+            _SPECIFICATIONS.append(self)
+
+    def service(self, name: str) -> Service:
+        """Get the resource classes of a service (e.g. ``AWS::S3``)."""
+        return Service(self, name.rstrip(":"))
+
+    def _create_class(
+        self, name: str, base: Type[BaseAWSObject], definition: Mapping[str, Any]
+    ) -> Type[BaseAWSObject]:
+        """Create the class of a resource or property type."""
+        self._creating.add(name)
+        try:
+            annotations: Dict[str, Any] = {}
+            namespace: Dict[str, Any] = {}
+            for prop, spec in definition.get("Properties", {}).items():
+                if prop in base.__fields__ or (
+                    base.DICT_NAME and prop in base.ATTRIBUTES
+                ):
+                    continue
+                field_name = prop
+                if not prop.isidentifier() or keyword.iskeyword(prop):
+                    field_name = f"{re.sub(r'[^0-9A-Za-z_]', '_', prop)}_"
+                elif hasattr(base, prop):
+                    field_name = f"{prop}_"
+                field_type = self._field_type(name, spec)
+                required = spec.get("Required", False)
+                annotations[field_name] = (
+                    field_type if required else Optional[field_type]
+                )
+                if field_name != prop:
+                    namespace[field_name] = Field(... if required else None, alias=prop)
+                elif not required:
+                    namespace[field_name] = None
+        finally:
+            self._creating.discard(name)
+        is_resource = issubclass(base, AWSObject)
+        short_name = name.rsplit(".", 1)[-1].rsplit("::", 1)[-1]
+        qualname = f"{re.sub(r'[^0-9A-Za-z]+', '_', name)}_{len(_CLASSES)}"
+        model = cast(
+            "Type[BaseAWSObject]",
+            type(
+                short_name,
+                (base,),
+                {
+                    "__annotations__": annotations,
+                    "__doc__": f"{name} {'resource' if is_resource else 'property'}.",
+                    "__module__": __name__,
+                    "__qualname__": qualname,
+                    **namespace,
+                },
+            ),
+        )
+        if is_resource:
+            # set after creation so the class is not registered as a resource type
+            cast("Type[AWSObject]", model).RESOURCE_TYPE = name
+        _CLASSES[qualname] = self._classes[name] = model
+        return model
+
+    def _field_type(self, owner: str, spec: Mapping[str, Any]) -> Any:
+        """Get the type of a property.
+
+        Args:
+            owner: Name of the resource or property type defining the property.
+            spec: Specification of the property.
+
+        """
+        constraints: Mapping[str, Any] = {}
+        value_type = spec.get("Value", {}).get("ValueType")
+        if value_type:
+            constraints = self.value_types.get(value_type, {})
+        collection = spec.get("Type")
+        if collection in ("List", "Map"):
+            if "ItemType" in spec:
+                item_type = self._property_type(owner, spec["ItemType"])
+                if item_type is None or collection == "Map":
+                    # loaded as dicts since nested models are only
+                    # instantiated for fields containing a model or a list of them
+                    return AWSHelperFnOrDict
+                return List[item_type]  # type: ignore
+            primitive_item = self._primitive_type(
+                spec.get("PrimitiveItemType"), constraints
+            )
+            item_type = Union[primitive_item, AWSHelperFn]
+            if collection == "Map":
+                return Union[AWSHelperFn, Dict[str, item_type]]  # type: ignore
+            if "ListMin" in constraints or "ListMax" in constraints:
+                constrained = conlist(
+                    item_type,  # type: ignore
+                    min_items=constraints.get("ListMin"),
+                    max_items=constraints.get("ListMax"),
+                )
+                return Union[AWSHelperFn, constrained]
+            return Union[AWSHelperFn, List[item_type]]  # type: ignore
+        if collection:
+            property_type = self._property_type(owner, collection)
+            return AWSHelperFnOrDict if property_type is None else property_type
+        primitive = spec.get("PrimitiveType")
+        if primitive == "Json":
+            return AWSHelperFnOrDict
+        return Union[self._primitive_type(primitive, constraints), AWSHelperFn]
+
+    def _primitive_type(
+        self, primitive: Optional[str], constraints: Mapping[str, Any]
+    ) -> Any:
+        """Get the type of a primitive value with the constraints of its value type.
+
+        Raises:
+            ValueError: The primitive type is unknown.
+
+        """
+        if primitive not in PRIMITIVE_TYPES:
+            raise ValueError(f"unknown primitive type {primitive}")
+        allowed_values: Tuple[Any, ...] = tuple(constraints.get("AllowedValues", ()))
+        if allowed_values:
+            if primitive in ("String", "Timestamp"):
+                return Literal[allowed_values]  # type: ignore
+            return PRIMITIVE_TYPES[primitive]
+        if primitive in ("String", "Timestamp"):
+            if not {"AllowedPatternRegex", "StringMin", "StringMax"} & set(constraints):
+                return str
+            return constr(
+                min_length=constraints.get("StringMin"),
+                max_length=constraints.get("StringMax"),
+                regex=constraints.get("AllowedPatternRegex"),
+            )
+        if primitive in ("Double", "Integer", "Long"):
+            bounds = {
+                "ge": constraints.get("NumberMin"),
+                "le": constraints.get("NumberMax"),
+            }
+            if bounds["ge"] is None and bounds["le"] is None:
+                return PRIMITIVE_TYPES[primitive]
+            if primitive == "Double":
+                return Union[conint(strict=True, **bounds), confloat(**bounds)]
+            return conint(**bounds)
+        return PRIMITIVE_TYPES[primitive]
+
+    def _property_type(self, owner: str, name: str) -> Optional[Type[AWSProperty]]:
+        """Get the class of a property type used by a resource or property type.
+
+        Returns:
+            ``None`` when the property type contains itself, which can't be
+            represented until the class is created.
+
+        Raises:
+            ValueError: The property type is not defined by the specification.
+
+        """
+        property_type = f"{owner.split('.', 1)[0]}.{name}"
+        if property_type not in self.property_types and name in self.property_types:
+            property_type = name  # shared property types (e.g. Tag)
+        if property_type in self._creating:
+            return None
+        return self.get_property_class(property_type)
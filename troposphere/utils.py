@@ -3,8 +3,11 @@ from __future__ import annotations
 
 import datetime
 import json
+import re
 from decimal import Decimal
-from typing import Any
+from typing import Any, Dict, Iterable, List, NoReturn, Optional, Tuple
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
 class JsonEncoder(json.JSONEncoder):
@@ -38,3 +41,91 @@ class JsonEncoder(json.JSONEncoder):
         if hasattr(o, "to_dict"):
             return o.to_dict()  # type: ignore
         return super().default(o)
+
+
+def get_digest(data: Any) -> str:
+    """Get the SHA-256 digest of the canonical JSON representation of data.
+
+    Keys are sorted and whitespace is omitted so the digest only depends on
+    the content of the data.
+
+    """
+    return get_digest_and_size(data)[0]
+
+
+def get_digest_and_size(data: Any) -> Tuple[str, int]:
+    """Get the digest and size of the canonical JSON representation of data.
+
+    Returns:
+        SHA-256 digest and size in bytes. The size is also the size of the data
+        when output as compact JSON since it doesn't depend on the order of
+        keys.
+
+    """
+    import hashlib  # pylint: disable=import-outside-toplevel
+
+    encoded = json.dumps(
+        data, cls=JsonEncoder, separators=(",", ":"), sort_keys=True
+    ).encode()
+    return hashlib.sha256(encoded).hexdigest(), len(encoded)
+
+
+def join_path(path: str, key: Any) -> str:
+    """Append a key or index to a JSONPath."""
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    if _IDENTIFIER.match(key):
+        return f"{path}.{key}"
+    escaped = key.replace("\\", "\\\\").replace('"', '\\"')
+    return f'{path}["{escaped}"]'
+
+
+def _read_only(self: Any, *_args: Any, **_kwargs: Any) -> NoReturn:
+    """Raise an error when a shared value is modified."""
+    raise TypeError(f"{self.__class__.__name__} is shared and can't be modified")
+
+
+class FrozenDict(Dict[str, Any]):
+    """Read-only dict shared between objects.
+
+    Attributes:
+        encoded: Cached output of the dict, set when it is first encoded.
+
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Instantiate class."""
+        super().__init__(*args, **kwargs)
+        self.encoded: Optional[Dict[str, Any]] = None
+
+    def __reduce__(self) -> Any:
+        """Support copying and pickling."""
+        return self.__class__, (dict(self),)
+
+    __delitem__ = __ior__ = __setitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+class FrozenList(List[Any]):
+    """Read-only list shared between objects.
+
+    Attributes:
+        encoded: Cached output of the list, set when it is first encoded.
+
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, iterable: Iterable[Any] = ()) -> None:
+        """Instantiate class."""
+        super().__init__(iterable)
+        self.encoded: Optional[List[Any]] = None
+
+    def __reduce__(self) -> Any:
+        """Support copying and pickling."""
+        return self.__class__, (list(self),)
+
+    __delitem__ = __iadd__ = __imul__ = __setitem__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
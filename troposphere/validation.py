@@ -0,0 +1,232 @@
+"""Validate the fields of objects.
+
+Used instead of :func:`pydantic.main.validate_model` when objects are
+instantiated and when the objects of a Template whose validation was deferred
+by :meth:`troposphere.Template.bulk` are validated. The fields of each class
+are prepared once so validating an object only runs the validators of the
+fields that were given to it. Defaults are reused and helper functions given
+to fields that accept them are kept without trying the other types of the
+field first.
+
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from pydantic import Extra, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ExtraError, MissingError
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from pydantic.utils import ROOT_KEY
+
+from . import AWSHelperFn, BaseAWSObject
+from .serialization import SCALAR_TYPES
+from .utils import FrozenDict, FrozenList
+
+_SHARED_TYPES = (FrozenDict, FrozenList)
+"""Types of values shared by interning that are kept instead of validated copies."""
+
+_NOT_SHARED = object()
+"""Placeholder for the default of fields that aren't simply set to a shared
+default when they aren't given (e.g. required fields or mutable defaults)."""
+
+_FieldPlan = Tuple[str, str, Optional[str], ModelField, Any, bool, bool]
+"""Name, alias, name accepted besides the alias, field, shared default (or
+:data:`_NOT_SHARED`), whether a helper function given to the field is kept as
+is and whether its default is validated."""
+
+
+def _keeps_helper_fn(field: ModelField) -> bool:
+    """Check whether validating a helper function returns it unchanged.
+
+    True when the field accepts :class:`troposphere.AWSHelperFn` and has no
+    validators of its own. The other types accepted by fields (strings,
+    numbers, dicts, lists and models) reject helper functions.
+
+    """
+    if field.class_validators or field.pre_validators or field.post_validators:
+        return False
+    if field.shape != SHAPE_SINGLETON:
+        return False
+    if field.type_ is AWSHelperFn:
+        return not field.sub_fields
+    return any(
+        sub_field.type_ is AWSHelperFn
+        and sub_field.shape == SHAPE_SINGLETON
+        and not sub_field.sub_fields
+        for sub_field in field.sub_fields or ()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_validation_plan(
+    model: Type[BaseAWSObject],
+) -> Tuple[Tuple[_FieldPlan, ...], FrozenSet[str]]:
+    """Get how the fields of a model are validated.
+
+    Returns:
+        How each field is validated, in order, and the names accepted for
+        the fields of the model.
+
+    """
+    config = model.__config__
+    fields: List[_FieldPlan] = []
+    accepted: Set[str] = set()
+    for name, field in model.__fields__.items():
+        by_name = config.allow_population_by_field_name and name != field.alias
+        check_default = config.validate_all or field.validate_always
+        shared = not (
+            field.required
+            or field.default_factory
+            or by_name
+            or check_default
+            or (
+                field.default is not None
+                and field.default.__class__ not in SCALAR_TYPES
+            )
+        )
+        fields.append(
+            (
+                name,
+                field.alias,
+                name if by_name else None,
+                field,
+                field.default if shared else _NOT_SHARED,
+                _keeps_helper_fn(field),
+                check_default,
+            )
+        )
+        accepted.update((field.alias, name) if by_name else (field.alias,))
+    return tuple(fields), frozenset(accepted)
+
+
+def validate_model(  # pylint: disable=too-many-branches,too-many-locals
+    model: Type[BaseAWSObject],
+    input_data: Mapping[str, Any],
+    given: Optional[Collection[str]] = None,
+    defaults: Optional[Mapping[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Set[str], Optional[ValidationError]]:
+    """Validate data for a model.
+
+    Same as :func:`pydantic.main.validate_model`.
+
+    Args:
+        model: Model to validate data for.
+        input_data: Values given to the model.
+        given: Keys of ``input_data`` that were given when it contains other
+            values. Defaults to every key.
+        defaults: Values of the fields that were not given, keyed by field
+            name. Defaults to the default of each field.
+
+    Returns:
+        The validated values, the names of the fields that were given and the
+        validation error, if any.
+
+    """
+    fields, accepted = get_validation_plan(model)
+    if given is None:
+        given = input_data
+    errors: List[Any] = []
+    if model.__pre_root_validators__:
+        input_data = {name: input_data[name] for name in input_data if name in given}
+        for pre_validator in model.__pre_root_validators__:
+            try:
+                input_data = pre_validator(model, input_data)
+            except (ValueError, TypeError, AssertionError) as exc:
+                error = ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], model)
+                return {}, set(), error
+        if any(name not in input_data for name in given):
+            defaults = None  # removed values are replaced by their default
+        given = input_data
+
+    values: Dict[str, Any] = {}
+    fields_set: Set[str] = set()
+    for name, alias, by_name, field, default, keeps_fn, check_default in fields:
+        if alias in given:
+            value = input_data[alias]
+            fields_set.add(name)
+        elif default is not _NOT_SHARED:
+            values[name] = default if defaults is None else defaults[name]
+            continue
+        elif by_name is not None and by_name in given:
+            value = input_data[by_name]
+            fields_set.add(name)
+        elif field.required:
+            errors.append(ErrorWrapper(MissingError(), loc=alias))
+            continue
+        else:
+            value = field.get_default() if defaults is None else defaults[name]
+            if not check_default:
+                values[name] = value
+                continue
+        if keeps_fn and isinstance(value, AWSHelperFn):
+            values[name] = value
+            continue
+        validated, error = field.validate(value, values, loc=alias, cls=model)
+        if isinstance(error, ErrorWrapper):
+            errors.append(error)
+        elif isinstance(error, list):
+            errors.extend(error)
+        elif value.__class__ in _SHARED_TYPES and validated == value:
+            values[name] = value
+        else:
+            values[name] = validated
+
+    extra = []
+    if not accepted.issuperset(given):
+        extra = [name for name in input_data if name in given and name not in accepted]
+    if extra and model.__config__.extra is not Extra.ignore:
+        fields_set.update(extra)
+        if model.__config__.extra is Extra.allow:
+            for name in extra:
+                values[name] = input_data[name]
+        else:
+            errors.extend(ErrorWrapper(ExtraError(), loc=name) for name in extra)
+
+    for skip_on_failure, post_validator in model.__post_root_validators__:
+        if skip_on_failure and errors:
+            continue
+        try:
+            values = post_validator(model, values)
+        except (ValueError, TypeError, AssertionError) as exc:
+            errors.append(ErrorWrapper(exc, loc=ROOT_KEY))
+
+    if errors:
+        return values, fields_set, ValidationError(errors, model)
+    return values, fields_set, None
+
+
+def validate_pending(obj: BaseAWSObject) -> Optional[ValidationError]:
+    """Validate an object whose validation was deferred.
+
+    The fields of a valid object are replaced by their validated values. An
+    invalid object is left as it was and stays pending.
+
+    Returns:
+        The validation error of an invalid object.
+
+    """
+    current = obj.__dict__
+    values, fields_set, error = validate_model(
+        obj.__class__, current, obj.__fields_set__, current
+    )
+    if error is not None:
+        return error
+    object.__setattr__(obj, "__dict__", values)
+    object.__setattr__(obj, "__fields_set__", fields_set)
+    object.__setattr__(obj, "_pending_validation", False)
+    if obj._render_cache is not None:  # pylint: disable=protected-access
+        obj.invalidate()
+    return None
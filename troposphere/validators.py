@@ -1,7 +1,10 @@
 """Validator functions."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Set
+
+_VALID_TITLES: Set[str] = set()
+_VALID_TITLES_MAX = 65536
 
 
 def validate_delimiter(delimiter: Any) -> str:
@@ -16,3 +19,20 @@ def validate_pause_time(pause_time: str) -> str:
     if not pause_time.startswith("PT"):
         raise ValueError("PauseTime should look like PT#H#M#S")
     return pause_time
+
+
+def validate_title(title: str) -> str:
+    """Validate title matches :data:`troposphere.constants.TITLE_REGEX`.
+
+    Checked with :meth:`str.isascii` and :meth:`str.isalnum` which is
+    equivalent to, but faster than, matching the regex. Valid
+    titles are remembered so that reused titles are not checked again.
+
+    """
+    if title in _VALID_TITLES:
+        return title
+    if title.isascii() and title.isalnum():
+        if len(_VALID_TITLES) < _VALID_TITLES_MAX:
+            _VALID_TITLES.add(title)
+        return title
+    raise ValueError(f'Name "{title}" not alphanumeric')